@@ -20,6 +20,8 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.'''
 
+import os
+
 import fluids
 
 if not fluids.numerics.is_micropython:
@@ -101,10 +103,10 @@ if not fluids.numerics.is_micropython:
                   conv_free_immersed, conv_free_enclosed, conv_packed_bed, conv_external,
                   conv_supercritical, conv_two_phase, conv_plate, boiling_plate)
     
-    global vectorized, numba, units, numba_vectorized
+    global vectorized, numba, units, numba_vectorized, caching, instrumentation
     if fluids.numerics.PY37:
         def __getattr__(name):
-            global vectorized, numba, units, numba_vectorized
+            global vectorized, numba, units, numba_vectorized, caching, instrumentation
             if name == 'vectorized':
                 import ht.vectorized as vectorized
                 return vectorized
@@ -117,9 +119,19 @@ if not fluids.numerics.is_micropython:
             if name == 'numba_vectorized':
                 import ht.numba_vectorized as numba_vectorized
                 return numba_vectorized
+            if name == 'caching':
+                import ht.caching as caching
+                return caching
+            if name == 'instrumentation':
+                import ht.instrumentation as instrumentation
+                return instrumentation
             raise AttributeError("module %s has no attribute %s" %(__name__, name))
     else:
         from . import vectorized
+
+    if os.environ.get('HT_INSTRUMENT', '').lower() in ('1', 'true', 'yes', 'on'):
+        from . import instrumentation
+        instrumentation.enable_instrumentation()
     
 __version__ = '1.0.7'
 
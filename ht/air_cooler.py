@@ -24,11 +24,12 @@ from math import atan, log10, sin
 
 from fluids.constants import hp, minute
 from fluids.core import Prandtl, Reynolds
+from fluids.numerics import numpy as np
 
 from ht.conv_tube_bank import ESDU_tube_row_correction
 from ht.core import LMTD, WALL_FACTOR_PRANDTL, fin_efficiency_Kern_Kraus, wall_factor
 
-__all__ = ['Ft_aircooler', 'air_cooler_noise_GPSA',
+__all__ = ['Ft_aircooler', 'Ft_aircooler_array', 'air_cooler_noise_GPSA',
            'air_cooler_noise_Mukherjee', 'h_Briggs_Young',
            'h_ESDU_high_fin', 'h_ESDU_low_fin', 'h_Ganguli_VDI', 'dP_ESDU_high_fin',
            'dP_ESDU_low_fin']
@@ -99,6 +100,34 @@ _crossflow_4_rows_2_pass = [[-6.05E-1, 2.31E-2, 2.94E-1, 1.98E-2],
 
 
 
+def _Ft_aircooler_coeffs(Ntp, rows):
+    if Ntp == 1 and rows == 1:
+        return _crossflow_1_row_1_pass
+    elif Ntp == 1 and rows == 2:
+        return _crossflow_2_rows_1_pass
+    elif Ntp == 1 and rows == 3:
+        return _crossflow_3_rows_1_pass
+    elif Ntp == 1 and rows == 4:
+        return _crossflow_4_rows_1_pass
+    elif Ntp == 1 and rows > 4:
+        # A reasonable assumption
+        return _crossflow_4_rows_1_pass
+    elif Ntp == 2 and rows == 2:
+        return _crossflow_2_rows_2_pass
+    elif Ntp == 3 and rows == 3:
+        return _crossflow_3_rows_3_pass
+    elif Ntp == 4 and rows == 4:
+        return _crossflow_4_rows_4_pass
+    elif Ntp > 4 and rows > 4 and Ntp == rows:
+        # A reasonable assumption
+        return _crossflow_4_rows_4_pass
+    elif Ntp  == 2 and rows == 4:
+        return _crossflow_4_rows_2_pass
+    else:
+        # A bad assumption, but hey, gotta pick something.
+        return _crossflow_4_rows_2_pass
+
+
 def Ft_aircooler(Thi, Tho, Tci, Tco, Ntp=1, rows=1):
     r'''Calculates log-mean temperature difference correction factor for
     a crossflow heat exchanger, as in an Air Cooler. Method presented in [1]_,
@@ -171,31 +200,7 @@ def Ft_aircooler(Thi, Tho, Tci, Tco, Ntp=1, rows=1):
     R = (Thi-Tho)/(Tco-Tci)
 #    P = (Tco-Tci)/(Thi-Tci)
 
-    if Ntp == 1 and rows == 1:
-        coefs = _crossflow_1_row_1_pass
-    elif Ntp == 1 and rows == 2:
-        coefs = _crossflow_2_rows_1_pass
-    elif Ntp == 1 and rows == 3:
-        coefs = _crossflow_3_rows_1_pass
-    elif Ntp == 1 and rows == 4:
-        coefs = _crossflow_4_rows_1_pass
-    elif Ntp == 1 and rows > 4:
-        # A reasonable assumption
-        coefs = _crossflow_4_rows_1_pass
-    elif Ntp == 2 and rows == 2:
-        coefs = _crossflow_2_rows_2_pass
-    elif Ntp == 3 and rows == 3:
-        coefs = _crossflow_3_rows_3_pass
-    elif Ntp == 4 and rows == 4:
-        coefs = _crossflow_4_rows_4_pass
-    elif Ntp > 4 and rows > 4 and Ntp == rows:
-        # A reasonable assumption
-        coefs = _crossflow_4_rows_4_pass
-    elif Ntp  == 2 and rows == 4:
-        coefs = _crossflow_4_rows_2_pass
-    else:
-        # A bad assumption, but hey, gotta pick something.
-        coefs = _crossflow_4_rows_2_pass
+    coefs = _Ft_aircooler_coeffs(Ntp, rows)
     tot = 0.0
     atanR2 = 2.0*atan(R)
     N = len(coefs)
@@ -213,6 +218,68 @@ def Ft_aircooler(Thi, Tho, Tci, Tco, Ntp=1, rows=1):
     return 1. - tot
 
 
+def Ft_aircooler_array(Thi, Tho, Tci, Tco, Ntp=1, rows=1):
+    r'''Calculates log-mean temperature difference correction factors for
+    many crossflow heat exchangers at once, using the same method as
+    :obj:`Ft_aircooler`. The coefficient set is selected only once, and the
+    temperatures are evaluated as NumPy arrays.
+
+    Parameters
+    ----------
+    Thi : array_like
+        Temperatures of hot fluid in [K]
+    Tho : array_like
+        Temperatures of hot fluid out [K]
+    Tci : array_like
+        Temperatures of cold fluid in [K]
+    Tco : array_like
+        Temperatures of cold fluid out [K]
+    Ntp : int
+        Number of passes the tubeside fluid will flow through [-]
+    rows : int
+        Number of rows of tubes [-]
+
+    Returns
+    -------
+    Ft : ndarray
+        Log-mean temperature difference correction factors [-]
+
+    Notes
+    -----
+    The inputs are broadcast against each other. Requires NumPy.
+
+    Examples
+    --------
+    >>> Ft_aircooler_array(Thi=[125., 93.], Tho=[45., 52.], Tci=[25., 35.],
+    ... Tco=[95., 54.59], Ntp=1, rows=4)
+    array([0.55050936, 0.8817615 ])
+    '''
+    Thi, Tho, Tci, Tco = np.broadcast_arrays(np.asarray(Thi, dtype=float), np.asarray(Tho, dtype=float),
+                                             np.asarray(Tci, dtype=float), np.asarray(Tco, dtype=float))
+    dTF1 = Thi - Tco
+    dTF2 = Tho - Tci
+    ratio = dTF2/dTF1
+    degenerate = (ratio <= 0.0) | (ratio == 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dTlm = np.where(degenerate, dTF1, (dTF2 - dTF1)/np.log(np.where(degenerate, 2.0, ratio)))
+    one_m_rlm = 1.0 - dTlm/(Thi - Tci)
+    atanR2 = 2.0*np.arctan((Thi - Tho)/(Tco - Tci))
+
+    coefs = _Ft_aircooler_coeffs(Ntp, rows)
+    N = len(coefs)
+    sine_terms = [np.sin((i + 1.)*atanR2) for i in range(N)]
+    tot = np.zeros(Thi.shape)
+    x0 = one_m_rlm
+    for k in range(N):
+        coeffs_k = coefs[k]
+        tot_i = coeffs_k[0]*sine_terms[0]
+        for i in range(1, N):
+            tot_i += coeffs_k[i]*sine_terms[i]
+        tot += tot_i*x0
+        x0 = x0*one_m_rlm
+    return 1. - tot
+
+
 def air_cooler_noise_GPSA(tip_speed, power):
     r'''Calculates the noise generated by an air cooler bay with one fan
     according to the GPSA handbook [1]_.
@@ -24,14 +24,17 @@ from math import atan, exp, log10, pi
 
 from fluids.constants import g
 from fluids.core import Boiling, Bond, Prandtl, Weber
+from fluids.numerics import numpy as np
 from fluids.numerics import secant
 from fluids.two_phase_voidage import Lockhart_Martinelli_Xtt
 
+from ht import telemetry
 from ht.boiling_nucleic import Cooper, Forster_Zuber
 from ht.conv_internal import turbulent_Dittus_Boelter, turbulent_Gnielinski
 
 __all__ = ['Thome', 'Liu_Winterton', 'Chen_Edelstein', 'Chen_Bennett',
-           'Lazarek_Black', 'Li_Wu', 'Sun_Mishima', 'Yun_Heo_Kim']
+           'Lazarek_Black', 'Li_Wu', 'Sun_Mishima', 'Yun_Heo_Kim', 'Thome_array',
+           'evaporator_march', 'evaporator_march_methods']
 
 __numba_additional_funcs__ = ('to_solve_q_Thome',)
 
@@ -461,7 +464,13 @@ def Thome(m, x, D, rhol, rhog, mul, mug, kl, kg, Cpl, Cpg, Hvap, sigma, Psat,
        no. 3 (September 4, 2008): 187-227. doi:10.1080/15567260802317357.
     '''
     if q is None and Te is not None:
-        q = secant(to_solve_q_Thome, 1E4, args=( m, x, D, rhol, rhog, kl, kg, mul, mug, Cpl, Cpg, sigma, Hvap, Psat, Pc, Te))
+        objective = to_solve_q_Thome
+        args = (m, x, D, rhol, rhog, kl, kg, mul, mug, Cpl, Cpg, sigma, Hvap, Psat, Pc, Te)
+        if telemetry.records is not None: # numba: delete
+            objective = telemetry.CountingObjective(to_solve_q_Thome, 'Thome', {'m': m, 'x': x, 'D': D, 'Psat': Psat, 'Pc': Pc, 'Te': Te}) # numba: delete
+        q = secant(objective, 1E4, args=args)
+        if objective is not to_solve_q_Thome: # numba: delete
+            objective.finish('secant', q, args) # numba: delete
         return Thome(m=m, x=x, D=D, rhol=rhol, rhog=rhog, kl=kl, kg=kg, mul=mul, mug=mug, Cpl=Cpl, Cpg=Cpg, sigma=sigma, Hvap=Hvap, Psat=Psat, Pc=Pc, q=q)
     elif q is None and Te is None:
         raise ValueError('Either q or Te is needed for this correlation')
@@ -519,6 +528,178 @@ def to_solve_q_Thome(q, m, x, D, rhol, rhog, kl, kg, mul, mug, Cpl, Cpg, sigma,
     err = q/Thome(m=m, x=x, D=D, rhol=rhol, rhog=rhog, kl=kl, kg=kg, mul=mul, mug=mug, Cpl=Cpl, Cpg=Cpg, sigma=sigma, Hvap=Hvap, Psat=Psat, Pc=Pc, q=q) - Te
     return err
 
+
+def _secant_array(func, x0, x1, f0=None, xtol=1E-12, maxiter=100):
+    # Secant method applied to many independent positive unknowns at once;
+    # func(x, idx) returns the residuals of the points idx at x. Points are
+    # dropped from the iteration as they converge. Points whose residual did
+    # not change are moved by twice their last step and kept iterating.
+    x0 = x0.copy()
+    x = x1.copy()
+    active = np.arange(x.size)
+    f0 = func(x0, active) if f0 is None else f0.copy()
+    for _ in range(maxiter):
+        x_a = x[active]
+        f = func(x_a, active)
+        dx = x_a - x0[active]
+        denom = f - f0[active]
+        flat = (denom == 0.0) & (f != 0.0)
+        x_new = x_a - np.where(denom == 0.0, 0.0, f*dx/np.where(denom == 0.0, 1.0, denom))
+        x_new = np.where(flat, x_a + np.where(dx != 0.0, 2.0*dx, 1E-4*x_a), x_new)
+        # Keep the unknowns positive
+        x_new = np.where(x_new > 0.0, x_new, 0.5*x_a)
+        x0[active] = x_a
+        f0[active] = f
+        x[active] = x_new
+        active = active[flat | (np.abs(x_new - x_a) > xtol*np.abs(x_new))]
+        if not active.size:
+            return x
+    raise ValueError('Secant solution did not converge for %d points' %(active.size,))
+
+
+def _Thome_q_independent(m, x, D, rhol, rhog, mul, mug, kl, kg, Cpl, Cpg, Hvap,
+                         sigma, Psat, Pc):
+    # Terms of the Thome model which do not depend on the heat flux
+    C_delta0 = 0.3E-6
+    G = m/(pi/4*D**2)
+    Rel = G*D*(1-x)/mul
+    Reg = G*D*x/mug
+    qref = 3328*(Psat/Pc)**-0.5
+    vp = G*(x/rhog + (1-x)/rhol)
+    Bo = rhol*D/sigma*vp**2
+    nul = mul/rhol
+    delta0 = D*0.29*(3*(nul/vp/D)**0.5)**0.84*((0.07*Bo**0.41)**-8 + 0.1**-8)**(-1/8.)
+    frac_l = 1./(1 + rhol/rhog*(x/(1.-x)))
+    frac_v = 1./(1 + rhog/rhol*((1.-x)/x))
+    Prg = Prandtl(Cp=Cpg, k=kg, mu=mug)
+    Prl = Prandtl(Cp=Cpl, k=kl, mu=mul)
+    fg = (1.82*np.log10(Reg) - 1.64)**-2
+    fl = (1.82*np.log10(Rel) - 1.64)**-2
+    return (D, qref, vp, frac_l, frac_v, rhol*Hvap*(delta0 - C_delta0),
+            G/rhol*(1-x), 2*0.455*Prl**(1/3.)*(D*Rel)**0.5,
+            turbulent_Gnielinski(Re=Rel, Pr=Prl, fd=fl),
+            2*0.455*Prg**(1/3.)*(D*Reg)**0.5,
+            turbulent_Gnielinski(Re=Reg, Pr=Prg, fd=fg),
+            kl/D, kg/D, 2*kl/(delta0 + C_delta0))
+
+
+def _Thome_h_array(q, terms):
+    (D, qref, vp, frac_l, frac_v, q_t_dry_film, Ll_tau, Nu_lam_l, Nu_Gn_l,
+     Nu_lam_g, Nu_Gn_g, kl_D, kg_D, h_film) = terms
+    tau = 1./(q/qref)**1.74
+    tv = tau*frac_v
+    t_dry_film = q_t_dry_film/q
+    film_only = t_dry_film > tv
+    t_film = np.where(film_only, tv, t_dry_film)
+    t_dry = np.where(film_only, 0.0, tv - t_film)
+    Ll = tau*Ll_tau
+    # Avoid a division by zero where there is no dry zone; its terms are zeroed
+    Ldry = np.where(film_only, 1.0, t_dry*vp)
+
+    h_Zl = kl_D*((Nu_lam_l/Ll**0.5)**4 + (Nu_Gn_l*(1 + (D/Ll)**(2/3.)))**4)**0.25
+    h_Zg = kg_D*((Nu_lam_g/Ldry**0.5)**4 + (Nu_Gn_g*(1 + (D/Ldry)**(2/3.)))**4)**0.25
+    h_Zg = np.where(film_only, 0.0, h_Zg)
+    return frac_l*h_Zl + t_film/tau*h_film + t_dry/tau*h_Zg
+
+
+def Thome_array(m, x, D, rhol, rhog, mul, mug, kl, kg, Cpl, Cpg, Hvap, sigma,
+                Psat, Pc, q=None, Te=None, q0=None, xtol=1E-12, maxiter=100):
+    r'''Calculates the heat transfer coefficient of the :obj:`Thome` model for
+    arrays of conditions at once, such as the qualities along an evaporator
+    tube. All inputs are broadcast against each other.
+
+    The terms of the model which do not depend on the heat flux are computed
+    once, and the three-zone model is evaluated for all points together.
+    With `Te` specified, the heat flux of every point is solved
+    simultaneously with a vectorized secant method, started from the heat
+    flux the model gives at 1E4 W/m^2 (or at `q0`, if provided).
+
+    Parameters
+    ----------
+    m : array_like
+        Mass flow rate [kg/s]
+    x : array_like
+        Quality at the specific tube interval []
+    D : array_like
+        Diameter of the tube [m]
+    rhol : array_like
+        Density of the liquid [kg/m^3]
+    rhog : array_like
+        Density of the gas [kg/m^3]
+    mul : array_like
+        Viscosity of liquid [Pa*s]
+    mug : array_like
+        Viscosity of gas [Pa*s]
+    kl : array_like
+        Thermal conductivity of liquid [W/m/K]
+    kg : array_like
+        Thermal conductivity of gas [W/m/K]
+    Cpl : array_like
+        Heat capacity of liquid [J/kg/K]
+    Cpg : array_like
+        Heat capacity of gas [J/kg/K]
+    Hvap : array_like
+        Heat of vaporization of liquid [J/kg]
+    sigma : array_like
+        Surface tension of liquid [N/m]
+    Psat : array_like
+        Vapor pressure of fluid, [Pa]
+    Pc : array_like
+        Critical pressure of fluid, [Pa]
+    q : array_like, optional
+        Heat flux to wall [W/m^2]
+    Te : array_like, optional
+        Excess temperature of wall, [K]
+    q0 : array_like, optional
+        Initial guesses for the heat flux when `Te` is specified, for example
+        the solution of a previous sweep, [W/m^2]
+    xtol : float, optional
+        Relative tolerance on the heat flux when `Te` is specified, [-]
+    maxiter : int, optional
+        Maximum number of secant iterations, [-]
+
+    Returns
+    -------
+    h : ndarray
+        Heat transfer coefficients [W/m^2/K]
+
+    Notes
+    -----
+    Starting each point from its own model-based estimate rather than from the
+    converged heat flux of its neighbour lets all points be solved together.
+    A ValueError is raised if any point does not converge within `maxiter`
+    iterations.
+
+    Examples
+    --------
+    >>> Thome_array(m=1, x=[0.1, 0.4, 0.7], D=0.3, rhol=567., rhog=18.09,
+    ... kl=0.086, kg=0.2, mul=156E-6, mug=1E-5, Cpl=2300, Cpg=1400, sigma=0.02,
+    ... Hvap=9E5, Psat=1E5, Pc=22E6, Te=20.)
+    array([803.42644863, 804.67977497, 824.3201359 ])
+    '''
+    args = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (
+        m, x, D, rhol, rhog, mul, mug, kl, kg, Cpl, Cpg, Hvap, sigma, Psat, Pc)])
+    terms = _Thome_q_independent(*args)
+    if q is not None:
+        return _Thome_h_array(np.asarray(q, dtype=float), terms)
+    elif Te is None:
+        raise ValueError('Either q or Te is needed for this correlation')
+    shape = np.broadcast(args[0], np.asarray(Te)).shape
+    terms = tuple(np.broadcast_to(v, shape).ravel() for v in terms)
+    Te = np.broadcast_to(np.asarray(Te, dtype=float), shape).ravel()
+    if q0 is None:
+        q0 = 1E4
+    q_prev = np.broadcast_to(np.asarray(q0, dtype=float), shape).ravel().copy()
+    err_prev = q_prev/_Thome_h_array(q_prev, terms) - Te
+    # Second point from one fixed-point step, q = h(q)*Te
+    q = Te*q_prev/(err_prev + Te)
+
+    def err(q, idx):
+        return q/_Thome_h_array(q, tuple(v[idx] for v in terms)) - Te[idx]
+    q = _secant_array(err, q_prev, q, f0=err_prev, xtol=xtol, maxiter=maxiter)
+    return _Thome_h_array(q, terms).reshape(shape)
+
+
 def Yun_Heo_Kim(m, x, D, rhol, mul, Hvap, sigma, q=None, Te=None):
     r'''Calculates heat transfer coefficient for film boiling of saturated
     fluid in any orientation of flow. Correlation
@@ -934,3 +1115,288 @@ def Liu_Winterton(m, x, D, rhol, rhog, mul, kl, Cpl, MW, P,  Pc, Te):
     S = (1 + 0.055*F**0.1*ReL**0.16)**-1
     h_nb = Cooper(Te=Te, P=P, Pc=Pc, MW=MW)
     return ((F*hl)**2 + (S*h_nb)**2)**0.5
+
+
+evaporator_march_methods = ['Chen_Bennett', 'Chen_Edelstein', 'Liu_Winterton',
+                            'Lazarek_Black', 'Li_Wu', 'Sun_Mishima',
+                            'Yun_Heo_Kim', 'Thome']
+_evaporator_q_methods = ('Lazarek_Black', 'Li_Wu', 'Sun_Mishima', 'Yun_Heo_Kim', 'Thome')
+
+
+def _flow_boiling_h_array(Method, x, m, D, p, Te=None, q=None):
+    # Evaluates a flow boiling correlation for arrays of tubes; the fluid
+    # properties in `p` are scalars.
+    if Method == 'Chen_Bennett' or Method == 'Chen_Edelstein':
+        rhol, rhog, mul, kl, Cpl = p['rhol'], p['rhog'], p['mul'], p['kl'], p['Cpl']
+        dPsat = p['dPsat']
+        if dPsat is None:
+            # Clausius-Clapeyron equation, linearized about Tsat
+            dPsat = p['Hvap']*Te/(p['Tsat']*(1./rhog - 1./rhol))
+        elif callable(dPsat):
+            dPsat = dPsat(Te)
+        G = m/(pi/4*D**2)
+        Rel = D*G*(1-x)/mul
+        Prl = Prandtl(Cp=Cpl, mu=mul, k=kl)
+        hl = turbulent_Dittus_Boelter(Re=Rel, Pr=Prl)*kl/D
+        Xtt = Lockhart_Martinelli_Xtt(x=x, rhol=rhol, rhog=rhog, mul=mul, mug=p['mug'])
+        hnb = Forster_Zuber(Te=Te, dPsat=dPsat, Cpl=Cpl, kl=kl, mul=mul,
+                            sigma=p['sigma'], Hvap=p['Hvap'], rhol=rhol, rhog=rhog)
+        if Method == 'Chen_Edelstein':
+            F = (1 + Xtt**-0.5)**1.78
+            S = 0.9622 - 0.5822*np.arctan(Rel*F**1.25/6.18E4)
+        else:
+            F = ((Prl+1)/2.)**0.444*(1 + Xtt**-0.5)**1.78
+            X0 = 0.041*(p['sigma']/(g*(rhol-rhog)))**0.5
+            S = (1 - np.exp(-F*hl*X0/kl))/(F*hl*X0/kl)
+        return hnb*S + hl*F
+    elif Method == 'Liu_Winterton':
+        return Liu_Winterton(m=m, x=x, D=D, rhol=p['rhol'], rhog=p['rhog'],
+                             mul=p['mul'], kl=p['kl'], Cpl=p['Cpl'], MW=p['MW'],
+                             P=p['P'], Pc=p['Pc'], Te=Te)
+    elif Method == 'Lazarek_Black':
+        return Lazarek_Black(m=m, D=D, mul=p['mul'], kl=p['kl'], Hvap=p['Hvap'], q=q, Te=Te)
+    elif Method == 'Li_Wu':
+        return Li_Wu(m=m, x=x, D=D, rhol=p['rhol'], rhog=p['rhog'], mul=p['mul'],
+                     kl=p['kl'], Hvap=p['Hvap'], sigma=p['sigma'], q=q, Te=Te)
+    elif Method == 'Sun_Mishima':
+        return Sun_Mishima(m=m, D=D, rhol=p['rhol'], rhog=p['rhog'], mul=p['mul'],
+                           kl=p['kl'], Hvap=p['Hvap'], sigma=p['sigma'], q=q, Te=Te)
+    elif Method == 'Yun_Heo_Kim':
+        return Yun_Heo_Kim(m=m, x=x, D=D, rhol=p['rhol'], mul=p['mul'],
+                           Hvap=p['Hvap'], sigma=p['sigma'], q=q, Te=Te)
+    elif Method == 'Thome':
+        return Thome_array(m=m, x=x, D=D, rhol=p['rhol'], rhog=p['rhog'],
+                           mul=p['mul'], mug=p['mug'], kl=p['kl'], kg=p['kg'],
+                           Cpl=p['Cpl'], Cpg=p['Cpg'], Hvap=p['Hvap'],
+                           sigma=p['sigma'], Psat=p['P'], Pc=p['Pc'], q=q, Te=Te)
+    raise ValueError("Correlation name not recognized; options are %s" %(evaporator_march_methods,))
+
+
+def evaporator_march(m, D, L, x_in, Tsat, rhol, rhog, mul, kl, Cpl, Hvap,
+                     sigma, mug=None, kg=None, Cpg=None, MW=None, P=None,
+                     Pc=None, q=None, T_hot=None, h_hot=None,
+                     Method='Chen_Bennett', dPsat=None, x_max=0.95,
+                     stations=21, xtol=1E-7):
+    r'''Integrates the quality and wall temperature of saturated fluid
+    boiling inside heated tubes along their length, for many tubes at once
+    - for example all the tubes of an evaporator bundle, each with its own
+    flow rate and heat load.
+
+    The quality increases with the heat absorbed by the fluid:
+
+    .. math::
+        \frac{dx}{dz} = \frac{\pi D q}{\dot m \Delta H_{vap}}
+
+    The local heat flux is either specified, or set by a heating medium at a
+    constant temperature :math:`T_{hot}` through a conductance
+    :math:`h_{hot}` (which may include the tube wall):
+
+    .. math::
+        q = h_{hot}(T_{hot} - T_{sat} - \Delta T_e) = h(x, \Delta T_e)\Delta T_e
+
+    At each point the excess wall temperature is solved for all tubes with a
+    vectorized secant method, warm-started from the previous point. The
+    quality is integrated with an embedded second order Runge-Kutta method,
+    and the step of each tube is adapted to keep its local error in quality
+    below `xtol`.
+
+    Parameters
+    ----------
+    m : array_like
+        Mass flow rate in each tube [kg/s]
+    D : array_like
+        Diameter of the tubes [m]
+    L : array_like
+        Length of the tubes [m]
+    x_in : array_like
+        Quality at the tube inlets, above 0 [-]
+    Tsat : float
+        Saturation temperature of the fluid, [K]
+    rhol : float
+        Density of the liquid [kg/m^3]
+    rhog : float
+        Density of the gas [kg/m^3]
+    mul : float
+        Viscosity of liquid [Pa*s]
+    kl : float
+        Thermal conductivity of liquid [W/m/K]
+    Cpl : float
+        Heat capacity of liquid [J/kg/K]
+    Hvap : float
+        Heat of vaporization of liquid [J/kg]
+    sigma : float
+        Surface tension of liquid [N/m]
+    mug : float, optional
+        Viscosity of gas, needed by the `Chen_Bennett`, `Chen_Edelstein` and
+        `Thome` methods [Pa*s]
+    kg : float, optional
+        Thermal conductivity of gas, needed by `Thome` [W/m/K]
+    Cpg : float, optional
+        Heat capacity of gas, needed by `Thome` [J/kg/K]
+    MW : float, optional
+        Molecular weight of the fluid, needed by `Liu_Winterton` [g/mol]
+    P : float, optional
+        Saturation pressure of fluid, needed by `Liu_Winterton` and `Thome`
+        [Pa]
+    Pc : float, optional
+        Critical pressure of fluid, needed by `Liu_Winterton` and `Thome`
+        [Pa]
+    q : array_like, optional
+        Heat flux to the fluid in each tube, based on the inner area [W/m^2]
+    T_hot : array_like, optional
+        Temperature of the heating medium of each tube, [K]
+    h_hot : array_like, optional
+        Heat transfer coefficient from the heating medium to the inner tube
+        wall, based on the inner area [W/m^2/K]
+    Method : str, optional
+        The flow boiling correlation to use; one of
+        :obj:`evaporator_march_methods`, [-]
+    dPsat : float or callable, optional
+        Difference in saturation pressure of the fluid at Te and T, used by
+        the `Chen_Bennett` and `Chen_Edelstein` methods; either a constant or
+        a function of an array of `Te`. If not provided, the linearized
+        Clausius-Clapeyron equation is used [Pa]
+    x_max : float, optional
+        Quality at which dryout is assumed to occur and the integration of a
+        tube stops, [-]
+    stations : int, optional
+        Number of equally spaced points along each tube at which the profiles
+        are reported, including the inlet and outlet, [-]
+    xtol : float, optional
+        Maximum local error in quality per integration step, [-]
+
+    Returns
+    -------
+    results : dict[str, ndarray]
+        Dictionary of the following arrays, of shape (tubes, stations) for
+        the profiles and (tubes,) otherwise:
+
+        * z : Positions along each tube [m]
+        * x : Quality profiles [-]
+        * Te : Excess wall temperature profiles [K]
+        * Tw : Wall temperature profiles [K]
+        * h : Boiling heat transfer coefficient profiles [W/m^2/K]
+        * q : Heat flux profiles [W/m^2]
+        * x_out : Outlet quality of each tube [-]
+        * Q : Heat absorbed by the fluid in each tube [W]
+        * z_dryout : Position at which `x_max` was reached, or NaN [m]
+
+        Profile values after the dryout point are NaN.
+
+    Notes
+    -----
+    The same fluid at the same saturation pressure is assumed to flow in
+    every tube; the flow rate, geometry, inlet quality and heating of each
+    tube may differ. Pressure drop and the resulting change in saturation
+    temperature along the tubes are neglected.
+
+    Examples
+    --------
+    Three tubes of an evaporator, heated by fluids at different temperatures:
+
+    >>> res = evaporator_march(m=0.05, D=0.02, L=4.0, x_in=0.1, Tsat=300.,
+    ... rhol=567., rhog=18.09, mul=156E-6, mug=7.11E-6, kl=0.086, Cpl=2730.,
+    ... Hvap=3.3E5, sigma=0.02, T_hot=[305., 310., 330.], h_hot=2000.,
+    ... Method='Chen_Bennett', stations=3)
+    >>> res['x_out']
+    array([0.18882641, 0.28985874, 0.73960241])
+    >>> res['Tw'][:, -1]
+    array([302.00884958, 303.57886516, 308.5916388 ])
+    '''
+    if Method not in evaporator_march_methods:
+        raise ValueError("Correlation name not recognized; options are %s" %(evaporator_march_methods,))
+    if (q is None) == (T_hot is None or h_hot is None):
+        raise ValueError('Either q, or both T_hot and h_hot, must be specified')
+    arrays = [m, D, L, x_in] + ([q] if q is not None else [T_hot, h_hot])
+    arrays = [np.asarray(v, dtype=float) for v in np.broadcast_arrays(*arrays)]
+    shape = arrays[0].shape
+    m, D, L, x_in = [v.ravel() for v in arrays[:4]]
+    if q is not None:
+        q = arrays[4].ravel()
+    else:
+        T_hot, h_hot = arrays[4].ravel(), arrays[5].ravel()
+    if np.any(x_in <= 0.0) or np.any(x_in >= x_max):
+        raise ValueError('Inlet qualities must be between 0 and x_max')
+    p = {'rhol': rhol, 'rhog': rhog, 'mul': mul, 'mug': mug, 'kl': kl, 'kg': kg,
+         'Cpl': Cpl, 'Cpg': Cpg, 'Hvap': Hvap, 'sigma': sigma, 'Tsat': Tsat,
+         'MW': MW, 'P': P, 'Pc': Pc, 'dPsat': dPsat}
+    direct = q is not None and Method in _evaporator_q_methods
+    N = m.size
+    Te_guess = np.full(N, 5.0) if q is not None else 0.5*(T_hot - Tsat)
+
+    def local(x, idx):
+        # Returns dx/dz, Te, h and q of the tubes idx at qualities x
+        m_i, D_i = m[idx], D[idx]
+        if direct:
+            q_i = q[idx]
+            h_i = _flow_boiling_h_array(Method, x, m_i, D_i, p, q=q_i)
+            Te_i = q_i/h_i
+        else:
+            if q is not None:
+                def err(Te, sub):
+                    return Te*_flow_boiling_h_array(Method, x[sub], m_i[sub], D_i[sub], p, Te=Te) - q[idx][sub]
+            else:
+                def err(Te, sub):
+                    return (Te*_flow_boiling_h_array(Method, x[sub], m_i[sub], D_i[sub], p, Te=Te)
+                            - h_hot[idx][sub]*(T_hot[idx][sub] - Tsat - Te))
+            Te0 = Te_guess[idx]
+            Te_i = _secant_array(err, Te0, 1.02*Te0, xtol=1E-11)
+            h_i = _flow_boiling_h_array(Method, x, m_i, D_i, p, Te=Te_i)
+            q_i = h_i*Te_i
+            Te_guess[idx] = Te_i
+        return pi*D_i*q_i/(m_i*Hvap), Te_i, h_i, q_i
+
+    S = int(stations)
+    fracs = np.linspace(0.0, 1.0, S)
+    z_out = np.outer(L, fracs)
+    x_out, Te_out, h_out, q_out = (np.full((N, S), np.nan) for _ in range(4))
+    z_dryout = np.full(N, np.nan)
+
+    x = x_in.copy()
+    z = np.zeros(N)
+    step = L/(4.0*max(S - 1, 1))
+    all_tubes = np.arange(N)
+    _, Te_out[:, 0], h_out[:, 0], q_out[:, 0] = local(x, all_tubes)
+    x_out[:, 0] = x
+    active = all_tubes
+    for k in range(1, S):
+        target = z_out[:, k]
+        stepping = active
+        while stepping.size:
+            x_s, z_s = x[stepping], z[stepping]
+            remaining = target[stepping] - z_s
+            reach = step[stepping] >= remaining
+            dz = np.where(reach, remaining, step[stepping])
+            k1 = local(x_s, stepping)[0]
+            x_trial = np.minimum(x_s + dz*k1, 1.0 - 1E-9)
+            k2 = local(x_trial, stepping)[0]
+            x_new = x_s + 0.5*dz*(k1 + k2)
+            error = 0.5*dz*np.abs(k2 - k1)
+            accept = error <= xtol
+            factor = np.where(error > 0.0, 0.9*np.sqrt(xtol/np.where(error > 0.0, error, 1.0)), 4.0)
+            # Shortened steps which reach a station do not limit the next step
+            step[stepping] = np.where(reach & accept, np.maximum(step[stepping], dz*np.clip(factor, 0.2, 4.0)),
+                                      dz*np.clip(factor, 0.2, 4.0))
+
+            dried = accept & (x_new >= x_max)
+            if dried.any():
+                i = stepping[dried]
+                z_dryout[i] = z_s[dried] + dz[dried]*(x_max - x_s[dried])/(x_new[dried] - x_s[dried])
+                x[i] = x_max
+                active = active[~np.isin(active, i)]
+            moved = accept & ~dried
+            x[stepping[moved]] = x_new[moved]
+            z[stepping[moved]] = np.where(reach, target[stepping], z_s + dz)[moved]
+            stepping = stepping[~dried & ~(moved & reach)]
+        if not active.size:
+            break
+        x_out[active, k] = x[active]
+        _, Te_out[active, k], h_out[active, k], q_out[active, k] = local(x[active], active)
+
+    results = {'z': z_out, 'x': x_out, 'Te': Te_out, 'Tw': Tsat + Te_out,
+               'h': h_out, 'q': q_out}
+    results = {k: v.reshape(shape + (S,)) for k, v in results.items()}
+    results['x_out'] = x.reshape(shape)
+    results['Q'] = (m*Hvap*(x - x_in)).reshape(shape)
+    results['z_dryout'] = z_dryout.reshape(shape)
+    return results
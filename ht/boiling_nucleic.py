@@ -23,12 +23,16 @@ SOFTWARE.
 from math import log10
 
 from fluids.constants import g
+from fluids.numerics import numpy as np
 
 __all__ = ['Rohsenow', 'McNelly', 'Forster_Zuber', 'Montinsky',
 'Stephan_Abdelsalam', 'HEDH_Taborek', 'Bier', 'Cooper', 'Gorenflo',
-'h_nucleic', 'h_nucleic_methods',
+'h_nucleic', 'h_nucleic_methods', 'h_nucleic_curve', 'NucleateBoilingState',
 'Zuber', 'Serth_HEDH', 'HEDH_Montinsky', 'qmax_boiling', 'qmax_boiling_methods',
-'h0_VDI_2e', 'h0_Gorenflow_1993', 'qmax_boiling_all_methods', 'h_nucleic_all_methods']
+'qmax_boiling_array', 'qmax_boiling_margin',
+'h0_VDI_2e', 'h0_Gorenflow_1993', 'qmax_boiling_all_methods', 'h_nucleic_all_methods',
+'boiling_nucleic_index', 'boiling_nucleic_CASs', 'h0_Gorenflow_1993_values',
+'h0_VDI_2e_values', 'cryogenic_flags']
 
 
 def Rohsenow(rhol, rhog, mul, kl, Cpl, Hvap, sigma, Te=None, q=None, Csf=0.013,
@@ -726,14 +730,10 @@ h0_Gorenflow_1993 = {'74-82-8': 7000.0, '74-84-0': 4500.0, '74-98-6': 4000.0,
 '7664-41-7': 7000.0, '124-38-9': 5100.0, '2551-62-4': 3700.0, '7782-44-7': 9500.0,
 '7727-37-9': 10000.0, '7440-37-1': 8200.0, '7440-01-9': 20000.0, '1333-74-0': 24000.0,
 '7440-59-7': 2000.0}
-try:
-    if IS_NUMBA: # type: ignore # noqa: F821
-        h0_Gorenflow_1993_keys = tuple(h0_Gorenflow_1993.keys())
-        h0_Gorenflow_1993_values = tuple(h0_Gorenflow_1993.values())
-except:
-    pass
-
-def Gorenflo(P, Pc, q=None, Te=None, CASRN=None, h0=None, Ra=4E-7):
+
+
+def Gorenflo(P, Pc, q=None, Te=None, CASRN=None, h0=None, Ra=4E-7,
+             CAS_index=None):
     r'''Calculates heat transfer coefficient for a pool boiling according to
     [1]_ and also presented in [2]_. Calculation is based on the corresponding
     states law, with a single regression constant per fluid. P and Pc are
@@ -788,6 +788,9 @@ def Gorenflo(P, Pc, q=None, Te=None, CASRN=None, h0=None, Ra=4E-7):
     Ra : float, optional
         Roughness parameter of the surface (0.4 micrometer default) for
         Gorenflo method, [m]
+    CAS_index : int, optional
+        Index of the fluid from :obj:`boiling_nucleic_index`; used instead of
+        `CASRN` if provided, [-]
 
     Returns
     -------
@@ -800,7 +803,10 @@ def Gorenflo(P, Pc, q=None, Te=None, CASRN=None, h0=None, Ra=4E-7):
     values was listed for reference heat fluxes in [1]_, values from the
     second edition of [1]_ were used instead. 44 values are available, all
     listed in the dictionary `h0_Gorenflow_1993`. Values range from 2000
-    to 24000 W/m^2/K.
+    to 24000 W/m^2/K. When `CASRN` is provided the dictionary is read on
+    every call, so values added to it or changed in it are used; with only
+    `CAS_index`, and in `ht.numba`, the values tabulated at import in
+    `h0_Gorenflow_1993_values` are used.
 
     Examples
     --------
@@ -821,17 +827,15 @@ def Gorenflo(P, Pc, q=None, Te=None, CASRN=None, h0=None, Ra=4E-7):
     Pr = P/Pc
     Ra0 = 0.4E-6
     q0 = 2E4
-    if h0 is None: # NUMBA: DELETE
-        try:
-            h0 = h0_Gorenflow_1993[CASRN]
-        except:
-            raise ValueError('Reference heat transfer coefficient not known')
+    if CAS_index is None:
+        CAS_index = -1 if CASRN is None else boiling_nucleic_index(CASRN)
+    if h0 is None and CASRN is not None: # numba: delete
+        h0 = h0_Gorenflow_1993.get(CASRN) # numba: delete
     if h0 is None:
-        try:
-            h0 = h0_Gorenflow_1993_values[h0_Gorenflow_1993_keys.index(CASRN)]
-        except:
+        if CAS_index < 0 or h0_Gorenflow_1993_values[CAS_index] == 0.0:
             raise ValueError('Reference heat transfer coefficient not known')
-    if CASRN != '7732-18-5':
+        h0 = h0_Gorenflow_1993_values[CAS_index]
+    if CAS_index != water_index:
         # Case for not dealing with water
         n = 0.9 - 0.3*Pr**0.3
         Fp = 1.2*Pr**0.27 + (2.5 + 1/(1-Pr))*Pr
@@ -872,6 +876,51 @@ cryogenics = {'132259-10-0': 'Air', '7440-37-1': 'Argon', '630-08-0':
 '74-82-8': 'methane', '7440-01-9': 'neon', '7727-37-9': 'nitrogen',
 '7782-44-7': 'oxygen', '7440-63-3': 'xenon'}
 
+# Numeric versions of the above tables, indexed by the position of a fluid's
+# CAS number in `boiling_nucleic_CASs`; 0.0 marks a missing h0. Tuples are
+# constants in numba-compiled code. They are a snapshot of the dictionaries
+# at import, used when only an index is given; lookups by CAS number read the
+# dictionaries themselves.
+boiling_nucleic_CASs = tuple(sorted(set(h0_Gorenflow_1993) | set(h0_VDI_2e) | set(cryogenics)))
+h0_Gorenflow_1993_values = tuple(h0_Gorenflow_1993.get(CAS, 0.0) for CAS in boiling_nucleic_CASs)
+h0_VDI_2e_values = tuple(h0_VDI_2e.get(CAS, 0.0) for CAS in boiling_nucleic_CASs)
+cryogenic_flags = tuple(CAS in cryogenics for CAS in boiling_nucleic_CASs)
+water_index = boiling_nucleic_CASs.index('7732-18-5')
+_boiling_nucleic_indexes = {CAS: i for i, CAS in enumerate(boiling_nucleic_CASs)}
+
+
+def boiling_nucleic_index(CAS):
+    r'''Returns the index of a fluid in the numeric tables of nucleate boiling
+    constants (`h0_Gorenflow_1993_values`, `h0_VDI_2e_values`,
+    `cryogenic_flags`), which can be passed as `CAS_index` to
+    :obj:`Gorenflo`, :obj:`h_nucleic_methods` and :obj:`h_nucleic` to avoid
+    looking up the CAS number on every call.
+
+    Parameters
+    ----------
+    CAS : str
+        CAS number of the fluid, [-]
+
+    Returns
+    -------
+    index : int
+        Index of the fluid in the tables, or -1 if it is not in any of them,
+        [-]
+
+    Examples
+    --------
+    >>> i = boiling_nucleic_index('7732-18-5')
+    >>> h0_Gorenflow_1993_values[i], cryogenic_flags[i]
+    (5600.0, False)
+    >>> boiling_nucleic_index('64-19-7')
+    -1
+    '''
+    return _boiling_nucleic_indexes.get(CAS, -1) # numba: delete
+    for i in range(len(boiling_nucleic_CASs)):
+        if boiling_nucleic_CASs[i] == CAS:
+            return i
+    return -1
+
 h_nucleic_all_methods = ['Stephan-Abdelsalam', 'Stephan-Abdelsalam water',
                      'Stephan-Abdelsalam cryogenic', 'HEDH-Taborek',
                      'Forster-Zuber', 'Rohsenow', 'Cooper', 'Bier',
@@ -879,7 +928,7 @@ h_nucleic_all_methods = ['Stephan-Abdelsalam', 'Stephan-Abdelsalam water',
 
 def h_nucleic_methods(Te=None, Tsat=None, P=None, dPsat=None, Cpl=None,
           kl=None, mul=None, rhol=None, sigma=None, Hvap=None, rhog=None,
-          MW=None, Pc=None, CAS=None, check_ranges=False):
+          MW=None, Pc=None, CAS=None, check_ranges=False, CAS_index=None):
     r'''This function returns the names of correlations for nucleate boiling
     heat flux.
 
@@ -916,6 +965,9 @@ def h_nucleic_methods(Te=None, Tsat=None, P=None, dPsat=None, Cpl=None,
     check_ranges : bool, optional
         Whether or not to return only correlations suitable for the provided
         data, [-]
+    CAS_index : int, optional
+        Index of the fluid from :obj:`boiling_nucleic_index`; used instead of
+        `CAS` if provided, [-]
 
     Returns
     -------
@@ -928,16 +980,21 @@ def h_nucleic_methods(Te=None, Tsat=None, P=None, dPsat=None, Cpl=None,
     ['Gorenflo (1993)', 'HEDH-Taborek', 'Bier', 'Montinsky']
     '''
     methods = []
+    if CAS_index is None:
+        CAS_index = -1 if CAS is None else boiling_nucleic_index(CAS)
+    has_h0 = CAS_index >= 0 and h0_Gorenflow_1993_values[CAS_index] != 0.0
+    cryogenic = CAS_index >= 0 and cryogenic_flags[CAS_index]
+    if CAS is not None: # numba: delete
+        has_h0, cryogenic = CAS in h0_Gorenflow_1993, CAS in cryogenics # numba: delete
     if P is not None and Pc is not None:
-        if CAS is not None and CAS in h0_Gorenflow_1993: # numba: delete
-#        if CAS is not None and CAS in h0_Gorenflow_1993_keys: # numba: uncomment
+        if has_h0:
             methods.append('Gorenflo (1993)')
     if (Te is not None and Tsat is not None and Cpl is not None and kl is not None
         and mul is not None and sigma is not None and Hvap is not None
         and rhol is not None and rhog is not None):
-        if CAS is not None and CAS == '7732-18-5':
+        if CAS_index == water_index:
             methods.append('Stephan-Abdelsalam water')
-        if CAS is not None and CAS in cryogenics:
+        if cryogenic:
             methods.append('Stephan-Abdelsalam cryogenic')
         methods.append('Stephan-Abdelsalam')
     if Te is not None and P is not None and Pc is not None:
@@ -965,7 +1022,7 @@ def h_nucleic(Te=None, q=None, Tsat=None, P=None, dPsat=None, Cpl=None,
               kl=None, mul=None, rhol=None, sigma=None, Hvap=None, rhog=None,
               MW=None, Pc=None, Csf=0.013, n=1.7, kw=401.0, rhow=8.96, Cpw=384.0,
               angle=35.0, Rp=1e-6, Ra=0.4e-6, h0=None,
-              CAS=None, Method=None):
+              CAS=None, Method=None, CAS_index=None):
     r'''This function handles the calculation of nucleate boiling
     heat flux and chooses the best method for performing the calculation
     based on the provided information.
@@ -1024,6 +1081,9 @@ def h_nucleic(Te=None, q=None, Tsat=None, P=None, dPsat=None, Cpl=None,
         Reference heat transfer coefficient for Gorenflo method, [W/m^2/K]
     CAS : str, optional
         CAS of fluid
+    CAS_index : int, optional
+        Index of the fluid from :obj:`boiling_nucleic_index`; used instead of
+        `CAS` if provided, [-]
 
     Returns
     -------
@@ -1062,10 +1122,12 @@ def h_nucleic(Te=None, q=None, Tsat=None, P=None, dPsat=None, Cpl=None,
     ... Method='Rohsenow')
     3723.655267067467
     '''
+    if CAS_index is None:
+        CAS_index = -1 if CAS is None else boiling_nucleic_index(CAS)
     if Method is None:
         methods = h_nucleic_methods(Te=Te, Tsat=Tsat, P=P, dPsat=dPsat, Cpl=Cpl,
               kl=kl, mul=mul, rhol=rhol, sigma=sigma, Hvap=Hvap, rhog=rhog,
-              MW=MW, Pc=Pc, CAS=CAS)
+              MW=MW, Pc=Pc, CAS_index=CAS_index)
         if not methods:
             raise ValueError('Insufficient property data for any method.')
         Method = methods[0]
@@ -1104,7 +1166,7 @@ def h_nucleic(Te=None, q=None, Tsat=None, P=None, dPsat=None, Cpl=None,
                     rhol=rhol, rhog=rhog)
 
     elif Method == 'Gorenflo (1993)':
-        return Gorenflo(P=P, q=q, Pc=Pc, Te=Te, CASRN=CAS, h0=h0, Ra=Ra)
+        return Gorenflo(P=P, q=q, Pc=Pc, Te=Te, CASRN=CAS, h0=h0, Ra=Ra, CAS_index=CAS_index)
     else:
         raise ValueError("Correlation name not recognized; see the "
                         "documentation for the available options.")
@@ -1395,3 +1457,444 @@ def qmax_boiling(rhol=None, rhog=None, sigma=None, Hvap=None, D=None, P=None,
     else:
         raise ValueError("Correlation name not recognized; options are "
                         "'Serth-HEDH', 'Zuber' and 'HEDH-Montinsky'")
+
+
+def qmax_boiling_array(rhol=None, rhog=None, sigma=None, Hvap=None, D=None,
+                       P=None, Pc=None, Method=None):
+    r'''Calculates the nucleate boiling critical heat flux for arrays of
+    conditions at once - for example every tube of a reboiler, or a range of
+    pressures. All inputs are broadcast against each other, and the method is
+    selected as in :obj:`qmax_boiling`.
+
+    Parameters
+    ----------
+    rhol : array_like, optional
+        Density of the liquid [kg/m^3]
+    rhog : array_like, optional
+        Density of the produced gas [kg/m^3]
+    sigma : array_like, optional
+        Surface tension of liquid [N/m]
+    Hvap : array_like, optional
+        Heat of vaporization of the fluid at T, [J/kg]
+    D : array_like, optional
+        Diameter of tubes [m]
+    P : array_like, optional
+        Saturation pressure of fluid, [Pa]
+    Pc : array_like, optional
+        Critical pressure of fluid, [Pa]
+
+    Returns
+    -------
+    q : ndarray
+        Nucleate boiling critical heat fluxes [W/m^2]
+
+    Other Parameters
+    ----------------
+    Method : string, optional
+        A string of the function name to use; one of ('Serth-HEDH', 'Zuber',
+        or 'HEDH-Montinsky')
+
+    Examples
+    --------
+    >>> qmax_boiling_array(D=[0.0005, 0.002, 0.0254], sigma=8.2E-3, Hvap=272E3,
+    ... rhol=567, rhog=18.09)
+    array([555611.36451204, 392876.56355078, 351867.46522902])
+    '''
+    if Method is None:
+        methods = qmax_boiling_methods(rhol=rhol, rhog=rhog, sigma=sigma,
+                                       Hvap=Hvap, D=D, P=P, Pc=Pc)
+        if not methods:
+            raise ValueError('Insufficient property or geometry data for any '
+                            'method.')
+        Method = methods[0]
+    if Method == 'Serth-HEDH' or Method == 'Zuber':
+        rhol, rhog = np.asarray(rhol, dtype=float), np.asarray(rhog, dtype=float)
+        sigma, Hvap = np.asarray(sigma, dtype=float), np.asarray(Hvap, dtype=float)
+        if Method == 'Serth-HEDH':
+            R = np.asarray(D, dtype=float)/2*(g*(rhol-rhog)/sigma)**0.5
+            K = np.where((0.12 <= R) & (R <= 1.17), 0.125*R**-0.25, 0.118)
+            return Zuber(sigma=sigma, Hvap=Hvap, rhol=rhol, rhog=rhog, K=K)
+        return Zuber(sigma=sigma, Hvap=Hvap, rhol=rhol, rhog=rhog)
+    elif Method == 'HEDH-Montinsky':
+        return HEDH_Montinsky(P=np.asarray(P, dtype=float),
+                              Pc=np.asarray(Pc, dtype=float))
+    else:
+        raise ValueError("Correlation name not recognized; options are "
+                        "'Serth-HEDH', 'Zuber' and 'HEDH-Montinsky'")
+
+
+def qmax_boiling_margin(q, rhol=None, rhog=None, sigma=None, Hvap=None,
+                        D=None, P=None, Pc=None, Method=None):
+    r'''Screens arrays of actual heat fluxes against the nucleate boiling
+    critical heat flux calculated with :obj:`qmax_boiling_array`, and locates
+    the point closest to the critical heat flux - for example the limiting
+    tube of a reboiler bundle.
+
+    .. math::
+        \text{margin} = 1 - \frac{q}{q_{max}}
+
+    Parameters
+    ----------
+    q : array_like
+        Actual heat fluxes, [W/m^2]
+    rhol : array_like, optional
+        Density of the liquid [kg/m^3]
+    rhog : array_like, optional
+        Density of the produced gas [kg/m^3]
+    sigma : array_like, optional
+        Surface tension of liquid [N/m]
+    Hvap : array_like, optional
+        Heat of vaporization of the fluid at T, [J/kg]
+    D : array_like, optional
+        Diameter of tubes [m]
+    P : array_like, optional
+        Saturation pressure of fluid, [Pa]
+    Pc : array_like, optional
+        Critical pressure of fluid, [Pa]
+
+    Returns
+    -------
+    qmax : ndarray
+        Nucleate boiling critical heat fluxes, broadcast to the shape of
+        `margin` [W/m^2]
+    margin : ndarray
+        Fraction of the critical heat flux which is unused at each point;
+        negative where the critical heat flux is exceeded, [-]
+    index : tuple[int]
+        Index of the point with the smallest margin, [-]
+
+    Other Parameters
+    ----------------
+    Method : string, optional
+        A string of the function name to use; one of ('Serth-HEDH', 'Zuber',
+        or 'HEDH-Montinsky')
+
+    Examples
+    --------
+    >>> qmax, margin, index = qmax_boiling_margin(q=[5E4, 2E5, 1.5E5],
+    ... P=310.3E3, Pc=2550E3)
+    >>> margin
+    array([0.87449978, 0.49799911, 0.62349933])
+    >>> index
+    (1,)
+    '''
+    qmax = qmax_boiling_array(rhol=rhol, rhog=rhog, sigma=sigma, Hvap=Hvap,
+                              D=D, P=P, Pc=Pc, Method=Method)
+    margin = 1.0 - np.asarray(q, dtype=float)/qmax
+    qmax = np.broadcast_to(qmax, margin.shape).copy()
+    index = np.unravel_index(np.argmin(margin), margin.shape)
+    return qmax, margin, tuple(int(i) for i in index)
+
+
+def h_nucleic_curve(Te=None, q=None, Tsat=None, P=None, dPsat=None, Cpl=None,
+                    kl=None, mul=None, rhol=None, sigma=None, Hvap=None,
+                    rhog=None, MW=None, Pc=None, Csf=0.013, n=1.7, kw=401.0,
+                    rhow=8.96, Cpw=384.0, angle=35.0, Rp=1e-6, Ra=0.4e-6,
+                    h0=None, CAS=None, D=None, Methods=None, CHF_Method=None,
+                    truncate=True):
+    r'''Calculates nucleate pool boiling curves - the heat transfer
+    coefficient and heat flux at an array of excess wall temperatures or
+    heat fluxes - for one or more correlations at once, and truncates them
+    at the critical heat flux calculated by :obj:`qmax_boiling`.
+
+    Each correlation is evaluated once for the whole array, so the method
+    selection and the terms which depend only on the fluid are computed once
+    per curve rather than once per point.
+
+    Parameters
+    ----------
+    Te : array_like, optional
+        Excess wall temperatures, [K]
+    q : array_like, optional
+        Heat fluxes, [W/m^2]
+    Tsat : float, optional
+        Saturation temperature at operating pressure [Pa]
+    P : float, optional
+        Saturation pressure of fluid, [Pa]
+    dPsat : float, optional
+        Difference in saturation pressure of the fluid at Te and T, [Pa]
+    Cpl : float, optional
+        Heat capacity of liquid [J/kg/K]
+    kl : float, optional
+        Thermal conductivity of liquid [W/m/K]
+    mul : float, optional
+        Viscosity of liquid [Pa*s]
+    rhol : float, optional
+        Density of the liquid [kg/m^3]
+    sigma : float, optional
+        Surface tension of liquid [N/m]
+    Hvap : float, optional
+        Heat of vaporization of the fluid at P, [J/kg]
+    rhog : float, optional
+        Density of the produced gas [kg/m^3]
+    MW : float, optional
+        Molecular weight of fluid, [g/mol]
+    Pc : float, optional
+        Critical pressure of fluid, [Pa]
+    Csf : float, optional
+        Rohsenow coefficient specific to fluid and metal [-]
+    n : float, optional
+        Rohsenow constant, 1 for water, 1.7 (default) for other fluids usually [-]
+    kw : float, optional
+        Thermal conductivity of wall (only for cryogenics) [W/m/K]
+    rhow : float, optional
+        Density of the wall (only for cryogenics) [kg/m^3]
+    Cpw : float, optional
+        Heat capacity of wall (only for cryogenics) [J/kg/K]
+    angle : float, optional
+        Contact angle of bubble with wall [degrees]
+    Rp : float, optional
+        Roughness parameter of the surface (1 micrometer default) used by
+        `Cooper` method, [m]
+    Ra : float, optional
+        Roughness parameter of the surface (0.4 micrometer default) for
+        Gorenflo method, [m]
+    h0 : float
+        Reference heat transfer coefficient for Gorenflo method, [W/m^2/K]
+    CAS : str, optional
+        CAS of fluid
+    D : float, optional
+        Diameter of tubes, used in calculating the critical heat flux [m]
+    Methods : str or list[str], optional
+        The names of the nucleate boiling methods to use (see
+        :obj:`h_nucleic`); if not provided, all methods which can be used with
+        the given inputs are calculated, [-]
+    CHF_Method : str, optional
+        The name of the critical heat flux method to use (see
+        :obj:`qmax_boiling`); if not provided, the preferred method is used,
+        [-]
+    truncate : bool, optional
+        Whether or not to remove the points of each curve whose heat flux
+        exceeds the critical heat flux, [-]
+
+    Returns
+    -------
+    curves : dict[str, dict[str, ndarray]]
+        For each method, a dictionary of the arrays `Te`, `q` and `h` of the
+        (possibly truncated) boiling curve, [K, W/m^2, W/m^2/K]
+    qmax : float
+        Critical heat flux at which the curves were truncated, or None if
+        there was not enough information to calculate it, [W/m^2]
+
+    Notes
+    -----
+    Points are removed from each curve individually, so the arrays of
+    different methods may have different lengths when truncated; the `Te`
+    or `q` array of each curve identifies the points which were kept.
+
+    Examples
+    --------
+    Water at 1 atm boiling on a surface with excess temperatures of 2-30 K:
+
+    >>> curves, qmax = h_nucleic_curve(Te=[2., 5., 10., 20., 30.], rhol=957.854,
+    ...     rhog=0.595593, mul=2.79E-4, kl=0.680, Cpl=4217, Hvap=2.257E6,
+    ...     sigma=0.0589, Csf=0.011, n=1.26, Methods=['Rohsenow'])
+    >>> qmax
+    1520355.489297395
+    >>> curves['Rohsenow']['Te']
+    array([ 2.,  5., 10., 20.])
+    '''
+    if Te is None and q is None:
+        raise ValueError('Either q or Te is needed for this correlation')
+    if Te is not None:
+        x = np.asarray(Te, dtype=float)
+    else:
+        x = np.asarray(q, dtype=float)
+    if Methods is None:
+        Methods = h_nucleic_methods(Te=1.0, Tsat=Tsat, P=P, dPsat=dPsat, Cpl=Cpl,
+                                    kl=kl, mul=mul, rhol=rhol, sigma=sigma,
+                                    Hvap=Hvap, rhog=rhog, MW=MW, Pc=Pc, CAS=CAS)
+        if not Methods:
+            raise ValueError('Insufficient property data for any method.')
+    elif isinstance(Methods, str):
+        Methods = [Methods]
+
+    try:
+        qmax = qmax_boiling(rhol=rhol, rhog=rhog, sigma=sigma, Hvap=Hvap, D=D,
+                            P=P, Pc=Pc, Method=CHF_Method)
+    except (ValueError, TypeError):
+        if CHF_Method is not None:
+            raise
+        qmax = None
+
+    curves = {}
+    for method in Methods:
+        kwargs = {'Te': x} if Te is not None else {'q': x}
+        h = h_nucleic(Tsat=Tsat, P=P, dPsat=dPsat, Cpl=Cpl, kl=kl, mul=mul,
+                      rhol=rhol, sigma=sigma, Hvap=Hvap, rhog=rhog, MW=MW, Pc=Pc,
+                      Csf=Csf, n=n, kw=kw, rhow=rhow, Cpw=Cpw, angle=angle,
+                      Rp=Rp, Ra=Ra, h0=h0, CAS=CAS, Method=method, **kwargs)
+        h = np.broadcast_to(np.asarray(h, dtype=float), x.shape)
+        if Te is not None:
+            Te_curve, q_curve = x, h*x
+        else:
+            Te_curve, q_curve = x/h, x
+        if truncate and qmax is not None:
+            keep = q_curve <= qmax
+            Te_curve, q_curve, h = Te_curve[keep], q_curve[keep], h[keep]
+        curves[method] = {'Te': np.array(Te_curve), 'q': np.array(q_curve),
+                          'h': np.array(h)}
+    return curves, qmax
+
+
+_h_nucleic_q_exponents = {'Stephan-Abdelsalam': 0.674,
+                          'Stephan-Abdelsalam water': 0.673,
+                          'Stephan-Abdelsalam cryogenic': 0.624,
+                          'HEDH-Taborek': 0.7, 'Forster-Zuber': 0.24/1.24,
+                          'Rohsenow': 2/3., 'Cooper': 0.67, 'Bier': 0.7,
+                          'Montinsky': 0.7, 'McNelly': 0.69}
+
+
+class NucleateBoilingState:
+    r'''Nucleate boiling correlation prepared for a single fluid state, for
+    repeated calculations of the heat transfer coefficient at different heat
+    fluxes or excess wall temperatures - as in the iterative solution of a
+    wall temperature.
+
+    All of the nucleate boiling correlations in :obj:`h_nucleic` are power
+    laws of the heat flux:
+
+    .. math::
+        h = A q^m
+
+    The coefficient `A`, which contains every fluid-dependent term, is
+    calculated once when the object is created, so each subsequent
+    evaluation costs one or two powers. With the excess wall temperature
+    specified, :math:`q = h T_e` gives:
+
+    .. math::
+        h = \left(A T_e^m\right)^{1/(1-m)}
+
+    Parameters
+    ----------
+    Method : str, optional
+        The name of the method to use (see :obj:`h_nucleic`); if not
+        provided, the method :obj:`h_nucleic` would select is used, [-]
+    **kwargs
+        The fluid properties, pressures and surface parameters accepted by
+        :obj:`h_nucleic` (`Tsat`, `P`, `dPsat`, `Cpl`, `kl`, `mul`, `rhol`,
+        `sigma`, `Hvap`, `rhog`, `MW`, `Pc`, `Csf`, `n`, `kw`, `rhow`, `Cpw`,
+        `angle`, `Rp`, `Ra`, `h0`, `CAS`, `CAS_index`), [various]
+
+    Attributes
+    ----------
+    Method : str
+        The name of the correlation, [-]
+    A : float
+        Coefficient of the heat flux power law, [W/m^2/K*(m^2/W)^m]
+    m : float
+        Exponent of the heat flux in the power law, [-]
+
+    Notes
+    -----
+    The results are identical to those of the correlation functions, to
+    within floating point rounding. The power law form does not hold for
+    `Forster-Zuber` if `dPsat` is updated with `Te`; in that case a new
+    object must be created for every `dPsat`.
+
+    Examples
+    --------
+    >>> state = NucleateBoilingState(P=3E5, Pc=22048320., MW=18.02, Method='Cooper')
+    >>> state.h_q(2E4)
+    4180.14106784
+    >>> state.h_Te(4.0)
+    2905.86788062
+    >>> state.h_Te_array([2.0, 4.0])
+    array([ 711.36706159, 2905.86788063])
+    '''
+    __slots__ = ('Method', 'A', 'm', 'A_Te', 'm_Te')
+
+    def __init__(self, Method=None, **kwargs):
+        if Method is None:
+            methods = h_nucleic_methods(Te=1.0, **{k: kwargs.get(k) for k in (
+                'Tsat', 'P', 'dPsat', 'Cpl', 'kl', 'mul', 'rhol', 'sigma', 'Hvap',
+                'rhog', 'MW', 'Pc', 'CAS', 'CAS_index')})
+            if not methods:
+                raise ValueError('Insufficient property data for any method.')
+            Method = methods[0]
+        if Method == 'Gorenflo (1993)':
+            Pr = kwargs['P']/kwargs['Pc']
+            CAS_index = kwargs.get('CAS_index')
+            if CAS_index is None:
+                CAS_index = boiling_nucleic_index(kwargs.get('CAS'))
+            if CAS_index != water_index:
+                m = 0.9 - 0.3*Pr**0.3
+            else:
+                m = 0.9 - 0.3*Pr**0.15
+        else:
+            try:
+                m = _h_nucleic_q_exponents[Method]
+            except KeyError:
+                raise ValueError("Correlation name not recognized; see the "
+                                 "documentation for the available options.")
+        self.Method = Method
+        self.m = m
+        self.A = A = h_nucleic(q=1.0, Method=Method, **kwargs)
+        self.m_Te = m/(1.0 - m)
+        self.A_Te = A**(1.0/(1.0 - m))
+
+    def __repr__(self):
+        return '<NucleateBoilingState %s, A=%g, m=%g>' %(self.Method, self.A, self.m)
+
+    def h_q(self, q):
+        r'''Calculates the heat transfer coefficient at a heat flux.
+
+        Parameters
+        ----------
+        q : float
+            Heat flux, [W/m^2]
+
+        Returns
+        -------
+        h : float
+            Heat transfer coefficient [W/m^2/K]
+        '''
+        return self.A*q**self.m
+
+    def h_Te(self, Te):
+        r'''Calculates the heat transfer coefficient at an excess wall
+        temperature.
+
+        Parameters
+        ----------
+        Te : float
+            Excess wall temperature, [K]
+
+        Returns
+        -------
+        h : float
+            Heat transfer coefficient [W/m^2/K]
+        '''
+        return self.A_Te*Te**self.m_Te
+
+    def h_q_array(self, q):
+        r'''Calculates the heat transfer coefficient at an array of heat
+        fluxes.
+
+        Parameters
+        ----------
+        q : array_like
+            Heat fluxes, [W/m^2]
+
+        Returns
+        -------
+        h : ndarray
+            Heat transfer coefficients [W/m^2/K]
+        '''
+        return self.A*np.power(np.asarray(q, dtype=float), self.m)
+
+    def h_Te_array(self, Te):
+        r'''Calculates the heat transfer coefficient at an array of excess
+        wall temperatures.
+
+        Parameters
+        ----------
+        Te : array_like
+            Excess wall temperatures, [K]
+
+        Returns
+        -------
+        h : ndarray
+            Heat transfer coefficients [W/m^2/K]
+        '''
+        return self.A_Te*np.power(np.asarray(Te, dtype=float), self.m_Te)
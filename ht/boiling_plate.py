@@ -24,11 +24,15 @@ from math import radians
 
 from fluids.constants import g
 from fluids.core import Bond, Prandtl, thermal_diffusivity
+from fluids.numerics import numpy as np
 from fluids.two_phase_voidage import Lockhart_Martinelli_Xtt
 
+from ht.conv_plate import Nu_plate_Martin
+
 __all__ = ['h_boiling_Amalfi', 'h_boiling_Lee_Kang_Kim',
            'h_boiling_Han_Lee_Kim', 'h_boiling_Huang_Sheer',
-           'h_boiling_Yan_Lin']
+           'h_boiling_Yan_Lin', 'plate_evaporator',
+           'plate_evaporator_methods']
 
 def h_boiling_Amalfi(m, x, Dh, rhol, rhog, mul, mug, kl, Hvap, sigma, q,
                      A_channel_flow, chevron_angle=45.0):
@@ -568,5 +572,222 @@ def h_boiling_Yan_Lin(m, x, Dh, rhol, rhog, mul, kl, Hvap, Cpl, q,
     return 1.926*(kl/Dh)*Re_eq*Pr_l**(1/3.)*Bo_eq**0.3*Re**-0.5
 
 
+plate_evaporator_methods = ['Amalfi', 'Han_Lee_Kim', 'Yan_Lin']
+'''Boiling correlations supported by :obj:`plate_evaporator`.'''
+
+
+def _h_boiling_plate_array(Method, m, x, Dh, rhol, rhog, mul, mug, kl, Hvap,
+                           sigma, Cpl, q, A_channel_flow, wavelength,
+                           chevron_angle):
+    # Array versions of the plate boiling correlations; only `h_boiling_Amalfi`
+    # has a branch which needs replacing
+    if Method == 'Amalfi':
+        beta_s = chevron_angle/45.
+        rho_s = rhol/rhog
+        G = m/A_channel_flow
+        Bd = Bond(rhol=rhol, rhog=rhog, sigma=sigma, L=Dh)
+        rho_h = 1./(x/rhog + (1. - x)/rhol)
+        We_m = G*G*Dh/sigma/rho_h
+        Bo = q/(G*Hvap)
+        Re_lo = G*Dh/mul
+        Re_g = G*x*Dh/mug
+        Nu_tp = np.where(Bd < 4.,
+                         982*beta_s**1.101*We_m**0.315*Bo**0.320*rho_s**-0.224,
+                         18.495*beta_s**0.135*Re_g**0.135*Re_lo**0.351*Bd**0.235*Bo**0.198*rho_s**-0.223)
+        return kl/Dh*Nu_tp
+    elif Method == 'Han_Lee_Kim':
+        return h_boiling_Han_Lee_Kim(m=m, x=x, Dh=Dh, rhol=rhol, rhog=rhog,
+                                     mul=mul, kl=kl, Hvap=Hvap, Cpl=Cpl, q=q,
+                                     A_channel_flow=A_channel_flow,
+                                     wavelength=wavelength,
+                                     chevron_angle=chevron_angle)
+    return h_boiling_Yan_Lin(m=m, x=x, Dh=Dh, rhol=rhol, rhog=rhog, mul=mul,
+                             kl=kl, Hvap=Hvap, Cpl=Cpl, q=q,
+                             A_channel_flow=A_channel_flow)
+
+
+def plate_evaporator(m, x_in, Tsat, m_w, T_w_in, A, Dh, A_channel_flow,
+                     rhol, rhog, mul, kl, Cpl, Hvap, Cp_w, k_w, mu_w,
+                     mug=None, sigma=None, wavelength=None, chevron_angle=45.0,
+                     R_wall=0.0, Method='Amalfi', counterflow=True, zones=10,
+                     xtol=1E-10, maxiter=100):
+    r'''Rates a brazed-plate evaporator, with a fluid boiling in one channel
+    and water cooled in the adjacent channel, for arrays of operating points
+    at once - for example every point of a chiller performance map.
+
+    The heat transfer area of the channel is divided into `zones` zones of
+    equal area along the flow. In each zone the boiling heat transfer
+    coefficient is calculated with a plate boiling correlation at the zone's
+    quality and heat flux, and the water side coefficient with
+    :obj:`ht.conv_plate.Nu_plate_Martin`:
+
+    .. math::
+        \frac{1}{U} = \frac{1}{h_w} + R_{wall} + \frac{1}{h(x, q)}
+
+    As the boiling fluid is at a constant temperature, the heat capacity
+    ratio of the water side of every zone is zero, and the
+    :obj:`ht.hx.temperature_effectiveness_plate` of the water in each zone
+    is the same for any flow arrangement:
+
+    .. math::
+        P_{1} = 1 - \exp\left(-\frac{U A_{zone}}{\dot m_w C_{p,w}}\right)
+
+    .. math::
+        q A_{zone} = P_1 \dot m_w C_{p,w}(T_{w,zone,in} - T_{sat})
+
+    Because every correlation depends on the heat flux, the heat fluxes of
+    all zones of all operating points are solved simultaneously by
+    fixed-point iteration, which converges quickly as the boiling heat
+    transfer coefficient depends only weakly on the heat flux.
+
+    Parameters
+    ----------
+    m : array_like
+        Mass flow rate of the boiling fluid in the channel [kg/s]
+    x_in : array_like
+        Quality of the boiling fluid at the inlet, [-]
+    Tsat : array_like
+        Saturation temperature of the boiling fluid, [K]
+    m_w : array_like
+        Mass flow rate of water in the adjacent channel [kg/s]
+    T_w_in : array_like
+        Inlet temperature of the water, [K]
+    A : float
+        Heat transfer area of the channel, [m^2]
+    Dh : float
+        Hydraulic diameter of the channels, :math:`D_h = \frac{4\lambda}{\phi}` [m]
+    A_channel_flow : float
+        The flow area of each channel, calculated as
+        :math:`A_{ch} = 2\cdot \text{width} \cdot \text{amplitude}` [m^2]
+    rhol : float
+        Density of the liquid [kg/m^3]
+    rhog : float
+        Density of the gas [kg/m^3]
+    mul : float
+        Viscosity of the liquid [Pa*s]
+    kl : float
+        Thermal conductivity of liquid [W/m/K]
+    Cpl : float
+        Heat capacity of liquid [J/kg/K]
+    Hvap : float
+        Heat of vaporization of the fluid at the system pressure, [J/kg]
+    Cp_w : float
+        Heat capacity of the water [J/kg/K]
+    k_w : float
+        Thermal conductivity of the water [W/m/K]
+    mu_w : float
+        Viscosity of the water [Pa*s]
+    mug : float, optional
+        Viscosity of the gas, needed by the `Amalfi` method [Pa*s]
+    sigma : float, optional
+        Surface tension of liquid, needed by the `Amalfi` method [N/m]
+    wavelength : float, optional
+        Distance between the corrugations, needed by the `Han_Lee_Kim`
+        method [m]
+    chevron_angle : float, optional
+        Angle of the plate corrugations with respect to the vertical axis
+        (the direction of flow if the plates were straight), between 0 and
+        90. [degrees]
+    R_wall : float, optional
+        Thermal resistance of the plate and any fouling, [m^2*K/W]
+    Method : str, optional
+        The boiling correlation to use; one of
+        :obj:`plate_evaporator_methods`, [-]
+    counterflow : bool, optional
+        Whether the water flows counter to the boiling fluid, [-]
+    zones : int, optional
+        Number of zones the channel is divided into, [-]
+    xtol : float, optional
+        Relative tolerance on the heat fluxes, [-]
+    maxiter : int, optional
+        Maximum number of iterations, [-]
+
+    Returns
+    -------
+    results : dict[str, ndarray]
+        Dictionary of the following arrays, of the broadcast shape of the
+        operating points plus a last dimension of length `zones` for the
+        profiles, which are ordered in the direction of the boiling fluid:
+
+        * x : Quality at the middle of each zone [-]
+        * q : Heat flux of each zone [W/m^2]
+        * h : Boiling heat transfer coefficient of each zone [W/m^2/K]
+        * U : Overall heat transfer coefficient of each zone [W/m^2/K]
+        * T_w : Water temperature entering each zone [K]
+        * h_w : Water side heat transfer coefficient [W/m^2/K]
+        * Q : Heat transferred in the channel [W]
+        * T_w_out : Outlet temperature of the water [K]
+        * x_out : Outlet quality of the boiling fluid [-]
+
+    Notes
+    -----
+    The same plate geometry is used for both channels. Pressure drop of the
+    boiling fluid is neglected, and the boiling fluid is assumed to remain
+    two-phase; an outlet quality above one indicates the evaporator would
+    have a superheating zone, which is not modeled.
 
+    The water side coefficient does not depend on the heat flux and is
+    calculated once per operating point.
+
+    Examples
+    --------
+    R134a evaporating against two water flow rates:
+
+    >>> res = plate_evaporator(m=6E-3, x_in=0.2, Tsat=278.15, m_w=[0.03, 0.05],
+    ... T_w_in=285.15, A=0.1, Dh=0.0034, A_channel_flow=2.2E-4, rhol=1278.,
+    ... rhog=17.1, mul=2.7E-4, mug=1.07E-5, kl=0.0911, Cpl=1360., Hvap=1.95E5,
+    ... sigma=0.0107, Cp_w=4195., k_w=0.58, mu_w=1.3E-3)
+    >>> res['Q']
+    array([575.65625072, 774.33536463])
+    >>> res['x_out']
+    array([0.69201389, 0.8618251 ])
+    '''
+    if Method not in plate_evaporator_methods:
+        raise ValueError("Correlation name not recognized; options are %s" %(plate_evaporator_methods,))
+    if Method == 'Amalfi' and (mug is None or sigma is None):
+        raise ValueError('The Amalfi method requires mug and sigma')
+    if Method == 'Han_Lee_Kim' and wavelength is None:
+        raise ValueError('The Han_Lee_Kim method requires wavelength')
+    arrays = [np.asarray(v, dtype=float) for v in np.broadcast_arrays(m, x_in, Tsat, m_w, T_w_in)]
+    shape = arrays[0].shape
+    m, x_in, Tsat, m_w, T_w_in = [v[..., None] for v in arrays]
+
+    Re_w = m_w/A_channel_flow*Dh/mu_w
+    Pr_w = Prandtl(Cp=Cp_w, k=k_w, mu=mu_w)
+    Nu_w = np.array([Nu_plate_Martin(Re=Re_i, Pr=Pr_i, chevron_angle=chevron_angle)
+                     for Re_i, Pr_i in zip(Re_w.ravel(), np.broadcast_to(Pr_w, Re_w.shape).ravel())])
+    h_w = Nu_w.reshape(Re_w.shape)*k_w/Dh
+    C_w = m_w*Cp_w
+    dA = A/zones
+    dT = T_w_in - Tsat
+
+    def water_in(P):
+        # Temperature difference of the water entering each zone
+        keep = 1.0 - P
+        if counterflow:
+            keep = keep[..., ::-1]
+        theta = dT*np.concatenate((np.ones(shape + (1,)), np.cumprod(keep[..., :-1], axis=-1)), axis=-1)
+        return theta[..., ::-1] if counterflow else theta
+
+    q = np.broadcast_to(dT/(2.0/h_w + R_wall), shape + (zones,))
+    for _ in range(maxiter):
+        Q_zone = q*dA
+        x = x_in + (np.cumsum(Q_zone, axis=-1) - 0.5*Q_zone)/(m*Hvap)
+        h = _h_boiling_plate_array(Method, m, x, Dh, rhol, rhog, mul, mug, kl,
+                                   Hvap, sigma, Cpl, q, A_channel_flow,
+                                   wavelength, chevron_angle)
+        U = 1.0/(1.0/h_w + R_wall + 1.0/h)
+        P = -np.expm1(-U*dA/C_w)
+        theta = water_in(P)
+        q_new = P*C_w*theta/dA
+        err = np.max(np.abs(q_new - q)/np.abs(q_new)) if q_new.size else 0.0
+        q = q_new
+        if err <= xtol:
+            break
+    else:
+        raise ValueError('Plate evaporator heat fluxes did not converge')
 
+    Q = np.sum(q, axis=-1)*dA
+    return {'x': x, 'q': q, 'h': h, 'U': U, 'T_w': Tsat + theta,
+            'h_w': h_w[..., 0], 'Q': Q, 'T_w_out': T_w_in[..., 0] - Q/C_w[..., 0],
+            'x_out': x_in[..., 0] + Q/(m[..., 0]*Hvap)}
@@ -0,0 +1,240 @@
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2026 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Opt-in memoization of ht functions which run a numerical solver on every
+call. Nothing is cached unless it is enabled; caching can be turned on for
+all of the solver-backed functions at once, or for individual functions by
+name.
+
+>>> import ht.caching
+>>> ht.caching.enable_cache('DBundle_for_Ntubes_Phadkeb', maxsize=256)
+>>> ht.DBundle_for_Ntubes_Phadkeb(Ntubes=3913, Do=.028, pitch=.036, Ntp=2, angle=45.)
+2.58171729053
+>>> ht.DBundle_for_Ntubes_Phadkeb(Ntubes=3913, Do=.028, pitch=.036, Ntp=2, angle=45.)
+2.58171729053
+>>> ht.caching.cache_info('DBundle_for_Ntubes_Phadkeb')
+{'DBundle_for_Ntubes_Phadkeb': CacheInfo(hits=1, misses=1, maxsize=256, currsize=1)}
+>>> ht.caching.disable_cache()
+
+Each cache is a bounded least-recently-used cache from :obj:`functools.lru_cache`,
+which is safe to use from multiple threads. Enabling a cache replaces the
+function in `ht`, in the submodule which defines it, and in every other ht
+submodule which imported it, so calls made inside ht (for instance from
+:obj:`ht.hx.size_bundle_from_tubecount`) are cached as well. References
+obtained before the cache was enabled (`from ht import Thome`) keep calling
+the uncached function.
+
+Calls with unhashable arguments are passed through to the function without
+being cached. Cached results are shared between calls, so mutable results
+such as the list returned by `nearest_material(..., complete=True)` should not
+be modified in place.
+
+Caching and :obj:`ht.instrumentation` can be used together, in any order; the
+cache is always placed inside the timing wrapper, so every call is counted,
+including those answered from the cache.
+'''
+
+import sys
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from threading import RLock
+
+import ht
+
+__all__ = ['enable_cache', 'disable_cache', 'clear_cache', 'cache_info',
+           'cached_functions', 'solver_functions']
+
+solver_functions = ('Thome', 'NTU_from_P_basic', 'NTU_from_P_J', 'NTU_from_P_G',
+                    'NTU_from_P_E', 'NTU_from_P_H', 'NTU_from_P_plate',
+                    'DBundle_for_Ntubes_Phadkeb', 'size_bundle_from_tubecount',
+                    'Nu_Nusselt_Rayleigh_Holling_Herwig', 'nearest_material')
+'''Names of the functions cached by :obj:`enable_cache` when no name is given.'''
+
+_lock = RLock()
+_originals = {}
+_wrappers = {}
+
+
+def _as_names(names):
+    if names is None:
+        return tuple(_wrappers.keys())
+    if isinstance(names, str):
+        return (names,)
+    return tuple(names)
+
+
+def _replace_everywhere(old, new):
+    name = old.__name__
+    if getattr(ht, name, None) is old:
+        setattr(ht, name, new)
+    for mod in ht.submodules:
+        if getattr(mod, name, None) is old:
+            setattr(mod, name, new)
+
+
+@contextmanager
+def _outside_instrumentation():
+    # Timing wrappers are removed while caches are changed and put back
+    # afterwards, so they always wrap the cache and are found on top when
+    # instrumentation is disabled.
+    instrumentation = sys.modules.get('ht.instrumentation')
+    active = instrumentation is not None and instrumentation.instrumentation_enabled()
+    if active:
+        instrumentation.disable_instrumentation()
+    try:
+        yield
+    finally:
+        if active:
+            instrumentation.enable_instrumentation()
+
+
+def _make_wrapper(func, maxsize):
+    cached = lru_cache(maxsize=maxsize)(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return cached(*args, **kwargs)
+        except TypeError:
+            # Unhashable arguments cannot be cached
+            for v in args:
+                try:
+                    hash(v)
+                except TypeError:
+                    return func(*args, **kwargs)
+            for v in kwargs.values():
+                try:
+                    hash(v)
+                except TypeError:
+                    return func(*args, **kwargs)
+            raise
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def enable_cache(names=None, maxsize=1024):
+    r'''Enables a bounded least-recently-used cache for one or more ht
+    functions. Re-enabling a cache which is already active with a different
+    `maxsize` discards its contents.
+
+    Parameters
+    ----------
+    names : str or list[str], optional
+        Names of the ht functions to cache; if not provided, all the
+        functions in :obj:`solver_functions` are cached, [-]
+    maxsize : int, optional
+        Maximum number of results stored for each function; None for no
+        limit, [-]
+
+    Examples
+    --------
+    >>> enable_cache(['Thome', 'nearest_material'], maxsize=128)
+    >>> sorted(cached_functions())
+    ['Thome', 'nearest_material']
+    >>> disable_cache()
+    '''
+    if names is None:
+        names = solver_functions
+    with _lock, _outside_instrumentation():
+        for name in _as_names(names):
+            if name in _wrappers:
+                if _wrappers[name].cache_info().maxsize == maxsize:
+                    continue
+                func = _originals[name]
+                _replace_everywhere(_wrappers[name], func)
+            else:
+                func = getattr(ht, name, None)
+                if not callable(func) or not hasattr(func, '__code__'):
+                    raise ValueError("%s is not a function in ht" %(name,))
+            wrapper = _make_wrapper(func, maxsize)
+            _replace_everywhere(func, wrapper)
+            _originals[name] = func
+            _wrappers[name] = wrapper
+
+
+def disable_cache(names=None):
+    r'''Disables the cache of one or more ht functions, restoring the original
+    functions and discarding the cached results.
+
+    Parameters
+    ----------
+    names : str or list[str], optional
+        Names of the ht functions to stop caching; if not provided, all
+        caches are disabled, [-]
+    '''
+    with _lock, _outside_instrumentation():
+        for name in _as_names(names):
+            if name not in _wrappers:
+                continue
+            wrapper = _wrappers.pop(name)
+            _replace_everywhere(wrapper, _originals.pop(name))
+            wrapper.cache_clear()
+
+
+def clear_cache(names=None):
+    r'''Empties the cache of one or more ht functions and resets their hit
+    and miss counters, without disabling caching.
+
+    Parameters
+    ----------
+    names : str or list[str], optional
+        Names of the ht functions whose caches should be emptied; if not
+        provided, all caches are emptied, [-]
+    '''
+    with _lock:
+        for name in _as_names(names):
+            if name in _wrappers:
+                _wrappers[name].cache_clear()
+
+
+def cache_info(names=None):
+    r'''Returns the statistics of the caches of one or more ht functions.
+
+    Parameters
+    ----------
+    names : str or list[str], optional
+        Names of the ht functions to report on; if not provided, all enabled
+        caches are reported, [-]
+
+    Returns
+    -------
+    info : dict[str, CacheInfo]
+        Named tuples of `hits`, `misses`, `maxsize` and `currsize` for each
+        function with an enabled cache, [-]
+    '''
+    with _lock:
+        return {name: _wrappers[name].cache_info() for name in _as_names(names)
+                if name in _wrappers}
+
+
+def cached_functions():
+    r'''Returns the names of the ht functions which currently have a cache
+    enabled.
+
+    Returns
+    -------
+    names : list[str]
+        Names of the cached functions, [-]
+    '''
+    with _lock:
+        return list(_wrappers.keys())
@@ -20,15 +20,17 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
-from math import pi, sin
+from math import pi, sin, sqrt
 
 from fluids.constants import R, g
 from fluids.core import Prandtl, Reynolds
+from fluids.numerics import numpy as np
 
 from ht.conv_internal import turbulent_Dittus_Boelter
 
 __all__ = ['Boyko_Kruzhilin', 'Nusselt_laminar', 'h_kinetic',
-           'Akers_Deans_Crosser', 'Cavallini_Smith_Zecchin', 'Shah']
+           'Akers_Deans_Crosser', 'Cavallini_Smith_Zecchin', 'Shah',
+           'condenser_march', 'condenser_march_methods']
 
 
 def Nusselt_laminar(Tsat, Tw, rhog, rhol, kl, mul, Hvap, L, angle=90.):
@@ -433,3 +435,252 @@ def Shah(m, x, D, rhol, mul, kl, Cpl, P, Pc):
     Pr = P/Pc
     return hL*((1-x)**0.8 + 3.8*x**0.76*(1-x)**0.04/Pr**0.38)
 
+
+
+condenser_march_methods = ['Shah', 'Cavallini_Smith_Zecchin', 'Boyko_Kruzhilin',
+                           'Akers_Deans_Crosser']
+
+# Five-point Gauss-Legendre rule on [0, 1]; an open rule, so the integrand is
+# never evaluated at x = 1 where some correlations give h = 0
+_GL_a, _GL_b = sqrt(5. - 2.*sqrt(10./7.))/3., sqrt(5. + 2.*sqrt(10./7.))/3.
+_GL_nodes = [0.5 - 0.5*_GL_b, 0.5 - 0.5*_GL_a, 0.5, 0.5 + 0.5*_GL_a, 0.5 + 0.5*_GL_b]
+_GL_weights = [0.5*(322. - 13.*sqrt(70.))/900., 0.5*(322. + 13.*sqrt(70.))/900.,
+               0.5*128./225., 0.5*(322. + 13.*sqrt(70.))/900.,
+               0.5*(322. - 13.*sqrt(70.))/900.]
+
+
+def _condensation_h_array(Method, x, m, D, p):
+    if Method == 'Shah':
+        return Shah(m=m, x=x, D=D, rhol=p['rhol'], mul=p['mul'], kl=p['kl'],
+                    Cpl=p['Cpl'], P=p['P'], Pc=p['Pc'])
+    elif Method == 'Cavallini_Smith_Zecchin':
+        return Cavallini_Smith_Zecchin(m=m, x=x, D=D, rhol=p['rhol'], rhog=p['rhog'],
+                                       mul=p['mul'], mug=p['mug'], kl=p['kl'], Cpl=p['Cpl'])
+    elif Method == 'Boyko_Kruzhilin':
+        return Boyko_Kruzhilin(m=m, rhog=p['rhog'], rhol=p['rhol'], kl=p['kl'],
+                               mul=p['mul'], Cpl=p['Cpl'], D=D, x=x)
+    elif Method == 'Akers_Deans_Crosser':
+        rhol, mul, kl = p['rhol'], p['mul'], p['kl']
+        G = m/(pi/4*D**2)
+        Ree = D*G*((1-x) + x*(rhol/p['rhog'])**0.5)/mul
+        Prl = mul*p['Cpl']/kl
+        Nu = np.where(Ree > 5E4, 0.0265*Ree**0.8, 5.03*Ree**(1/3.))*Prl**(1/3.)
+        return Nu*kl/D
+    raise ValueError("Correlation name not recognized; options are %s" %(condenser_march_methods,))
+
+
+def condenser_march(m, D, Tsat, Hvap, rhol, rhog, mul, kl, Cpl, Tc_in, h_c,
+                    mc=None, Cpc=None, mug=None, P=None, Pc=None, x_in=1.0,
+                    x_out=0.0, counterflow=True, Method='Shah', stations=21,
+                    rtol=1E-9, maxiter=20):
+    r'''Integrates the length of condenser tubes needed to condense a
+    saturated vapor from quality `x_in` to `x_out`, for many tubes or passes
+    at once, coupled to a coolant flowing along the outside of each tube.
+
+    The length is integrated along the quality:
+
+    .. math::
+        \frac{dz}{dx} = -\frac{\dot m \Delta H_{vap}}{\pi D U(x)
+        (T_{sat} - T_c(x))}
+
+    .. math::
+        \frac{1}{U(x)} = \frac{1}{h(x)} + \frac{1}{h_c}
+
+    As the saturation temperature is constant, the coolant temperature is a
+    linear function of the quality from its energy balance; for
+    counterflow the coolant enters where the condensate leaves (`x_out`),
+    otherwise where the vapor enters (`x_in`):
+
+    .. math::
+        T_c(x) = T_{c,in} + \frac{\dot m \Delta H_{vap}}{\dot m_c C_{p,c}}
+        |x - x_{c,in}|
+
+    The integral between each pair of reporting stations is evaluated with a
+    composite Gauss-Legendre rule whose number of panels is doubled until all
+    tubes have converged to `rtol`.
+
+    Parameters
+    ----------
+    m : array_like
+        Mass flow rate of condensing fluid in each tube [kg/s]
+    D : array_like
+        Inner diameter of the tubes [m]
+    Tsat : float
+        Saturation temperature of the condensing fluid, [K]
+    Hvap : float
+        Heat of vaporization of the condensing fluid [J/kg]
+    rhol : float
+        Density of the liquid [kg/m^3]
+    rhog : float
+        Density of the gas [kg/m^3]
+    mul : float
+        Viscosity of liquid [Pa*s]
+    kl : float
+        Thermal conductivity of liquid [W/m/K]
+    Cpl : float
+        Heat capacity of liquid [J/kg/K]
+    Tc_in : array_like
+        Inlet temperature of the coolant of each tube, [K]
+    h_c : array_like
+        Heat transfer coefficient from the inner tube wall to the coolant,
+        including the wall and any fouling, based on the inner area
+        [W/m^2/K]
+    mc : array_like, optional
+        Mass flow rate of coolant per tube; if not provided, the coolant
+        temperature is constant [kg/s]
+    Cpc : array_like, optional
+        Heat capacity of the coolant [J/kg/K]
+    mug : float, optional
+        Viscosity of gas, needed by `Cavallini_Smith_Zecchin` [Pa*s]
+    P : float, optional
+        Pressure of the condensing fluid, needed by `Shah` [Pa]
+    Pc : float, optional
+        Critical pressure of the condensing fluid, needed by `Shah` [Pa]
+    x_in : float, optional
+        Quality of the vapor entering the tubes [-]
+    x_out : float, optional
+        Quality of the fluid leaving the tubes [-]
+    counterflow : bool, optional
+        Whether the coolant flows counter-current to the condensing fluid,
+        [-]
+    Method : str, optional
+        The condensation correlation to use; one of
+        :obj:`condenser_march_methods`, [-]
+    stations : int, optional
+        Number of equally spaced qualities between `x_in` and `x_out` at which
+        the profiles are reported, [-]
+    rtol : float, optional
+        Relative tolerance of the length of each interval, [-]
+    maxiter : int, optional
+        Maximum number of panel doublings for each interval, [-]
+
+    Returns
+    -------
+    results : dict[str, ndarray]
+        Dictionary of the following arrays; the quality profile `x` has the
+        shape (stations,), the other profiles (tubes, stations) and the
+        totals (tubes,):
+
+        * x : Quality profile [-]
+        * z : Position along each tube at each quality [m]
+        * Tc : Coolant temperature profiles [K]
+        * h : Condensation heat transfer coefficient profiles [W/m^2/K]
+        * U : Overall heat transfer coefficient profiles [W/m^2/K]
+        * q : Heat flux profiles, based on the inner area [W/m^2]
+        * L : Length of each tube [m]
+        * A : Inner heat transfer area of each tube [m^2]
+        * Q : Heat released by the condensing fluid in each tube [W]
+        * Tc_out : Outlet temperature of the coolant of each tube [K]
+
+    Notes
+    -----
+    Pressure drop of the condensing fluid, subcooling of the condensate and
+    desuperheating of the vapor are not considered. A ValueError is raised if
+    the coolant would reach the saturation temperature.
+
+    Examples
+    --------
+    >>> res = condenser_march(m=[0.01, 0.02], D=0.02, Tsat=320., Hvap=1.6E5,
+    ... rhol=1100., rhog=40., mul=1.6E-4, kl=0.075, Cpl=1500., Tc_in=300.,
+    ... h_c=3000., mc=0.2, Cpc=4180., P=1.6E6, Pc=4E6, Method='Shah',
+    ... stations=3)
+    >>> res['L']
+    array([4.65471755, 5.98732086])
+    >>> res['z'][0]
+    array([0.        , 1.75656759, 4.65471755])
+    '''
+    if Method not in condenser_march_methods:
+        raise ValueError("Correlation name not recognized; options are %s" %(condenser_march_methods,))
+    arrays = [m, D, Tc_in, h_c] + ([mc, Cpc] if mc is not None else [])
+    arrays = [np.asarray(v, dtype=float) for v in np.broadcast_arrays(*arrays)]
+    shape = arrays[0].shape
+    m, D, Tc_in, h_c = [v.ravel() for v in arrays[:4]]
+    Q = m*Hvap*(x_in - x_out)
+    if mc is not None:
+        dTc_dx = m*Hvap/(arrays[4].ravel()*arrays[5].ravel())
+    else:
+        dTc_dx = np.zeros(m.size)
+    x_c_in = x_out if counterflow else x_in
+    if np.any(Tc_in + dTc_dx*abs(x_in - x_out) >= Tsat):
+        raise ValueError('The coolant would reach the saturation temperature')
+    p = {'rhol': rhol, 'rhog': rhog, 'mul': mul, 'mug': mug, 'kl': kl,
+         'Cpl': Cpl, 'P': P, 'Pc': Pc}
+
+    def local(x, i=slice(None)):
+        # Returns h, U, the coolant temperature and the heat flux at x
+        h = _condensation_h_array(Method, x, m[i], D[i], p)
+        with np.errstate(divide='ignore'):
+            U = 1./(1./h + 1./h_c[i])
+        Tc = Tc_in[i] + dTc_dx[i]*np.abs(x - x_c_in)
+        return h, U, Tc, U*(Tsat - Tc)
+
+    def dz_dx(x, i):
+        return m[i]*Hvap/(pi*D[i]*local(x, i)[3])
+
+    # Akers-Deans-Crosser is discontinuous where Ree = 5E4; split there
+    if Method == 'Akers_Deans_Crosser':
+        G = m/(pi/4*D**2)
+        x_break = (5E4*mul/(D*G) - 1.)/((rhol/rhog)**0.5 - 1.)
+    else:
+        x_break = None
+
+    S = int(stations)
+    xs = np.linspace(x_in, x_out, S)
+    N = m.size
+    z = np.zeros((N, S))
+    for k in range(1, S):
+        lo, hi = xs[k], xs[k-1]
+        if x_break is not None:
+            mid = np.clip(x_break, lo, hi)
+            pieces = ((np.full(N, lo), mid), (mid, np.full(N, hi)))
+        else:
+            pieces = ((np.full(N, lo), np.full(N, hi)),)
+        length = np.zeros(N)
+        for a, b in pieces:
+            length += _gauss_legendre_array(dz_dx, a, b, rtol, maxiter)
+        z[:, k] = z[:, k-1] + length
+
+    h, U, Tc, q = (np.empty((N, S)) for _ in range(4))
+    for k in range(S):
+        h[:, k], U[:, k], Tc[:, k], q[:, k] = local(np.full(N, xs[k]))
+    L = z[:, -1]
+    results = {'z': z, 'Tc': Tc, 'h': h, 'U': U, 'q': q}
+    results = {k: v.reshape(shape + (S,)) for k, v in results.items()}
+    results['x'] = xs
+    results['L'] = L.reshape(shape)
+    results['A'] = (pi*D*L).reshape(shape)
+    results['Q'] = Q.reshape(shape)
+    results['Tc_out'] = (Tc_in + dTc_dx*abs(x_in - x_out)).reshape(shape)
+    return results
+
+
+def _gauss_legendre_array(func, a, b, rtol=1E-9, maxiter=20):
+    # Integrates func(x, idx) from a to b for many independent integrands,
+    # doubling the number of Gauss-Legendre panels until each converges
+    N = a.size
+    result = np.zeros(N)
+    active = np.arange(N)[a != b]
+
+    def composite(panels, idx):
+        # Panels in t, mapped to x with a polynomial whose derivative vanishes
+        # at both ends, which smooths weak singularities of the integrand there
+        t = ((np.arange(panels)[:, None] + _GL_nodes)/panels).ravel()
+        weights = np.tile(_GL_weights, panels)*30.0*t*t*(1.0 - t)*(1.0 - t)/panels
+        s = t*t*t*(10.0 + t*(6.0*t - 15.0))
+        width = (b[idx] - a[idx])[:, None]
+        x = a[idx][:, None] + width*s
+        return (func(x, idx[:, None])*weights).sum(axis=1)*width[:, 0]
+
+    panels = 1
+    previous = composite(panels, active)
+    for _ in range(maxiter):
+        if not active.size:
+            return result
+        panels *= 2
+        current = composite(panels, active)
+        done = np.abs(current - previous) <= rtol*np.abs(current)
+        result[active[done]] = current[done]
+        active, previous = active[~done], current[~done]
+    if active.size:
+        raise ValueError('Integration did not converge for %d tubes' %(active.size,))
+    return result
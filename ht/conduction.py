@@ -23,6 +23,7 @@ SOFTWARE.
 from math import acosh, log, pi
 
 from fluids.constants import Btu, degree_Fahrenheit, foot, hour, inch
+from fluids.numerics import numpy as np
 
 __all__ = ['R_to_k', 'k_to_R', 'k_to_thermal_resistivity',
 'thermal_resistivity_to_k', 'R_value_to_k', 'k_to_R_value', 'R_cylinder',
@@ -30,7 +31,9 @@ __all__ = ['R_to_k', 'k_to_R', 'k_to_thermal_resistivity',
 'S_isothermal_pipe_normal_to_plane',
 'S_isothermal_pipe_to_isothermal_pipe', 'S_isothermal_pipe_to_two_planes',
 'S_isothermal_pipe_eccentric_to_isothermal_pipe',
-'cylindrical_heat_transfer']
+'cylindrical_heat_transfer', 'cylindrical_heat_transfer_array',
+'cylindrical_heat_transfer_dtype', 'cylindrical_layer_dtype',
+'buried_pipe_network']
 
 
 def R_to_k(R, t, A=1.):
@@ -678,3 +681,207 @@ def cylindrical_heat_transfer(Ti, To, hi, ho, Di, ts, ks):
     ans = {'Q': Q, 'q': q, 'UA': UA, 'U_outer': U_external, 'U_inner': UA/A_internal, 'Ts': Ts,
           'Rs': Rs}
     return ans
+
+
+cylindrical_heat_transfer_dtype = [('Q', float), ('q', float), ('UA', float),
+                                   ('U_inner', float), ('U_outer', float)]
+cylindrical_layer_dtype = [('R', float), ('T', float)]
+
+
+def cylindrical_heat_transfer_array(Ti, To, hi, ho, Di, offsets, ts, ks):
+    r'''Batched version of :obj:`cylindrical_heat_transfer`, calculating the
+    heat transfer through many cylindrical walls at once. Each wall can
+    have a different number of layers; the layers of all the walls are
+    packed one after the other into the flat arrays `ts` and `ks`, and the
+    layers of wall `i` are those from `offsets[i]` to `offsets[i+1]`.
+
+    The calculation is vectorized over the walls, with a loop only over
+    the position of a layer in its wall; the layers are summed in the same
+    order as in :obj:`cylindrical_heat_transfer`.
+
+    Parameters
+    ----------
+    Ti : float or array_like
+        Temperatures of the inside of the cylinders, [K]
+    To : float or array_like
+        External temperatures outside the cylinders, away from the cylinder
+        walls, [K]
+    hi : float or array_like
+        Inside heat transfer coefficients, [W/m^2/K]
+    ho : float or array_like
+        Outside heat transfer coefficients, [W/m^2/K]
+    Di : float or array_like
+        Inside diameters of the cylinders, [m]
+    offsets : array_like[int]
+        Start of the layers of each cylinder in `ts` and `ks`, followed by
+        the total number of layers; of length one more than the number of
+        cylinders, [-]
+    ts : array_like
+        Thicknesses of all of the layers of all of the cylinders, [m]
+    ks : array_like
+        Thermal conductivities of all of the layers of all of the
+        cylinders, [W/m/K]
+
+    Returns
+    -------
+    cylinders : ndarray
+        Structured array with one record per cylinder with the fields
+        of :obj:`cylindrical_heat_transfer_dtype`: `Q` [W/m], `q` [W/m^2],
+        `UA` [W/K/m], `U_inner` and `U_outer` [W/m^2/K]
+    layers : ndarray
+        Structured array with one record per layer, in the order of `ts`,
+        with the fields of :obj:`cylindrical_layer_dtype`: `R`, the thermal
+        resistance of the layer [m*K/W], and `T`, the temperature of the
+        outside of the layer [K]
+
+    Examples
+    --------
+    >>> cylinders, layers = cylindrical_heat_transfer_array(Ti=453.15,
+    ... To=301.15, hi=1e12, ho=[22.697193, 10.0], Di=0.0779272, offsets=[0, 2, 3],
+    ... ts=[0.0054864, .05, .03], ks=[56.045, 0.0598535265, 0.04])
+    >>> cylinders['Q']
+    array([73.12000884, 60.73870879])
+    >>> layers['T']
+    array([453.12264558, 306.57853015, 315.16734501])
+    '''
+    offsets = np.asarray(offsets)
+    ts = 1.0*np.asarray(ts)
+    ks = 1.0*np.asarray(ks)
+    N, M = len(offsets) - 1, len(ts)
+    if (offsets.ndim != 1 or N < 0 or offsets[0] != 0 or offsets[-1] != M
+            or len(ks) != M or np.any(np.diff(offsets) < 0)):
+        raise ValueError("offsets must increase from 0 to the number of layers in ts and ks")
+    Ti, To, hi, ho, Di = (np.broadcast_to(1.0*np.asarray(v), (N,))
+                          for v in (Ti, To, hi, ho, Di))
+    starts = offsets[:-1]
+    counts = np.diff(offsets)
+    wall = np.repeat(np.arange(N), counts)
+    layer_positions = [(np.nonzero(counts > j)[0], starts[counts > j] + j)
+                       for j in range(counts.max() if N else 0)]
+
+    external_diameter = Di + 2.0*np.bincount(wall, weights=ts, minlength=N)
+    A_external = pi*external_diameter
+    A_internal = pi*Di
+
+    Ds_inner, Ds_outer = np.empty(M), np.empty(M)
+    Do_running = Di.copy()
+    for walls, layer in layer_positions:
+        Ds_inner[layer] = Do_running[walls]
+        Do_running[walls] = 2.0*ts[layer] + Do_running[walls]
+        Ds_outer[layer] = Do_running[walls]
+    Rs = 0.5*external_diameter[wall]*np.log(Ds_outer/Ds_inner)/ks
+    R_layers = np.bincount(wall, weights=Rs, minlength=N)
+
+    U_external = 1.0/(external_diameter/Di/hi + R_layers + 1.0/ho)
+    UA = A_external*U_external
+    Q = UA*(Ti - To)
+    q = Q/A_external
+
+    Ts = np.empty(M)
+    T_running = Ti.copy()
+    for walls, layer in layer_positions:
+        T_running[walls] = T_running[walls] - q[walls]*Rs[layer]
+        Ts[layer] = T_running[walls]
+
+    cylinders = np.empty(N, dtype=cylindrical_heat_transfer_dtype)
+    cylinders['Q'], cylinders['q'], cylinders['UA'] = Q, q, UA
+    cylinders['U_inner'], cylinders['U_outer'] = UA/A_internal, U_external
+    layers = np.empty(M, dtype=cylindrical_layer_dtype)
+    layers['R'], layers['T'] = Rs, Ts
+    return cylinders, layers
+
+
+def buried_pipe_network(T, T_ground, k, x, Z, D, R_pipes=0.0, L=1.0):
+    r'''Calculates the heat lost by each pipe of a group of parallel pipes
+    buried in the ground, such as the supply and return lines of a district
+    heating trench, accounting for the heating of the soil around each pipe
+    by all of the others. The ground surface is an isothermal plane at
+    `T_ground`, and the method of images is used to superpose the
+    temperature fields of the pipes:
+
+    .. math::
+        T_i - T_{ground} = \sum_j R_{ij} q_j
+
+    .. math::
+        R_{ii} = R_{pipe,i} + \frac{1}{k S_i}
+        = R_{pipe,i} + \frac{\cosh^{-1}(2Z_i/D_i)}{2\pi k}
+
+    .. math::
+        R_{ij} = \frac{1}{2\pi k}\ln\sqrt{\frac{(x_i-x_j)^2 + (Z_i+Z_j)^2}
+        {(x_i-x_j)^2 + (Z_i-Z_j)^2}}
+
+    where :math:`S_i` is the shape factor of a pipe to a plane of
+    :obj:`S_isothermal_pipe_to_plane`. The whole matrix is assembled at once
+    and the heat flows of all the pipes are found with a single linear solve.
+
+    Parameters
+    ----------
+    T : array_like
+        Temperatures of the fluids in each pipe; a 2D array with one column
+        per operating case solves several cases at once, [K]
+    T_ground : float or array_like
+        Temperature of the ground surface, [K]
+    k : float
+        Thermal conductivity of the soil, [W/m/K]
+    x : array_like
+        Horizontal positions of the centers of the pipes, [m]
+    Z : array_like
+        Depths of the centers of the pipes below the ground surface, [m]
+    D : array_like
+        Outer diameters of the pipes, [m]
+    R_pipes : float or array_like, optional
+        Thermal resistances per meter of length between the fluid in each
+        pipe and the outer surface of the pipe, including any insulation
+        layers and the inside heat transfer coefficient, [m*K/W]
+    L : float, optional
+        Length of the pipes, [m]
+
+    Returns
+    -------
+    results : dict
+        * Q : Heat lost by each pipe, [W]
+        * q : Heat lost by each pipe per meter of length, [W/m]
+        * Ts : Temperatures of the outer surfaces of the pipes, [K]
+        * R : Matrix of thermal resistances per meter of length, [m*K/W]
+
+    Notes
+    -----
+    Each pipe is treated as a line source for its effect on the other
+    pipes, which is accurate when the pipes are several diameters apart.
+    A pipe with a negative heat loss is gaining heat from the others.
+
+    Examples
+    --------
+    A supply and return pipe pair:
+
+    >>> ans = buried_pipe_network(T=[363.15, 323.15], T_ground=283.15, k=1.5,
+    ... x=[0.0, 0.4], Z=[1.0, 1.0], D=[0.2, 0.2], R_pipes=0.6, L=100.0)
+    >>> ans['Q']
+    array([8187.86376736, 2816.88645806])
+
+    References
+    ----------
+    .. [1] Bergman, Theodore L., Adrienne S. Lavine, Frank P. Incropera, and
+       David P. DeWitt. Introduction to Heat Transfer. 6E. Hoboken, NJ:
+       Wiley, 2011.
+    '''
+    x, Z, D = (1.0*np.asarray(v) for v in (x, Z, D))
+    N = len(x)
+    if Z.shape != (N,) or D.shape != (N,):
+        raise ValueError("x, Z and D must all be one value per pipe")
+    if np.any(2.0*Z <= D):
+        raise ValueError("Every pipe must be entirely below the ground surface")
+    dx = x[:, None] - x[None, :]
+    d2 = dx*dx + (Z[:, None] - Z[None, :])**2
+    if N > 1 and np.any((d2 <= 0.25*(D[:, None] + D[None, :])**2)[~np.eye(N, dtype=bool)]):
+        raise ValueError("Pipes may not overlap")
+
+    np.fill_diagonal(d2, 1.0)
+    R = np.log((dx*dx + (Z[:, None] + Z[None, :])**2)/d2)*(0.25/(pi*k))
+    R[np.diag_indices(N)] = np.arccosh(2.0*Z/D)/(2.0*pi*k) + R_pipes
+
+    T = 1.0*np.asarray(T)
+    q = np.linalg.solve(R, T - T_ground)
+    R_pipes = np.broadcast_to(R_pipes, (N,)).reshape((N,) + (1,)*(q.ndim - 1))
+    Ts = T - R_pipes*q
+    return {'Q': q*L, 'q': q, 'Ts': Ts, 'R': R}
@@ -23,8 +23,10 @@ SOFTWARE.
 from math import exp, log
 
 from fluids.numerics import bisplev, horner, implementation_optimize_tck, secant
+from fluids.numerics import numpy as np
 
-__all__ = ['Nu_Nusselt_Rayleigh_Holling_Herwig', 'Nu_Nusselt_Rayleigh_Probert',
+__all__ = ['Nu_Nusselt_Rayleigh_Holling_Herwig', 'Nu_Nusselt_Rayleigh_Holling_Herwig_array',
+           'Nu_Nusselt_Rayleigh_Probert',
            'Nu_Nusselt_Rayleigh_Hollands',
            'Rac_Nusselt_Rayleigh', 'Rac_Nusselt_Rayleigh_disk',
            'Nu_Nusselt_vertical_Thess',
@@ -32,7 +34,7 @@ __all__ = ['Nu_Nusselt_Rayleigh_Holling_Herwig', 'Nu_Nusselt_Rayleigh_Probert',
            'Nu_vertical_helical_coil_Prabhanjan_Rennie_Raghavan',
            ]
 
-__numba_additional_funcs__ = ['Nu_Nusselt_Rayleigh_Holling_Herwig_err']
+__numba_additional_funcs__ = ['Nu_Nusselt_Rayleigh_Holling_Herwig_err', 'Holling_Herwig_ln_Nu']
 
 
 def Nu_Nusselt_Rayleigh_Holling_Herwig_err(Nu, Ra, Ra_third, D2):
@@ -40,6 +42,74 @@ def Nu_Nusselt_Rayleigh_Holling_Herwig_err(Nu, Ra, Ra_third, D2):
     return err
 
 
+# Chebyshev fits of ln(Nu) to the solution of the Holling-Herwig equation in
+# terms of ln(Ra), converted to power series; relative error under 5E-15 from
+# Ra = 1708 to 1E15
+Holling_Herwig_Ra_max = 1E15
+Holling_Herwig_coeffs_0 = [3.0101669252771516e-10, -9.501977632620894e-10,
+                           1.6399481497873794e-09, -5.437404755300239e-09,
+                           2.0629469619314105e-08, -6.730205250617116e-08,
+                           2.180572721073658e-07, -7.210855963867513e-07,
+                           2.4020774029873277e-06, -8.06203871042916e-06,
+                           2.7347195484840874e-05, -9.405387894601622e-05,
+                           0.0003294855527718072, -0.0011842528605160133,
+                           0.004421745222610972, -0.01752318601313962,
+                           0.07507626216381921, -0.038319728776032375,
+                           1.1178728995341056]
+Holling_Herwig_coeffs_1 = [1.356798859640764e-09, -3.4915377770430172e-09,
+                           2.2060558531316513e-09, -6.598558792326738e-09,
+                           3.400489591085714e-08, -9.067244671878264e-08,
+                           2.2580245161608038e-07, -6.179638533975984e-07,
+                           1.7122207375368307e-06, -4.728695295149349e-06,
+                           1.3155074063336583e-05, -3.696481323428966e-05,
+                           0.00010508954258631295, -0.0003032340914679249,
+                           0.0008924575697902343, -0.002702287294914065,
+                           0.008523000775525806, -0.02794464687387073,
+                           0.0894037700668677, 0.5080659079190871,
+                           1.5187341828354408]
+Holling_Herwig_coeffs_2 = [3.677513893990638e-11, -1.530418182510258e-10,
+                           3.328894942919185e-10, -1.0903768733256462e-09,
+                           4.437860518296275e-09, -1.6185735435238928e-08,
+                           5.798815499182447e-08, -2.1159059265349212e-07,
+                           7.793491893072313e-07, -2.8942294727460327e-06,
+                           1.0872840962482203e-05, -4.161555710722606e-05,
+                           0.00016403683880433014, -0.000665917339526262,
+                           0.00268659811880412, -0.00995150881301253,
+                           0.03070606102988008, 1.0479240461726076,
+                           3.098440429119541]
+Holling_Herwig_coeffs_3 = [1.569963721849171e-11, -5.207065021406207e-11,
+                           3.373227841401473e-11, -1.9143477515980706e-10,
+                           8.979214836390839e-10, -2.7012396639144054e-09,
+                           9.255494503680328e-09, -3.203290842799747e-08,
+                           1.0807706491267263e-07, -3.6946886158287533e-07,
+                           1.297477224322854e-06, -4.729201691051404e-06,
+                           1.7764823622113627e-05, -6.641567125554164e-05,
+                           0.00023497093827485712, -0.0007473035713201721,
+                           0.0020363113772016756, -0.004561658304253974,
+                           0.00944808662601052, 2.2218578601036,
+                           6.37400952069292]
+
+# Upper bound in ln(Ra) of each fit, the center of its interval, and the scale
+# to the Chebyshev domain [-1, 1]
+Holling_Herwig_x_upper = (9.210340371976184, 13.815510557964274, 20.72326583694641, 34.538776394910684)
+Holling_Herwig_x_center = (8.32670937316235, 11.512925464970229, 17.269388197455342, 27.631021115928547)
+Holling_Herwig_x_scale = (1.1316941136542031, 0.4342944819032519, 0.2895296546021679, 0.14476482730108395)
+Holling_Herwig_segments = tuple(zip(Holling_Herwig_x_upper, Holling_Herwig_x_center, Holling_Herwig_x_scale,
+                                    (Holling_Herwig_coeffs_0, Holling_Herwig_coeffs_1,
+                                     Holling_Herwig_coeffs_2, Holling_Herwig_coeffs_3)))
+
+
+def Holling_Herwig_ln_Nu(x):
+    # Fit of ln(Nu) as a function of x = ln(Ra)
+    if x < Holling_Herwig_x_upper[0]:
+        return horner(Holling_Herwig_coeffs_0, Holling_Herwig_x_scale[0]*(x - Holling_Herwig_x_center[0]))
+    elif x < Holling_Herwig_x_upper[1]:
+        return horner(Holling_Herwig_coeffs_1, Holling_Herwig_x_scale[1]*(x - Holling_Herwig_x_center[1]))
+    elif x < Holling_Herwig_x_upper[2]:
+        return horner(Holling_Herwig_coeffs_2, Holling_Herwig_x_scale[2]*(x - Holling_Herwig_x_center[2]))
+    return horner(Holling_Herwig_coeffs_3, Holling_Herwig_x_scale[3]*(x - Holling_Herwig_x_center[3]))
+
+
 def Nu_Nusselt_Rayleigh_Holling_Herwig(Pr, Gr, buoyancy=True):
     r'''Calculates the Nusselt number for natural convection between two
     theoretical flat horizontal plates. The height between the plates is infinite, and
@@ -48,7 +118,8 @@ def Nu_Nusselt_Rayleigh_Holling_Herwig(Pr, Gr, buoyancy=True):
     This correlation is for the horizontal plate Rayleigh-Benard classic heat
     transfer problem, not for real finite geometry plates.
 
-    This model is a non-linear equation which is solved numerically.
+    This model is a non-linear equation, which is evaluated with a fit of
+    its solution or solved numerically.
     The model can calculate `Nu` for `Ra` ranges between 350 and larger
     numbers; [1]_ recommends :math:`10^{5} < Ra < 10^{15}`.
 
@@ -84,14 +155,17 @@ def Nu_Nusselt_Rayleigh_Holling_Herwig(Pr, Gr, buoyancy=True):
     `Nu` is also 1.
 
     No success has been found finding an analytical solution in the major CAS
-    packages, but the nonlinear function is in fact a function of one variable;
-    this means a pade or chebyshev expansion could be performed.
+    packages, but the nonlinear function is in fact a function of one variable.
+    For :math:`1708 \le Ra \le 10^{15}`, piecewise Chebyshev fits of
+    :math:`\ln Nu` in terms of :math:`\ln Ra` are used, which reproduce the
+    solution of the equation to a relative error under 5E-15; above that range
+    the equation is solved numerically.
 
 
     Examples
     --------
     >>> Nu_Nusselt_Rayleigh_Holling_Herwig(5.54, 3.21e8, buoyancy=True)
-    77.54656801896913
+    77.5465680189692
 
     References
     ----------
@@ -109,6 +183,8 @@ def Nu_Nusselt_Rayleigh_Holling_Herwig(Pr, Gr, buoyancy=True):
     Ra = Gr*Pr
     if Ra < Rac:
         return 1.0
+    if Ra <= Holling_Herwig_Ra_max:
+        return exp(Holling_Herwig_ln_Nu(log(Ra)))
 
     Ra_third = Ra**(1.0/3.0)
     D2 = 2.0*(-14.94*Ra**-0.25 + 3.43)
@@ -116,6 +192,57 @@ def Nu_Nusselt_Rayleigh_Holling_Herwig(Pr, Gr, buoyancy=True):
     return secant(Nu_Nusselt_Rayleigh_Holling_Herwig_err, Nu_guess, args=(Ra, Ra_third, D2))
 
 
+def Nu_Nusselt_Rayleigh_Holling_Herwig_array(Pr, Gr, buoyancy=True):
+    r'''Calculates the Nusselt number for natural convection between two
+    theoretical flat horizontal plates according to
+    :obj:`Nu_Nusselt_Rayleigh_Holling_Herwig`, for arrays of conditions at
+    once. `Pr` and `Gr` are broadcast against each other.
+
+    Parameters
+    ----------
+    Pr : array_like
+        Prandtl number with respect to fluid properties [-]
+    Gr : array_like
+        Grashof number with respect to fluid properties and plate - plate
+        temperature difference [-]
+    buoyancy : bool, optional
+        Whether or not the plate's free convection is buoyancy assisted (hot
+        plate) or not, [-]
+
+    Returns
+    -------
+    Nu : ndarray
+        Nusselt number with respect to height between the two plates, [-]
+
+    Notes
+    -----
+    Points with `Ra` above the range of the fit are solved one at a time.
+
+    Examples
+    --------
+    >>> Nu_Nusselt_Rayleigh_Holling_Herwig_array(5.54, [1E3, 3.21e8, 1E12])
+    array([   3.04296308,   77.54656802, 1017.58262207])
+    '''
+    Ra = np.asarray(Pr, dtype=float)*np.asarray(Gr, dtype=float)
+    shape = Ra.shape
+    Ra = Ra.ravel()
+    Nu = np.ones(Ra.shape)
+    if not buoyancy:
+        return Nu.reshape(shape)
+    x = np.log(np.maximum(Ra, 1708.0))
+    fit = (Ra >= 1708.0) & (Ra <= Holling_Herwig_Ra_max)
+    lower = -np.inf
+    for i, (upper, offset, scale, coeffs) in enumerate(Holling_Herwig_segments):
+        # The last fit also covers its upper bound, Holling_Herwig_Ra_max
+        mask = fit & (x >= lower) & ((x < upper) | (i == len(Holling_Herwig_segments) - 1))
+        if np.any(mask):
+            Nu[mask] = np.exp(horner(coeffs, scale*(x[mask] - offset)))
+        lower = upper
+    for i in np.flatnonzero(Ra > Holling_Herwig_Ra_max):
+        Nu[i] = Nu_Nusselt_Rayleigh_Holling_Herwig(1.0, float(Ra[i]))
+    return Nu.reshape(shape)
+
+
 def Nu_Nusselt_Rayleigh_Probert(Pr, Gr, buoyancy=True):
     r'''Calculates the Nusselt number for natural convection between two
     theoretical flat plates. The height between the plates is infinite, and
@@ -20,7 +20,12 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
-from math import log
+from math import log, pi
+
+from fluids.constants import g, sigma
+from fluids.numerics import numpy as np
+
+from ht.radiation import q_rad
 
 __all__ = ['Nu_vertical_plate_Churchill',
            'Nu_free_vertical_plate',
@@ -48,7 +53,8 @@ __all__ = ['Nu_vertical_plate_Churchill',
            'Nu_horizontal_cylinder_Morgan',
            'Nu_horizontal_cylinder',
            'Nu_horizontal_cylinder_methods',
-           'Nu_coil_Xin_Ebadian']
+           'Nu_coil_Xin_Ebadian',
+           'cylinder_surface_temperature']
 
 
 def Nu_vertical_plate_Churchill(Pr, Gr):
@@ -1671,3 +1677,175 @@ def Nu_coil_Xin_Ebadian(Pr, Gr, horizontal=False):
         return 0.318*Ra**0.293
     else:
         return 0.290*Ra**0.293
+
+
+def cylinder_surface_temperature(T_in, T_inf, Di, ts, ks, k, rho, mu, Cp,
+                                 emissivity, beta=None, T_surroundings=None,
+                                 hi=None, horizontal=True, L=1.0, xtol=1E-9,
+                                 maxiter=100):
+    r'''Solves for the outer surface temperature of bare or insulated pipes or
+    vessels losing heat to a quiescent ambient by free convection and
+    radiation, for arrays of geometries and conditions at once - for example
+    every segment of a pipe network. The heat conducted through the layers of
+    the wall matches the heat lost from the outer surface:
+
+    .. math::
+        \frac{T_{in} - T_s}{R'} = \pi D_o\left[h_{conv}(T_s - T_\infty)
+        + \sigma\epsilon(T_s^4 - T_{surr}^4)\right]
+
+    .. math::
+        R' = \frac{1}{\pi D_i h_i} + \sum_j \frac{\ln(D_{j+1}/D_j)}{2\pi k_j}
+
+    The free convection coefficient is calculated with
+    :obj:`Nu_horizontal_cylinder_Churchill_Chu` for horizontal cylinders,
+    with respect to the outer diameter, or with
+    :obj:`Nu_vertical_plate_Churchill` for vertical cylinders, with respect
+    to their length. The surface temperature of all points is solved
+    simultaneously with Newton's method, using a numerical derivative;
+    each point keeps a bracket of its solution and takes a bisection step
+    whenever a Newton step would leave it.
+
+    Parameters
+    ----------
+    T_in : array_like
+        Temperature of the inner surface of the innermost layer, or of the
+        fluid inside if `hi` is provided, [K]
+    T_inf : array_like
+        Temperature of the ambient fluid, [K]
+    Di : array_like
+        Inner diameter of the innermost layer, [m]
+    ts : list[array_like]
+        Thicknesses of each layer of the wall and any insulation, from the
+        inside out; may be empty for a bare surface [m]
+    ks : list[array_like]
+        Thermal conductivities of each layer, [W/m/K]
+    k : array_like
+        Thermal conductivity of the ambient fluid, [W/m/K]
+    rho : array_like
+        Density of the ambient fluid, [kg/m^3]
+    mu : array_like
+        Viscosity of the ambient fluid, [Pa*s]
+    Cp : array_like
+        Heat capacity of the ambient fluid, [J/kg/K]
+    emissivity : array_like
+        Emissivity of the outer surface, [-]
+    beta : array_like, optional
+        Volumetric thermal expansion coefficient of the ambient fluid; if not
+        provided, the ideal gas value at the film temperature is used [1/K]
+    T_surroundings : array_like, optional
+        Temperature of the surroundings the surface radiates to; if not
+        provided, `T_inf` is used [K]
+    hi : array_like, optional
+        Heat transfer coefficient of the fluid inside, [W/m^2/K]
+    horizontal : bool, optional
+        Whether the cylinders are horizontal or vertical, [-]
+    L : array_like, optional
+        Length of the cylinders; needed for vertical cylinders, and otherwise
+        only used to calculate the total heat loss [m]
+    xtol : float, optional
+        Tolerance on the surface temperature, [K]
+    maxiter : int, optional
+        Maximum number of iterations, [-]
+
+    Returns
+    -------
+    results : dict[str, ndarray]
+        Dictionary of the following arrays, of the broadcast shape of the
+        inputs:
+
+        * Ts : Outer surface temperature [K]
+        * q : Heat flux lost from the outer surface [W/m^2]
+        * Q : Heat lost from each cylinder of length `L` [W]
+        * h_conv : Free convection heat transfer coefficient [W/m^2/K]
+        * h_rad : Equivalent radiation heat transfer coefficient, with
+          respect to :math:`T_s - T_{surr}` [W/m^2/K]
+        * converged : Whether the surface temperature converged [-]
+        * iterations : Number of iterations taken [-]
+
+    Notes
+    -----
+    The ambient fluid properties are not updated as the surface temperature
+    changes; they should be evaluated at an estimated film temperature.
+    Points which do not converge within `maxiter` iterations are reported
+    with `converged` False rather than raising an exception.
+
+    Examples
+    --------
+    A steel pipe with 50 mm of insulation, and the same pipe bare, in air:
+
+    >>> res = cylinder_surface_temperature(T_in=[450., 450.], T_inf=293.15,
+    ... Di=0.1, ts=[[0.008, 0.008], [0.05, 0.0]], ks=[45., 0.04], k=0.0263,
+    ... rho=1.177, mu=1.85E-5, Cp=1007., emissivity=[0.3, 0.8])
+    >>> res['Ts']
+    array([308.09167928, 449.47999385])
+    >>> res['Q']
+    array([ 57.35653836, 990.62303054])
+    '''
+    if T_surroundings is None:
+        T_surroundings = T_inf
+    Di = np.asarray(Di, dtype=float)
+    Do, R = Di, 0.0
+    for t, k_layer in zip(ts, ks):
+        D_next = Do + 2.0*np.asarray(t, dtype=float)
+        R = R + np.log(D_next/Do)/(2.0*pi*np.asarray(k_layer, dtype=float))
+        Do = D_next
+    if hi is not None:
+        R = R + 1.0/(pi*Di*np.asarray(hi, dtype=float))
+    arrays = [T_in, T_inf, T_surroundings, Do, R, emissivity, k, rho, mu, Cp, L,
+              0.0 if beta is None else beta]
+    arrays = [np.asarray(v, dtype=float) for v in np.broadcast_arrays(*arrays)]
+    shape = arrays[0].shape
+    T_in, T_inf, T_surr, Do, R, emissivity, k, rho, mu, Cp, L, beta_value = [v.ravel() for v in arrays]
+    Pr = Cp*mu/k
+    nu = mu/rho
+    Lc = Do if horizontal else L
+    RA = R*pi*Do
+
+    def losses(Ts):
+        dT = Ts - T_inf
+        beta_i = beta_value if beta is not None else 2.0/(Ts + T_inf)
+        Gr = g*beta_i*np.abs(dT)*Lc**3/(nu*nu)
+        if horizontal:
+            Nu = Nu_horizontal_cylinder_Churchill_Chu(Pr, Gr)
+        else:
+            Nu = Nu_vertical_plate_Churchill(Pr, Gr)
+        h_conv = Nu*k/Lc
+        return h_conv*dT + q_rad(emissivity, Ts, T_surr), h_conv
+
+    def residual(Ts):
+        return T_in - Ts - RA*losses(Ts)[0]
+
+    # The residual decreases with Ts and changes sign between these bounds
+    low = np.minimum(np.minimum(T_in, T_inf), T_surr)
+    high = np.maximum(np.maximum(T_in, T_inf), T_surr)
+    Ts = T_inf + (T_in - T_inf)/(1.0 + 10.0*RA)
+    converged = np.zeros(Ts.shape, dtype=bool)
+    iterations = np.zeros(Ts.shape, dtype=int)
+    for _ in range(maxiter):
+        err = residual(Ts)
+        low = np.where(err > 0.0, Ts, low)
+        high = np.where(err < 0.0, Ts, high)
+        step = 1E-7*Ts
+        derivative = (residual(Ts + step) - err)/step
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = np.where(err == 0.0, 0.0, err/derivative)
+        Ts_new = Ts - delta
+        done = np.abs(delta) <= xtol
+        bisect = ~(done | ((Ts_new >= low) & (Ts_new <= high)))
+        Ts_new = np.where(bisect, 0.5*(low + high), Ts_new)
+        done |= high - low <= xtol
+        iterations += ~converged
+        Ts = np.where(converged, Ts, Ts_new)
+        converged |= done
+        if converged.all():
+            break
+
+    q, h_conv = losses(Ts)
+    q_radiation = q_rad(emissivity, Ts, T_surr)
+    dT_surr = Ts - T_surr
+    h_rad = np.where(dT_surr != 0.0, q_radiation/np.where(dT_surr != 0.0, dT_surr, 1.0),
+                     4.0*sigma*emissivity*T_surr**3)
+    return {'Ts': Ts.reshape(shape), 'q': q.reshape(shape),
+            'Q': (q*pi*Do*L).reshape(shape), 'h_conv': h_conv.reshape(shape),
+            'h_rad': h_rad.reshape(shape), 'converged': converged.reshape(shape),
+            'iterations': iterations.reshape(shape)}
@@ -22,11 +22,14 @@ SOFTWARE.
 
 from math import log10
 
+from fluids.numerics import numpy as np
+
 __all__ = ['Nu_McAdams', 'Nu_Shitsman', 'Nu_Griem', 'Nu_Jackson', 'Nu_Gupta',
            'Nu_Swenson', 'Nu_Xu', 'Nu_Mokry', 'Nu_Bringer_Smith',
            'Nu_Ornatsky', 'Nu_Gorban', 'Nu_Zhu', 'Nu_Bishop', 'Nu_Yamagata',
            'Nu_Kitoh', 'Nu_Krasnoshchekov_Protopopov', 'Nu_Petukhov',
-           'Nu_Krasnoshchekov']
+           'Nu_Krasnoshchekov', 'supercritical_channel',
+           'supercritical_channel_methods']
 
 ### Vertical upflow only
 
@@ -1412,3 +1415,268 @@ def Nu_Krasnoshchekov(Re, Pr, rho_w=None, rho_b=None, Cp_avg=None, Cp_b=None,
     if Cp_avg is not None and Cp_b is not None:
         Nu *= (Cp_avg/Cp_b)**n
     return Nu
+
+
+supercritical_channel_methods = ['McAdams', 'Shitsman', 'Griem', 'Jackson',
+                                 'Gupta', 'Swenson', 'Xu', 'Mokry',
+                                 'Bringer_Smith', 'Ornatsky', 'Gorban', 'Zhu',
+                                 'Bishop', 'Yamagata', 'Kitoh',
+                                 'Krasnoshchekov_Protopopov', 'Petukhov',
+                                 'Krasnoshchekov']
+'''Correlations of this module usable by :obj:`supercritical_channel`, named
+without their `Nu_` prefix.'''
+
+# Correlations without branches on the values of their inputs, which can be
+# evaluated directly with arrays
+_supercritical_array_safe = frozenset(['McAdams', 'Gupta', 'Swenson', 'Xu',
+                                       'Mokry', 'Bringer_Smith', 'Gorban',
+                                       'Zhu', 'Bishop'])
+
+
+# Argument names of each correlation, read before any caching or
+# instrumentation wrappers replace the module's functions
+_supercritical_channel_args = {}
+for _name in supercritical_channel_methods:
+    _code = globals()['Nu_' + _name].__code__
+    _supercritical_channel_args[_name] = _code.co_varnames[:_code.co_argcount]
+del _name, _code
+
+
+def _Nu_supercritical_array(Method, available):
+    func = globals()['Nu_' + Method]
+    kwargs = {name: available[name] for name in _supercritical_channel_args[Method]}
+    if Method in _supercritical_array_safe:
+        return func(**kwargs)*np.ones(len(available['Re']))
+    N = len(available['Re'])
+    return np.array([func(**{name: (None if v is None else float(v[i]) if np.ndim(v) else v)
+                             for name, v in kwargs.items()}) for i in range(N)])
+
+
+def supercritical_channel(m, D, L, q, H_in, properties, T_pc=None,
+                          Method='Jackson', nodes=100, xtol=1E-6,
+                          maxiter=100):
+    r'''Marches along a uniformly-sized round channel heated at
+    supercritical pressure, calculating the bulk and wall temperatures and
+    the heat transfer coefficient at each of `nodes` equal axial segments
+    with any of the correlations of this module. The bulk enthalpy of each
+    segment, at its center, comes from an energy balance:
+
+    .. math::
+        H_b(z) = H_{in} + \frac{\pi D}{m}\int_0^z q\, dz
+
+    At every node, the wall temperature must satisfy
+    :math:`q = h(T_w)(T_w - T_b)`, where the properties at the wall used by
+    the correlation depend on :math:`T_w`; the wall temperatures of all of
+    the nodes are solved together with a vectorized secant method. The
+    correlation receives the bulk Reynolds and Prandtl numbers, the wall and
+    bulk densities, viscosities, thermal conductivities and Prandtl numbers,
+    the average heat capacity :math:`(H_w - H_b)/(T_w - T_b)`, the
+    temperatures, the bulk enthalpy, the mass and heat fluxes, and the
+    distance from the inlet, as required by its signature.
+
+    Parameters
+    ----------
+    m : float
+        Mass flow rate of fluid in the channel, [kg/s]
+    D : float
+        Diameter of the channel, [m]
+    L : float
+        Heated length of the channel, [m]
+    q : float or array_like
+        Heat flux into the fluid, constant or one value per segment, [W/m^2]
+    H_in : float
+        Enthalpy of the fluid at the inlet, [J/kg]
+    properties : callable or tuple[array_like]
+        The properties of the fluid at the pressure of the channel; either a
+        function accepting an array of temperatures and returning arrays of
+        (H [J/kg], rho [kg/m^3], mu [Pa*s], k [W/m/K], Cp [J/kg/K]), or a
+        tuple of arrays (T, H, rho, mu, k, Cp) tabulated at increasing
+        temperatures, which are interpolated linearly
+    T_pc : float, optional
+        Pseudocritical temperature, at which Cp is at a maximum; if not
+        provided with tabulated properties it is the temperature of the
+        largest tabulated Cp, [K]
+    Method : str, optional
+        Correlation to use, one of :obj:`supercritical_channel_methods`, [-]
+    nodes : int, optional
+        Number of axial segments, [-]
+    xtol : float, optional
+        Tolerance of the wall temperatures, [K]
+    maxiter : int, optional
+        Maximum number of iterations of the wall temperatures, [-]
+
+    Returns
+    -------
+    results : dict
+        * z : Distances of the centers of the segments from the inlet, [m]
+        * H_b : Bulk enthalpy at each node, [J/kg]
+        * T_b : Bulk temperature at each node, [K]
+        * T_w : Wall temperature at each node, [K]
+        * h : Heat transfer coefficient at each node, [W/m^2/K]
+        * Nu : Nusselt number at each node, [-]
+        * q : Heat flux at each node, [W/m^2]
+        * H_out : Enthalpy of the fluid at the outlet, [J/kg]
+        * converged : Whether the bulk and wall temperatures of each node
+          converged, and with tabulated properties whether they are within
+          the table, [-]
+
+    Notes
+    -----
+    The correlations which branch on the values of their inputs are
+    evaluated one node at a time each iteration; the others are evaluated
+    with arrays. Enthalpy-dependent corrections of the Griem and Kitoh
+    correlations are based on water with the reference state of those
+    correlations, so they should only be used with such enthalpies.
+
+    With a property function, the bulk temperatures are found from the
+    enthalpies by Newton's method with the heat capacity as the derivative,
+    falling back to bisection within a bracket of the root which is widened
+    from `T_pc` (or 300 K). Tabulated properties are not extrapolated; nodes
+    whose bulk or wall temperatures fall outside of the table are reported as
+    not converged.
+
+    Examples
+    --------
+    A fluid with a heat capacity peak at 650 K, tabulated:
+
+    >>> import numpy as np
+    >>> T = np.linspace(550.0, 800.0, 501)
+    >>> Cp = 5000.0 + 40000.0/(1.0 + ((T - 650.0)/10.0)**2)
+    >>> H = 1.2E6 + 5000.0*(T - 550.0) + 4E5*np.arctan((T - 650.0)/10.0)
+    >>> rho = 450.0 - 300.0*np.tanh((T - 650.0)/15.0)
+    >>> mu, k = 6E-5*rho/450.0, 0.1 + 0.3*rho/750.0
+    >>> ans = supercritical_channel(m=0.2, D=0.01, L=4.0, q=1.5E6, H_in=1.0E6,
+    ...     properties=(T, H, rho, mu, k, Cp), Method='Jackson', nodes=5)
+    >>> ans['T_b']
+    array([624.55521891, 637.674565  , 644.49646851, 649.10279434, 653.40431167])
+    >>> ans['T_w']
+    array([677.3333427 , 687.313983  , 692.0148818 , 697.11513448, 703.92056679])
+    '''
+    if Method not in supercritical_channel_methods:
+        raise ValueError("Correlation name not recognized; options are %s" %(supercritical_channel_methods,))
+    if callable(properties):
+        props = properties
+    else:
+        Ts_table, Hs_table, rhos_table, mus_table, ks_table, Cps_table = (
+            1.0*np.asarray(v) for v in properties)
+        def props(T):
+            return tuple(np.interp(T, Ts_table, v) for v in
+                         (Hs_table, rhos_table, mus_table, ks_table, Cps_table))
+        if T_pc is None:
+            T_pc = float(Ts_table[np.argmax(Cps_table)])
+
+    dz = L/nodes
+    z = (np.arange(nodes) + 0.5)*dz
+    q = np.broadcast_to(1.0*np.asarray(q), (nodes,))
+    perimeter = np.pi*D
+    H_inlets = H_in + np.concatenate(([0.0], np.cumsum(q*dz*perimeter/m)))
+    H_b = H_inlets[:-1] + 0.5*q*dz*perimeter/m
+    G = m/(0.25*np.pi*D*D)
+
+    # Bulk state at each node
+    if callable(properties):
+        # Newton's method on H(T) = H_b, kept inside a bracket of the root
+        # which is first widened geometrically from the guess; steps which
+        # leave the bracket or do not halve the previous step bisect instead.
+        T_guess = 300.0 if T_pc is None else float(T_pc)
+        lo = np.full(nodes, T_guess)
+        hi = np.full(nodes, T_guess)
+        H_lo = H_hi = props(lo)[0]
+        for _ in range(maxiter):
+            low, high = H_lo > H_b, H_hi < H_b
+            if not (low.any() or high.any()):
+                break
+            lo = np.where(low, 0.5*lo, lo)
+            hi = np.where(high, 2.0*hi, hi)
+            H_lo, H_hi = props(lo)[0], props(hi)[0]
+        bulk_converged = (H_lo <= H_b) & (H_hi >= H_b)
+        T_b = 0.5*(lo + hi)
+        step_old = hi - lo
+        solved = ~bulk_converged
+        for _ in range(maxiter):
+            done = solved.copy()
+            H_calc, _, _, _, Cp_calc = props(T_b)
+            below = H_calc < H_b
+            lo = np.where(below, T_b, lo)
+            hi = np.where(below, hi, T_b)
+            step = (H_b - H_calc)/Cp_calc
+            T_new = T_b + step
+            bisect = ((np.abs(step) > xtol) & (~((T_new >= lo) & (T_new <= hi))
+                                                | (np.abs(2.0*step) > np.abs(step_old))))
+            T_new = np.where(bisect, 0.5*(lo + hi), T_new)
+            step_old = np.where(bisect, 0.5*(hi - lo), step)
+            solved |= np.abs(step) <= xtol
+            T_b = np.where(done, T_b, T_new)
+            if np.all(solved):
+                break
+        bulk_converged &= solved
+    else:
+        T_b = np.interp(H_b, Hs_table, Ts_table)
+        bulk_converged = (H_b >= Hs_table[0]) & (H_b <= Hs_table[-1])
+    H_b_calc, rho_b, mu_b, k_b, Cp_b = props(T_b)
+    Re = G*D/mu_b
+    Pr_b = Cp_b*mu_b/k_b
+    Pr_pc = None
+    if T_pc is not None:
+        _, _, mu_pc, k_pc, Cp_pc = props(np.array([T_pc]))
+        Pr_pc = float(Cp_pc[0]*mu_pc[0]/k_pc[0])
+
+    def wall_h(T_w):
+        H_w, rho_w, mu_w, k_w, Cp_w = props(T_w)
+        dT = T_w - T_b
+        safe = np.abs(dT) > 1E-9*T_b
+        Cp_avg = np.where(safe, (H_w - H_b_calc)/np.where(safe, dT, 1.0), Cp_b)
+        available = {'Re': Re, 'Pr': Pr_b, 'Pr_b': Pr_b, 'Pr_w': Cp_w*mu_w/k_w,
+                     'rho_w': rho_w, 'rho_b': rho_b, 'mu_w': mu_w, 'mu_b': mu_b,
+                     'k_w': k_w, 'k_b': k_b, 'Cp_avg': Cp_avg, 'Cp_b': Cp_b,
+                     'T_b': T_b, 'T_w': T_w, 'T_pc': T_pc, 'Pr_pc': Pr_pc,
+                     'H': H_b, 'G': G, 'q': q, 'D': D, 'x': z}
+        Nu = _Nu_supercritical_array(Method, available)
+        return Nu, Nu*k_b/D
+
+    # Secant iteration on the wall temperatures of all nodes at once, kept
+    # inside a bracket of the root with bisection. The first guess uses the
+    # constant-property McAdams correlation; with heating the residual is
+    # negative at the bulk temperature, and with cooling positive.
+    sign = np.where(q < 0.0, -1.0, 1.0)
+    def residual(T_w):
+        Nu, h = wall_h(T_w)
+        return sign*(T_w - T_b - q/h), Nu, h
+
+    lo = T_b
+    hi = T_b + q*D/(Nu_McAdams(Re, Pr_b)*k_b)
+    f_hi = residual(hi)[0]
+    for _ in range(maxiter):
+        if np.all(f_hi >= 0.0):
+            break
+        hi = np.where(f_hi < 0.0, T_b + 2.0*(hi - T_b), hi)
+        f_hi = residual(hi)[0]
+
+    T_w0, f0 = hi, f_hi
+    T_w1 = 0.5*(lo + hi)
+    width_old = np.abs(hi - lo)
+    converged = np.zeros(nodes, dtype=bool)
+    for _ in range(maxiter):
+        done = converged.copy()
+        f1 = residual(T_w1)[0]
+        below = f1 < 0.0
+        lo = np.where(below, T_w1, lo)
+        hi = np.where(below, hi, T_w1)
+        df = f1 - f0
+        T_w2 = T_w1 - f1*(T_w1 - T_w0)/np.where(df != 0.0, df, 1.0)
+        width = np.abs(hi - lo)
+        bisect = ((df == 0.0) | ~((T_w2 - lo)*(T_w2 - hi) < 0.0)
+                  | (width > 0.5*width_old))
+        T_w2 = np.where(bisect, 0.5*(lo + hi), T_w2)
+        converged |= (np.abs(T_w2 - T_w1) <= xtol) | (f1 == 0.0)
+        width_old = np.where(bisect, width, width_old)
+        T_w0, f0 = T_w1, f1
+        T_w1 = np.where(done | (f1 == 0.0), T_w1, T_w2)
+        if np.all(converged):
+            break
+    _, Nu, h = residual(T_w1)
+    converged &= bulk_converged
+    if not callable(properties):
+        converged &= (T_w1 >= Ts_table[0]) & (T_w1 <= Ts_table[-1])
+    return {'z': z, 'H_b': H_b, 'T_b': T_b, 'T_w': T_w1, 'h': h, 'Nu': Nu,
+            'q': q, 'H_out': float(H_inlets[-1]), 'converged': converged}
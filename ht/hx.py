@@ -21,16 +21,20 @@ SOFTWARE.
 '''
 
 import os
-from math import exp, floor, log, sqrt, tanh  # tanh= 1/coth
+from bisect import bisect_left, bisect_right
+from math import ceil, exp, floor, log, sqrt, tanh  # tanh= 1/coth
 
 from fluids.constants import Btu, degree_Fahrenheit, foot, hour, inch
 from fluids.numerics import bisect, brenth, factorial, gamma, horner, iv, quad, secant
 from fluids.numerics import numpy as np
 from fluids.piping import BWG_SI, BWG_integers
 
+from ht import telemetry
+
 __all__ = ['effectiveness_from_NTU', 'NTU_from_effectiveness', 'calc_Cmin',
 'calc_Cmax', 'calc_Cr', 'P_NTU_Pp', 'P_NTU_Pc',
 'NTU_from_UA', 'UA_from_NTU', 'effectiveness_NTU_method', 'F_LMTD_Fakheri',
+'F_LMTD_Fakheri_array', 'shells_min_Fakheri',
 'temperature_effectiveness_basic', 'temperature_effectiveness_TEMA_J',
 'temperature_effectiveness_TEMA_H', 'temperature_effectiveness_TEMA_G',
 'temperature_effectiveness_TEMA_E', 'temperature_effectiveness_plate',
@@ -39,7 +43,7 @@ __all__ = ['effectiveness_from_NTU', 'NTU_from_effectiveness', 'calc_Cmin',
 'NTU_from_P_J', 'NTU_from_P_G', 'NTU_from_P_E', 'NTU_from_P_H',
 'NTU_from_P_plate',
 'DBundle_min', 'shell_clearance', 'baffle_thickness', 'D_baffle_holes',
-'L_unsupported_max', 'Ntubes', 'size_bundle_from_tubecount',
+'L_unsupported_max', 'check_mechanical_TEMA', 'Ntubes', 'size_bundle_from_tubecount',
 'Ntubes_Perrys', 'Ntubes_VDI', 'Ntubes_Phadkeb',
 'DBundle_for_Ntubes_Phadkeb',
 'Ntubes_HEDH', 'DBundle_for_Ntubes_HEDH',  'D_for_Ntubes_VDI',
@@ -3151,6 +3155,9 @@ def _NTU_from_P_solver(P1, R1, NTU_min, NTU_max, function, guess, *args):
     and the desired P1 and R1 values.
     '''
     args2 = (R1, P1, function) + args
+    objective = _NTU_from_P_erf
+    if telemetry.records is not None: # numba: delete
+        objective = telemetry.CountingObjective(_NTU_from_P_erf, 'NTU_from_P', {'P1': P1, 'R1': R1, 'function': function.__name__, 'args': args}) # numba: delete
     try:
         if guess is not None:
             guess2 = guess
@@ -3160,7 +3167,10 @@ def _NTU_from_P_solver(P1, R1, NTU_min, NTU_max, function, guess, *args):
             guess2 = NTU_min + 0.001*NTU_max
         if (NTU_min is not None and NTU_max is not None) and (guess2 < NTU_min or guess2 > NTU_max):
             guess2 = 0.5*(NTU_min + NTU_max)
-        return secant(_NTU_from_P_erf, guess2, low=NTU_min, high=NTU_max, bisection=False, xtol=1e-13, args=args2)
+        NTU = secant(objective, guess2, low=NTU_min, high=NTU_max, bisection=False, xtol=1e-13, args=args2)
+        if objective is not _NTU_from_P_erf: # numba: delete
+            objective.finish('secant', NTU, args2) # numba: delete
+        return NTU
     except:
         # secant failed. For some reason, the bisection in secant is going to wrong wrong value
         # floating point really sucks
@@ -3176,7 +3186,10 @@ def _NTU_from_P_solver(P1, R1, NTU_min, NTU_max, function, guess, *args):
         # raise ValueError("No solution") # numba: uncomment
         raise ValueError(f'No solution possible gives such a low P1; minimum P1={P1_min:f} at NTU1={NTU_min:f}') # numba: delete
     # Construct the function as a lambda expression as solvers don't support kwargs
-    return brenth(_NTU_from_P_erf, NTU_min, NTU_max, args=args2)
+    NTU = brenth(objective, NTU_min, NTU_max, args=args2)
+    if objective is not _NTU_from_P_erf: # numba: delete
+        objective.finish('brenth', NTU, args2, fallback=True) # numba: delete
+    return NTU
 
 
 def _NTU_max_for_P_solver(ps, qs, offsets, R1):
@@ -4259,6 +4272,136 @@ def F_LMTD_Fakheri(Thi, Tho, Tci, Tco, shells=1):
         S = (R*R + 1.)**0.5/(R - 1.)
         return S*log(W)/log((1. + W - S + S*W)/(1. + W + S - S*W))
 
+
+def F_LMTD_Fakheri_array(Thi, Tho, Tci, Tco, shells=1):
+    r'''Calculates the log-mean temperature difference correction factor `Ft`
+    for many shell-and-tube heat exchangers at once, using the expression of
+    :obj:`F_LMTD_Fakheri`. The inputs are evaluated as NumPy arrays.
+
+    Parameters
+    ----------
+    Thi : array_like
+        Inlet temperatures of hot fluid, [K]
+    Tho : array_like
+        Outlet temperatures of hot fluid, [K]
+    Tci : array_like
+        Inlet temperatures of cold fluid, [K]
+    Tco : array_like
+        Outlet temperatures of cold fluid, [K]
+    shells : int or array_like, optional
+        Number of shell-side passes, [-]
+
+    Returns
+    -------
+    Ft : ndarray
+        Log-mean temperature difference correction factors, [-]
+
+    Notes
+    -----
+    The inputs are broadcast against each other. Points with `R` = 1 use the
+    limiting expression, as in the scalar function. Requires NumPy.
+
+    Examples
+    --------
+    >>> F_LMTD_Fakheri_array(Thi=[130, 130], Tho=[110, 110], Tci=[15, 15],
+    ... Tco=[85, 35], shells=[1, 2])
+    array([0.94383588, 0.99815054])
+    '''
+    Thi, Tho, Tci, Tco, shells = np.broadcast_arrays(np.asarray(Thi, dtype=float), np.asarray(Tho, dtype=float),
+                                                     np.asarray(Tci, dtype=float), np.asarray(Tco, dtype=float),
+                                                     np.asarray(shells, dtype=float))
+    R = (Thi - Tho)/(Tco - Tci)
+    P = (Tco - Tci)/(Thi - Tci)
+    unity = R == 1.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        R_general = np.where(unity, 2.0, R)
+        W = ((1. - P*R_general)/(1. - P))**(1./shells)
+        S = np.sqrt(R_general*R_general + 1.)/(R_general - 1.)
+        Ft = S*np.log(W)/np.log((1. + W - S + S*W)/(1. + W + S - S*W))
+        if unity.any():
+            W2 = (shells - shells*P)/(shells - shells*P + P)
+            ratio = W2/(1. - W2)
+            Ft_unity = (2**0.5/ratio)/np.log((ratio + 2**-0.5)/(ratio - 2**-0.5))
+            Ft = np.where(unity, Ft_unity, Ft)
+    return Ft
+
+
+def _F_LMTD_Fakheri_shell_err(P1, R, Ft_min):
+    # Correction factor of a single shell at its own P1 and R, minus the target
+    if R == 1.0:
+        ratio = (1. - P1)/P1
+        Ft = (2**0.5/ratio)/log((ratio + 2**-0.5)/(ratio - 2**-0.5))
+    else:
+        W = (1. - P1*R)/(1. - P1)
+        S = (R*R + 1.)**0.5/(R - 1.)
+        Ft = S*log(W)/log((1. + W - S + S*W)/(1. + W + S - S*W))
+    return Ft - Ft_min
+
+
+def shells_min_Fakheri(Thi, Tho, Tci, Tco, Ft_min=0.75):
+    r'''Calculates the minimum number of shells in series required for a
+    shell-and-tube heat exchanger with one or an even number of tube passes
+    to achieve a log-mean temperature difference correction factor of at
+    least `Ft_min`, according to the model of :obj:`F_LMTD_Fakheri`.
+
+    With shells of equal area in series, each shell has the same `R` and the
+    overall `Ft` is that of a single shell operating at its own thermal
+    effectiveness `P1`. The largest `P1` which meets the target is found
+    once, and the number of shells follows directly:
+
+    .. math::
+        N = \left\lceil \frac{\ln\left(\frac{1-PR}{1-P}\right)}
+        {\ln\left(\frac{1-P_1R}{1-P_1}\right)} \right\rceil
+
+    .. math::
+        N = \left\lceil \frac{P(1-P_1)}{P_1(1-P)} \right\rceil,\; R = 1
+
+    Parameters
+    ----------
+    Thi : float
+        Inlet temperature of hot fluid, [K]
+    Tho : float
+        Outlet temperature of hot fluid, [K]
+    Tci : float
+        Inlet temperature of cold fluid, [K]
+    Tco : float
+        Outlet temperature of cold fluid, [K]
+    Ft_min : float, optional
+        Minimum acceptable log-mean temperature difference correction
+        factor, [-]
+
+    Returns
+    -------
+    shells : int
+        Minimum number of shell-side passes, [-]
+
+    Notes
+    -----
+    The single-shell `P1` is bracketed between zero and its thermodynamic
+    limit :math:`2/(1 + R + \sqrt{1+R^2})`, where `Ft` falls to zero. A
+    ValueError is raised if the temperatures cannot be achieved by any
+    number of shells.
+
+    Examples
+    --------
+    >>> shells_min_Fakheri(Thi=130, Tho=60, Tci=15, Tco=85, Ft_min=0.8)
+    2
+    '''
+    R = (Thi - Tho)/(Tco - Tci)
+    P = (Tco - Tci)/(Thi - Tci)
+    if not (0.0 < Ft_min < 1.0):
+        raise ValueError("Ft_min must be between 0 and 1")
+    if P <= 0.0 or P*R >= 1.0 or P >= 1.0:
+        raise ValueError("Specified temperatures cannot be achieved by any number of shells")
+    P1_max = 2.0/(1.0 + R + sqrt(1.0 + R*R))
+    P1 = brenth(_F_LMTD_Fakheri_shell_err, P1_max*1e-9, P1_max*(1.0 - 1e-12),
+                args=(R, Ft_min))
+    if R == 1.0:
+        N = P*(1.0 - P1)/(P1*(1.0 - P))
+    else:
+        N = log((1.0 - P*R)/(1.0 - P))/log((1.0 - P1*R)/(1.0 - P1))
+    return max(1, int(ceil(N - 1e-9)))
+
 ### Tubes
 
 # TEMA tubes from http://www.engineeringpage.com/technology/thermal/tubesize.html
@@ -4372,6 +4515,9 @@ HEDH_pitches = {0.25: (1.25, 1.5), 0.375: (1.330, 1.420),
 0.75: (1.250, 1.330, 1.420, 1.500), 1.: (1.250, 1.312, 1.375),
 1.25: (1.250,), 1.5: (1.250,), 2.: (1.250,)}
 
+_DBundle_min_Dos = [0.006, 0.01, .014, 0.02, 0.03]
+_DBundle_min_DBundles = [0.1, 0.1, 0.3, 0.5, 1.0, 1.5]
+
 def DBundle_min(Do):
     r'''Very roughly, determines a good choice of shell diameter for a given
     tube outer diameter, according to figure 1, section 3.3.5 in [1]_.
@@ -4404,13 +4550,18 @@ def DBundle_min(Do):
        Transfer. Heat Exchanger Design Handbook. Washington:
        Hemisphere Pub. Corp., 1983.
     '''
-    data = ((0.006, 0.1), (0.01, 0.1), (.014, 0.3), (0.02, 0.5), (0.03, 1.0))
-    for Do_tabulated, DBundle in data:
+    for Do_tabulated, DBundle in zip(_DBundle_min_Dos, _DBundle_min_DBundles):
         if Do <= Do_tabulated:
             return DBundle
     return 1.5
 
 
+_shell_clearance_DShells = [0.457, 1.016, 1.397, 1.778, 2.159]
+_shell_clearance_DBundles = [0.457 - 0.0048, 1.016 - 0.0064, 1.397 - 0.0079,
+                             1.778 - 0.0095, 2.159 - 0.011]
+_shell_clearances = [0.0032, 0.0048, 0.0064, 0.0079, 0.0095, 0.011]
+
+
 def shell_clearance(DBundle=None, DShell=None):
     r'''Looks up the recommended clearance between a shell and tube bundle in
     a TEMA HX [1]. Either the bundle diameter or the shell diameter are needed
@@ -4443,18 +4594,13 @@ def shell_clearance(DBundle=None, DShell=None):
     .. [1] Standards of the Tubular Exchanger Manufacturers Association,
        Ninth edition, 2007, TEMA, New York.
     '''
-    DShell_data = [(0.457, 0.0032), (1.016, 0.0048), (1.397, 0.0064),
-                   (1.778, 0.0079), (2.159, 0.0095)]
-    DBundle_data = [(0.457 - 0.0048, 0.0032), (1.016 - 0.0064, 0.0048),
-                    (1.397 - 0.0079, 0.0064), (1.778 - 0.0095, 0.0079),
-                    (2.159 - 0.011, 0.0095)]
     if DShell:
-        for DShell_tabulated, c in DShell_data:
+        for DShell_tabulated, c in zip(_shell_clearance_DShells, _shell_clearances):
             if DShell < DShell_tabulated:
                 return c
         return 0.011
     elif DBundle:
-        for DBundle_tabulated, c in DBundle_data:
+        for DBundle_tabulated, c in zip(_shell_clearance_DBundles, _shell_clearances):
             if DBundle < DBundle_tabulated:
                 return c
         return 0.011
@@ -4658,6 +4804,133 @@ def L_unsupported_max(Do, material='CS'):
         raise ValueError('Material argument should be one of "CS" or "aluminium"')
 
 
+_TEMA_baffle_Dshells = [0.381, 0.737, 0.991, 1.524]
+_TEMA_baffle_Ls_refinery = [0.61, 0.914, 1.219, 1.524]
+_TEMA_baffle_Ls_other = [0.305, 0.61, 0.914, 1.219, 1.524]
+
+
+def check_mechanical_TEMA(Do, DShell, DBundle, L_unsupported, t_baffle=None,
+                          D_baffle_hole=None, service='C', material='CS'):
+    r'''Checks a batch of candidate heat exchanger geometries against the
+    TEMA [1]_ mechanical rules implemented in :obj:`DBundle_min`,
+    :obj:`shell_clearance`, :obj:`L_unsupported_max`,
+    :obj:`baffle_thickness`, and :obj:`D_baffle_holes`. Intended to prune
+    infeasible designs before any thermal calculation is performed.
+
+    Each rule is expressed as a relative margin, positive when satisfied:
+
+    .. math::
+        m_{bundle} = \frac{D_{bundle}}{D_{bundle,min}} - 1
+
+    .. math::
+        m_{clearance} = \frac{D_{shell} - D_{bundle}}{c} - 1
+
+    .. math::
+        m_{unsupported} = 1 - \frac{L_{unsupported}}{L_{unsupported,max}}
+
+    .. math::
+        m_{baffle} = \frac{t_{baffle}}{t_{baffle,min}} - 1
+
+    .. math::
+        m_{hole} = \frac{\min(d_{B,max} - d_B, d_B - D_o)}{d_{B,max} - D_o}
+
+    Parameters
+    ----------
+    Do : list[float]
+        Tube outer diameters, [m]
+    DShell : list[float]
+        Shell inner diameters, [m]
+    DBundle : list[float]
+        Outer diameters of tube bundles, [m]
+    L_unsupported : list[float]
+        Distances between tube supports, [m]
+    t_baffle : list[float], optional
+        Baffle or support plate thicknesses; the baffle thickness rule is
+        not checked if not provided, [m]
+    D_baffle_hole : list[float], optional
+        Diameters of the tube holes in the baffles; the baffle hole rule is
+        not checked if not provided, [m]
+    service : str, optional
+        Service type, C, R or B, [-]
+    material : str, optional
+        Tube material type, either 'CS' or 'aluminium', [-]
+
+    Returns
+    -------
+    feasible : list[bool]
+        Whether or not each candidate satisfies all of the checked rules, [-]
+    limiting : list[str]
+        The name of the rule with the smallest margin for each candidate;
+        for an infeasible candidate this is the most violated rule, [-]
+
+    Notes
+    -----
+    The same tables as the scalar functions are used, but located with a
+    binary search; results are identical to calling each function
+    individually. The bundle diameter is compared against
+    :obj:`DBundle_min`, which is only a rough recommendation.
+
+    Examples
+    --------
+    >>> check_mechanical_TEMA(Do=[0.0254, 0.0254], DShell=[1.2, 1.2],
+    ... DBundle=[1.18, 1.198], L_unsupported=[1.5, 2.5])
+    ([True, False], ['DBundle_min', 'shell_clearance'])
+
+    References
+    ----------
+    .. [1] Standards of the Tubular Exchanger Manufacturers Association,
+       Ninth edition, 2007, TEMA, New York.
+    '''
+    if material == 'CS':
+        L_maxes = _L_unsupported_steel
+    elif material == 'aluminium':
+        L_maxes = _L_unsupported_aluminium
+    else:
+        raise ValueError('Material argument should be one of "CS" or "aluminium"')
+    if service == 'R':
+        baffle_Ls, baffle_table = _TEMA_baffle_Ls_refinery, _TEMA_baffles_refinery
+    elif service in ('C', 'B'):
+        baffle_Ls, baffle_table = _TEMA_baffle_Ls_other, _TEMA_baffles_other
+    else:
+        raise ValueError('Service argument should be one of "C", "R" or "B"')
+
+    N = len(Do)
+    feasible = [True]*N
+    limiting = [None]*N
+    for k in range(N):
+        Do_k, DShell_k, DBundle_k, L_k = Do[k], DShell[k], DBundle[k], L_unsupported[k]
+        # DBundle_min
+        i = bisect_left(_DBundle_min_Dos, Do_k)
+        margin = DBundle_k/_DBundle_min_DBundles[i] - 1.0
+        rule = 'DBundle_min'
+        # shell_clearance
+        c = _shell_clearances[bisect_right(_shell_clearance_DShells, DShell_k)]
+        m = (DShell_k - DBundle_k)/c - 1.0
+        if m < margin:
+            margin, rule = m, 'shell_clearance'
+        # L_unsupported_max
+        i = bisect_right(_L_unsupported_Do, Do_k/inch) - 1
+        m = 1.0 - L_k/L_maxes[i if i > 0 else 0]
+        if m < margin:
+            margin, rule = m, 'L_unsupported_max'
+        # baffle_thickness
+        if t_baffle is not None:
+            t_min = baffle_table[bisect_right(_TEMA_baffle_Dshells, DShell_k)][bisect_left(baffle_Ls, L_k)]
+            m = t_baffle[k]/t_min - 1.0
+            if m < margin:
+                margin, rule = m, 'baffle_thickness'
+        # D_baffle_holes
+        if D_baffle_hole is not None:
+            extra = 0.0008 if (Do_k > 0.0318 or L_k <= 0.914) else 0.0004
+            dB = D_baffle_hole[k]
+            m = min(Do_k + extra - dB, dB - Do_k)/extra
+            if m < margin:
+                margin, rule = m, 'D_baffle_holes'
+        feasible[k] = margin >= 0.0
+        limiting[k] = rule
+    return feasible, limiting
+
+
 ### Tube bundle count functions
 
 square_C1s = square_Ns = triangular_C1s = triangular_Ns = None
@@ -4946,7 +5219,14 @@ def DBundle_for_Ntubes_Phadkeb(Ntubes, Do, pitch, Ntp, angle=30):
     s = Ns + 1
     r = s**0.5
     DBundle_max = (Do + 2.*pitch*r)*(1. - 1E-8) # Cannot be exact or floor(s) will give an int too high
-    return float(bisect(to_solve_Ntubes_Phadkeb, 0, DBundle_max, args=(Do, pitch, Ntp, angle, Ntubes)))
+    objective = to_solve_Ntubes_Phadkeb
+    args = (Do, pitch, Ntp, angle, Ntubes)
+    if telemetry.records is not None: # numba: delete
+        objective = telemetry.CountingObjective(to_solve_Ntubes_Phadkeb, 'DBundle_for_Ntubes_Phadkeb', {'Ntubes': Ntubes, 'Do': Do, 'pitch': pitch, 'Ntp': Ntp, 'angle': angle}) # numba: delete
+    DBundle = float(bisect(objective, 0, DBundle_max, args=args))
+    if objective is not to_solve_Ntubes_Phadkeb: # numba: delete
+        objective.finish('bisect', DBundle, args) # numba: delete
+    return DBundle
 
 
 def Ntubes_Perrys(DBundle, Do, Ntp, angle=30):
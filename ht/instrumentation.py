@@ -0,0 +1,263 @@
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2026 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Call-count and timing instrumentation of ht functions. When enabled, every
+public function of ht (and of `ht.vectorized` and `ht.numba`, if they have
+been imported) is replaced by a thin wrapper recording its number of calls
+and wall times; when disabled, the original functions are restored so there
+is no overhead at all.
+
+Instrumentation can be enabled for a whole run by setting the environment
+variable `HT_INSTRUMENT=1` before ht is imported, or for a block of code with
+the :obj:`instrumented` context manager:
+
+>>> import ht.instrumentation
+>>> with ht.instrumentation.instrumented() as report:
+...     _ = ht.LMTD(100., 60., 30., 40.2)
+...     _ = ht.F_LMTD_Fakheri(Tci=15, Tco=85, Thi=130, Tho=110, shells=1)
+>>> sorted(report.keys())
+['F_LMTD_Fakheri', 'LMTD']
+>>> report['LMTD']['calls']
+1
+
+Functions of `ht.vectorized` and `ht.numba` are reported with the prefixes
+'vectorized.' and 'numba.'. Times are inclusive of any other ht functions
+called internally, and calls made from inside compiled numba code are not
+recorded. As with :obj:`ht.caching`, references obtained before
+instrumentation was enabled (`from ht import LMTD`) are not instrumented.
+Functions cached with :obj:`ht.caching` are timed outside of their caches,
+so cache hits are counted as calls.
+'''
+
+import json
+import sys
+import types
+from contextlib import contextmanager
+from functools import wraps
+from math import ceil
+from threading import Lock, RLock
+from time import perf_counter
+
+import ht
+
+__all__ = ['enable_instrumentation', 'disable_instrumentation',
+           'instrumentation_enabled', 'instrumented', 'instrumentation_stats',
+           'instrumentation_json', 'reset_instrumentation']
+
+samples_max = 10000
+'''Number of most recent call durations kept per function to compute the
+99th percentile time.'''
+
+_lock = RLock()
+_stats = {}
+_wrapped = [] # (namespaces, name, original, wrapper)
+
+
+class _FunctionStats:
+    __slots__ = ('calls', 'total', 'samples', 'lock')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.samples = []
+        self.lock = Lock()
+
+    def record(self, dt):
+        with self.lock:
+            if self.calls < samples_max:
+                self.samples.append(dt)
+            else:
+                self.samples[self.calls % samples_max] = dt
+            self.calls += 1
+            self.total += dt
+
+    def as_dict(self):
+        with self.lock:
+            calls, total, samples = self.calls, self.total, sorted(self.samples)
+        p99 = samples[int(ceil(0.99*len(samples))) - 1] if samples else 0.0
+        return {'calls': calls, 'total_time': total,
+                'mean_time': total/calls if calls else 0.0, 'p99_time': p99}
+
+
+def _make_wrapper(func, key):
+    stats = _stats.get(key)
+    if stats is None:
+        stats = _stats[key] = _FunctionStats()
+    record = stats.record
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        t0 = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(perf_counter() - t0)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def _is_wrappable(obj):
+    return callable(obj) and not isinstance(obj, (type, types.ModuleType))
+
+
+def _instrument(namespaces, names, prefix, check):
+    primary = namespaces[0]
+    for name in names:
+        func = getattr(primary, name, None)
+        if not check(func):
+            continue
+        wrapper = _make_wrapper(func, prefix + name)
+        used = []
+        for ns in namespaces:
+            if getattr(ns, name, None) is func:
+                setattr(ns, name, wrapper)
+                used.append(ns)
+        _wrapped.append((used, name, func, wrapper))
+
+
+def enable_instrumentation():
+    r'''Starts recording the number of calls and the wall time of every public
+    ht function. The wrappers of `ht.vectorized` and `ht.numba` are also
+    instrumented if those modules have been imported; calling this function
+    again after importing them adds them.
+
+    Times are inclusive of any other ht functions called internally. Calls
+    made from inside compiled numba code are not recorded.
+
+    Examples
+    --------
+    >>> reset_instrumentation()
+    >>> enable_instrumentation()
+    >>> _ = ht.LMTD(100., 60., 30., 40.2)
+    >>> instrumentation_stats()['LMTD']['calls']
+    1
+    >>> disable_instrumentation()
+    '''
+    with _lock:
+        done = {(id(used[0]), name) for used, name, _, _ in _wrapped if used}
+        names = [n for n in ht.__all__ if (id(ht), n) not in done]
+        _instrument([ht] + list(ht.submodules), names, '',
+                    lambda obj: isinstance(obj, types.FunctionType))
+        for mod_name, prefix in (('ht.vectorized', 'vectorized.'), ('ht.numba', 'numba.')):
+            mod = sys.modules.get(mod_name)
+            if mod is None:
+                continue
+            names = [n for n in mod.__all__ if (id(mod), n) not in done]
+            _instrument([mod], names, prefix, _is_wrappable)
+
+
+def disable_instrumentation():
+    r'''Stops recording calls and restores the original functions. The
+    statistics collected so far are kept until :obj:`reset_instrumentation`
+    is called.
+    '''
+    with _lock:
+        while _wrapped:
+            used, name, func, wrapper = _wrapped.pop()
+            for ns in used:
+                if getattr(ns, name, None) is wrapper:
+                    setattr(ns, name, func)
+
+
+def instrumentation_enabled():
+    r'''Returns whether or not ht functions are currently instrumented.
+
+    Returns
+    -------
+    enabled : bool
+        True if instrumentation is active, [-]
+    '''
+    return bool(_wrapped)
+
+
+def reset_instrumentation():
+    r'''Discards all of the statistics collected so far.
+    '''
+    with _lock:
+        for stats in _stats.values():
+            with stats.lock:
+                stats.calls = 0
+                stats.total = 0.0
+                stats.samples = []
+
+
+def instrumentation_stats():
+    r'''Returns the statistics collected for each ht function which has been
+    called while instrumented. Functions of `ht.vectorized` and `ht.numba`
+    are prefixed with 'vectorized.' and 'numba.' respectively.
+
+    Returns
+    -------
+    stats : dict[str, dict]
+        For each function, a dictionary of `calls`; `total_time`, the
+        cumulative wall time in seconds; `mean_time`; and `p99_time`, the
+        99th percentile of the most recent :obj:`samples_max` call times,
+        [-]
+    '''
+    with _lock:
+        items = list(_stats.items())
+    return {k: v.as_dict() for k, v in items if v.calls}
+
+
+def instrumentation_json(**kwargs):
+    r'''Returns the statistics of :obj:`instrumentation_stats` serialized as
+    JSON. Keyword arguments are passed to :obj:`json.dumps`.
+
+    Returns
+    -------
+    stats : str
+        JSON document of the collected statistics, [-]
+    '''
+    return json.dumps(instrumentation_stats(), **kwargs)
+
+
+@contextmanager
+def instrumented(reset=True):
+    r'''Context manager which instruments ht functions for the duration of
+    a block. On exit the dictionary it yields is filled with the statistics
+    of :obj:`instrumentation_stats`, and instrumentation is disabled again
+    unless it was already enabled on entry.
+
+    Parameters
+    ----------
+    reset : bool, optional
+        Whether or not to discard previously collected statistics on entry,
+        [-]
+
+    Examples
+    --------
+    >>> with instrumented() as report:
+    ...     _ = ht.LMTD(100., 60., 30., 40.2)
+    ...     _ = ht.LMTD(100., 60., 20., 60.)
+    >>> report['LMTD']['calls']
+    2
+    '''
+    already = instrumentation_enabled()
+    if reset:
+        reset_instrumentation()
+    enable_instrumentation()
+    report = {}
+    try:
+        yield report
+    finally:
+        if not already:
+            disable_instrumentation()
+        report.update(instrumentation_stats())
@@ -20,13 +20,23 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
+from difflib import SequenceMatcher
+from functools import lru_cache
+
 from fluids.numerics import interp
+from fluids.numerics import numpy as np
 
 from ht.conduction import R_to_k
 
-__all__ = ['nearest_material', 'k_material', 'rho_material', 'Cp_material',
+__all__ = ['nearest_material', 'nearest_materials', 'k_material', 'rho_material', 'Cp_material',
            'building_materials', 'refractories', 'ASHRAE', 'ASHRAE_k',
-           'refractory_VDI_k', 'refractory_VDI_Cp', 'materials_dict']
+           'refractory_VDI_k', 'refractory_VDI_Cp', 'refractory_VDI_k_array',
+           'refractory_VDI_Cp_array', 'economic_insulation_thickness',
+           'materials_dict',
+           'material_index', 'material_IDs', 'k_material_array',
+           'rho_material_array', 'Cp_material_array', 'material_sources',
+           'material_rhos', 'material_Cps', 'material_ks', 'material_Rs',
+           'material_thicknesses', 'material_k_tables', 'material_Cp_tables']
 
 # building_materials in VDI Heat Atlas; full table in DIN EN 12524-2000 which
 # is used here
@@ -490,6 +500,43 @@ for mat_dict, reference in [(refractories, 1), (ASHRAE, 2), (building_materials,
     for key in mat_dict.keys():
         materials_dict[key] = reference
 
+# Columnar store of the material properties, addressed by the integer index
+# of each material in `material_IDs`; missing values are NaN. Thicknesses
+# are in m. Temperature-dependent refractory properties are tabulated at
+# `_refractory_Ts`; the rows of other materials in those tables are NaN.
+# The arrays are built on first use by `_load_material_columns`.
+material_IDs = tuple(materials_dict.keys())
+_material_indexes = {ID: i for i, ID in enumerate(material_IDs)}
+_refractory_indexes = {ID: _material_indexes[ID] for ID in refractories}
+material_sources = material_rhos = material_Cps = material_ks = material_Rs = None
+material_thicknesses = material_k_tables = material_Cp_tables = _refractory_Ts_array = None
+
+
+def _load_material_columns():
+    global material_sources, material_rhos, material_Cps, material_ks, material_Rs
+    global material_thicknesses, material_k_tables, material_Cp_tables, _refractory_Ts_array
+    N, N_T = len(material_IDs), len(_refractory_Ts)
+    nan = float('nan')
+    sources = np.zeros(N, dtype=np.int64)
+    rhos, Cps, ks, Rs, ts = (np.full(N, nan) for _ in range(5))
+    k_tables, Cp_tables = np.full((N, N_T), nan), np.full((N, N_T), nan)
+    for i, ID in enumerate(material_IDs):
+        sources[i] = materials_dict[ID]
+        if sources[i] == 1:
+            rhos[i], k_tables[i], Cp_tables[i] = refractories[ID]
+            ks[i], Cps[i] = k_tables[i, 0], Cp_tables[i, 0]
+        elif sources[i] == 2:
+            values = [nan if v is None else v for v in ASHRAE[ID]]
+            rhos[i], Cps[i], Rs[i], ts[i] = values[0], values[1], values[3], values[4]/1000.
+            ks[i] = ASHRAE_k(ID)
+        else:
+            rhos[i], ks[i], Cps[i] = building_materials[ID]
+    _refractory_Ts_array = np.array(_refractory_Ts)
+    (material_rhos, material_Cps, material_ks, material_Rs, material_thicknesses,
+     material_k_tables, material_Cp_tables) = rhos, Cps, ks, Rs, ts, k_tables, Cp_tables
+    material_sources = sources
+
+
 
 def refractory_VDI_k(ID, T=None):
     r'''Returns thermal conductivity of a refractory material from a table in
@@ -575,6 +622,60 @@ def refractory_VDI_Cp(ID, T=None):
         return float(interp(T, _refractory_Ts, Cps))
 
 
+_material_search_index = None
+
+
+def _build_material_search_index():
+    # Character counts of every material name, used to bound the similarity
+    # ratio of difflib's SequenceMatcher the same way its quick_ratio does
+    global _material_search_index
+    keys = list(materials_dict.keys())
+    chars = {}
+    for key in keys:
+        for c in key:
+            if c not in chars:
+                chars[c] = len(chars)
+    counts = np.zeros((len(keys), len(chars)))
+    for i, key in enumerate(keys):
+        for c in key:
+            counts[i, chars[c]] += 1.0
+    lengths = np.array([len(key) for key in keys], dtype=float)
+    complete = np.array([materials_dict[key] != 2 or bool(ASHRAE[key][0] and ASHRAE[key][1])
+                         for key in keys])
+    _material_search_index = (keys, chars, counts, lengths, complete)
+    return _material_search_index
+
+
+@lru_cache(maxsize=1024)
+def _search_material(name, complete, N):
+    # `N` is the number of materials, so results and the index are recomputed
+    # when materials are added to `materials_dict`
+    index = _material_search_index
+    if index is None or len(index[0]) != N:
+        index = _build_material_search_index()
+    keys, chars, counts, lengths, complete_keys = index
+    query = np.zeros(len(chars))
+    for c in name:
+        i = chars.get(c)
+        if i is not None:
+            query[i] += 1.0
+    bounds = 2.0*np.minimum(counts, query).sum(axis=1)/(lengths + len(name))
+    matcher = SequenceMatcher()
+    matcher.set_seq2(name)
+    best, best_score = None, -1.0
+    for i in np.argsort(-bounds, kind='stable'):
+        if bounds[i] < best_score:
+            break
+        if complete and not complete_keys[i]:
+            continue
+        key = keys[i]
+        matcher.set_seq1(key)
+        score = matcher.ratio()
+        if score > best_score or (score == best_score and key > best):
+            best, best_score = key, score
+    return best
+
+
 def nearest_material(name, complete=False):
     r'''Returns the nearest hit to a given name from from dictionaries of
     building, insulating, or refractory material from tables in [1]_, [2]_,
@@ -582,6 +683,13 @@ def nearest_material(name, complete=False):
     if `complete` is True, will only return hits with all three of density,
     heat capacity, and thermal conductivity available.
 
+    The closest match is the name with the highest similarity ratio of
+    :obj:`difflib.SequenceMatcher`, as :obj:`difflib.get_close_matches` would
+    return. An index of the characters of every name, built on the first
+    search, bounds the ratio of each name, so only a few names need their
+    exact ratio calculated. The most recent results are cached; both are
+    rebuilt when materials are added to `materials_dict`.
+
     Parameters
     ----------
     name : str
@@ -609,19 +717,34 @@ def nearest_material(name, complete=False):
     .. [3] Gesellschaft, V. D. I., ed. VDI Heat Atlas. 2nd edition.
        Berlin; New York:: Springer, 2010.
     '''
-    import difflib
-    if complete:
-        hits = difflib.get_close_matches(name, materials_dict.keys(), n=1000, cutoff=0)
-        for hit in hits:
-            if materials_dict[hit] == 1 or materials_dict[hit]==3 or (ASHRAE[hit][0] and ASHRAE[hit][1]):
-                return hit
-    else:
-        ID = difflib.get_close_matches(name, materials_dict.keys(), n=1, cutoff=0.6)
-        if not ID:
-            ID = difflib.get_close_matches(name, materials_dict.keys(), n=1, cutoff=0.3)
-        if not ID:
-            ID = difflib.get_close_matches(name, materials_dict.keys(), n=1, cutoff=0)
-        return ID[0]
+    return _search_material(name, bool(complete), len(materials_dict))
+
+
+def nearest_materials(names, complete=False):
+    r'''Returns the nearest hits to many names at once, as found by
+    :obj:`nearest_material`.
+
+    Parameters
+    ----------
+    names : list[str]
+        Search keywords for each material
+    complete : bool, optional
+        If True, returns only hits with all parameters available
+
+    Returns
+    -------
+    IDs : list[str]
+        Keys to one of the dictionaries `refractories`, `ASHRAE`, or
+        `building_materials` for each name
+
+    Examples
+    --------
+    >>> nearest_materials(['stainless steel', 'Mineral fiber', 'graphite'])
+    ['Metals, stainless steel', 'Mineral fiber', 'Carbon, graphite']
+    '''
+    complete, N = bool(complete), len(materials_dict)
+    return [name if (name in materials_dict and not complete) else _search_material(name, complete, N)
+            for name in names]
 
 
 def k_material(ID, T=298.15):
@@ -774,3 +897,402 @@ def Cp_material(ID, T=298.15):
             Cp = float(Cp)
     return Cp
 
+
+def material_index(ID):
+    r'''Returns the integer index of a building, insulating, or refractory
+    material in the columnar property store used by :obj:`k_material_array`,
+    :obj:`rho_material_array` and :obj:`Cp_material_array`. If `ID` is not
+    one of the keys in `material_IDs`, the closest match found by
+    :obj:`nearest_material` is used; in `ht.numba`, only exact keys are
+    accepted and -1 is returned for anything else, for which the array
+    lookups return NaN.
+
+    Parameters
+    ----------
+    ID : str
+        Key to one of the dictionaries `refractories`, `ASHRAE`, or
+        `building_materials`, or a search term
+
+    Returns
+    -------
+    index : int
+        Index of the material in `material_IDs`, [-]
+
+    Examples
+    --------
+    >>> material_index('Mineral fiber')
+    88
+    >>> material_IDs[material_index('stainless steel')]
+    'Metals, stainless steel'
+    '''
+    if ID in _material_indexes: # numba: delete
+        return _material_indexes[ID] # numba: delete
+    return _material_indexes[nearest_material(ID)] # numba: delete
+    for i in range(len(material_IDs)):
+        if material_IDs[i] == ID:
+            return i
+    return -1
+
+
+def _refractory_interp(tables, IDs, T):
+    # Clamped linear interpolation of each material's row of a refractory table
+    Ts = _refractory_Ts_array
+    N_T = len(Ts)
+    T = np.minimum(np.maximum(T, Ts[0]), Ts[-1])
+    j = np.minimum(np.searchsorted(Ts, T, side='right') - 1, N_T - 2)
+    flat = tables.ravel()
+    y0 = flat[IDs*N_T + j]
+    y1 = flat[IDs*N_T + j + 1]
+    return (y1 - y0)/(Ts[j + 1] - Ts[j])*(T - Ts[j]) + y0
+
+
+def k_material_array(IDs, T=298.15):
+    r'''Returns the thermal conductivities of many building, insulating, or
+    refractory materials at once from the columnar property store, as
+    calculated one at a time by :obj:`k_material`. `IDs` and `T` are
+    broadcast against each other.
+
+    Parameters
+    ----------
+    IDs : array_like[int]
+        Indexes of the materials in `material_IDs`, from
+        :obj:`material_index`; negative indexes give NaN
+    T : array_like, optional
+        Temperatures of the materials, [K]
+
+    Returns
+    -------
+    k : ndarray
+        Thermal conductivities of the materials, [W/m/K]
+
+    Examples
+    --------
+    >>> k_material_array([material_index('Mineral fiber'),
+    ... material_index('Fused silica')], T=[300.0, 1000.0])
+    array([0.036  , 1.58074])
+    '''
+    if material_sources is None: # numba: delete
+        _load_material_columns() # numba: delete
+    IDs, T = np.broadcast_arrays(1.0*np.asarray(IDs), 1.0*np.asarray(T))
+    IDs = IDs.astype(np.int64)
+    return np.where(IDs < 0, np.nan,
+                    np.where(material_sources[IDs] == 1,
+                             _refractory_interp(material_k_tables, IDs, T), material_ks[IDs]))
+
+
+def rho_material_array(IDs):
+    r'''Returns the densities of many building, insulating, or refractory
+    materials at once from the columnar property store, as calculated one at
+    a time by :obj:`rho_material`. Materials without a density in their table
+    are returned as NaN.
+
+    Parameters
+    ----------
+    IDs : array_like[int]
+        Indexes of the materials in `material_IDs`, from
+        :obj:`material_index`; negative indexes give NaN
+
+    Returns
+    -------
+    rho : ndarray
+        Densities of the materials, [kg/m^3]
+
+    Examples
+    --------
+    >>> rho_material_array([material_index('Board, Asbestos/cement'),
+    ... material_index('Carpet and rebounded urethane pad')])
+    array([1900.,   110.])
+    '''
+    if material_sources is None: # numba: delete
+        _load_material_columns() # numba: delete
+    IDs = (1.0*np.asarray(IDs)).astype(np.int64)
+    return np.where(IDs < 0, np.nan, material_rhos[IDs])
+
+
+def Cp_material_array(IDs, T=298.15):
+    r'''Returns the heat capacities of many building, insulating, or
+    refractory materials at once from the columnar property store, as
+    calculated one at a time by :obj:`Cp_material`. `IDs` and `T` are
+    broadcast against each other. Materials without a heat capacity in their
+    table are returned as NaN.
+
+    Parameters
+    ----------
+    IDs : array_like[int]
+        Indexes of the materials in `material_IDs`, from
+        :obj:`material_index`; negative indexes give NaN
+    T : array_like, optional
+        Temperatures of the materials, [K]
+
+    Returns
+    -------
+    Cp : ndarray
+        Heat capacities of the materials, [J/kg/K]
+
+    Examples
+    --------
+    >>> Cp_material_array([material_index('Mineral fiber'),
+    ... material_index('Fused silica')], T=[300.0, 1000.0])
+    array([840.     , 956.78225])
+    '''
+    if material_sources is None: # numba: delete
+        _load_material_columns() # numba: delete
+    IDs, T = np.broadcast_arrays(1.0*np.asarray(IDs), 1.0*np.asarray(T))
+    IDs = IDs.astype(np.int64)
+    return np.where(IDs < 0, np.nan,
+                    np.where(material_sources[IDs] == 1,
+                             _refractory_interp(material_Cp_tables, IDs, T), material_Cps[IDs]))
+
+
+def _refractory_array_indexes(IDs):
+    # Converts refractory names to their indexes in `material_IDs`
+    if isinstance(IDs, str):
+        return np.array(_refractory_indexes[IDs])
+    IDs = np.asarray(IDs)
+    if IDs.dtype.kind not in 'iu':
+        IDs = np.array([_refractory_indexes[ID] for ID in IDs.ravel().tolist()],
+                       dtype=np.int64).reshape(IDs.shape)
+    return IDs
+
+
+def _refractory_VDI_array(tables, IDs, T):
+    IDs, T = np.broadcast_arrays(1.0*np.asarray(IDs), 1.0*np.asarray(T))
+    return _refractory_interp(tables, IDs.astype(np.int64), T)
+
+
+def refractory_VDI_k_array(IDs, T=None):
+    r'''Returns the thermal conductivities of refractory materials from the
+    table in [1]_ for arrays of temperatures and materials at once, as
+    calculated one at a time by :obj:`refractory_VDI_k`. `IDs` and `T` are
+    broadcast against each other; temperatures outside the range of the table
+    are rounded to the nearest limit, and if T is not provided the lowest
+    temperature's values are returned.
+
+    Parameters
+    ----------
+    IDs : str or array_like
+        Names of the refractories in the dictionary `refractories`, or their
+        indexes in `material_IDs` from :obj:`material_index`; only indexes
+        are accepted in `ht.numba`
+    T : array_like, optional
+        Temperatures of the refractory materials, [K]
+
+    Returns
+    -------
+    k : ndarray
+        Thermal conductivities of the refractory materials, [W/m/K]
+
+    Examples
+    --------
+    >>> refractory_VDI_k_array('Fused silica', [200.0, 1000.0, 1500])
+    array([1.44   , 1.58074, 1.73   ])
+    >>> refractory_VDI_k_array(['Fused silica', 'Silica'], 1000.0)
+    array([1.58074  , 1.4551375])
+
+    References
+    ----------
+    .. [1] Gesellschaft, V. D. I., ed. VDI Heat Atlas. 2nd edition.
+       Berlin; New York:: Springer, 2010.
+    '''
+    if material_sources is None: # numba: delete
+        _load_material_columns() # numba: delete
+    IDs = _refractory_array_indexes(IDs) # numba: delete
+    if T is None:
+        return _refractory_VDI_array(material_k_tables, IDs, _refractory_Ts_array[0])
+    return _refractory_VDI_array(material_k_tables, IDs, T)
+
+
+def refractory_VDI_Cp_array(IDs, T=None):
+    r'''Returns the heat capacities of refractory materials from the table in
+    [1]_ for arrays of temperatures and materials at once, as calculated one
+    at a time by :obj:`refractory_VDI_Cp`. `IDs` and `T` are broadcast
+    against each other; temperatures outside the range of the table are
+    rounded to the nearest limit, and if T is not provided the lowest
+    temperature's values are returned.
+
+    Parameters
+    ----------
+    IDs : str or array_like
+        Names of the refractories in the dictionary `refractories`, or their
+        indexes in `material_IDs` from :obj:`material_index`; only indexes
+        are accepted in `ht.numba`
+    T : array_like, optional
+        Temperatures of the refractory materials, [K]
+
+    Returns
+    -------
+    Cp : ndarray
+        Heat capacities of the refractory materials, [J/kg/K]
+
+    Examples
+    --------
+    >>> refractory_VDI_Cp_array('Fused silica', [200.0, 1000.0, 1500])
+    array([917.     , 956.78225, 982.     ])
+
+    References
+    ----------
+    .. [1] Gesellschaft, V. D. I., ed. VDI Heat Atlas. 2nd edition.
+       Berlin; New York:: Springer, 2010.
+    '''
+    if material_sources is None: # numba: delete
+        _load_material_columns() # numba: delete
+    IDs = _refractory_array_indexes(IDs) # numba: delete
+    if T is None:
+        return _refractory_VDI_array(material_Cp_tables, IDs, _refractory_Ts_array[0])
+    return _refractory_VDI_array(material_Cp_tables, IDs, T)
+
+
+def _insulated_pipe_Q(Ti, To, Di, hi, ho, t_wall, k_wall, t, k):
+    # Heat loss per meter of an insulated pipe, as cylindrical_heat_transfer
+    Dw = Di + 2.0*t_wall
+    Do = Dw + 2.0*t
+    R = (1.0/(hi*Di) + 0.5*np.log(Dw/Di)/k_wall + 0.5*np.log(Do/Dw)/k
+         + 1.0/(ho*Do))
+    return np.pi*(Ti - To)/R
+
+
+def economic_insulation_thickness(Ti, To, Di, materials, cost_insulation,
+                                  cost_energy, ho, hi=1E12, t_wall=0.0,
+                                  k_wall=50.0, annual_factor=0.1,
+                                  operating_time=31536000.0, t_min=0.005,
+                                  t_max=0.3, points=30, xtol=1E-6):
+    r'''Finds the economic insulation material and thickness for one or more
+    pipes, by minimizing the annual cost of the heat lost through the
+    insulation plus the annualized cost of the insulation itself, per meter
+    of pipe:
+
+    .. math::
+        C = C_{energy} t_{op} Q + f_{annual} C_{ins} \frac{\pi}{4}
+        \left(D_{o}^2 - D_{w}^2\right)
+
+    The heat loss :math:`Q` is calculated as in
+    :obj:`ht.conduction.cylindrical_heat_transfer` for a pipe wall and one
+    insulation layer, with the thermal conductivity of each material
+    evaluated at the mean of `Ti` and `To`. For every pipe and material, the
+    cost is first evaluated on a geometric grid of `points` thicknesses
+    between `t_min` and `t_max`; the best grid point is then refined by a
+    golden-section search between its neighbours. All the pipes and
+    materials are solved together in vectorized form.
+
+    Parameters
+    ----------
+    Ti : float or array_like
+        Temperatures of the fluids inside the pipes, [K]
+    To : float or array_like
+        Temperatures of the surroundings, [K]
+    Di : float or array_like
+        Inside diameters of the pipes, [m]
+    materials : list[str] or array_like[int]
+        Candidate insulation materials, as keys or search terms accepted by
+        :obj:`material_index`, or as indexes in `material_IDs`
+    cost_insulation : float or array_like
+        Installed cost of each insulation material per unit volume,
+        [currency/m^3]
+    cost_energy : float or array_like
+        Cost of the heat lost from each pipe, [currency/J]
+    ho : float or array_like
+        Heat transfer coefficients on the outside of the insulation,
+        [W/m^2/K]
+    hi : float or array_like, optional
+        Heat transfer coefficients inside the pipes, [W/m^2/K]
+    t_wall : float or array_like, optional
+        Thicknesses of the pipe walls, [m]
+    k_wall : float or array_like, optional
+        Thermal conductivities of the pipe walls, [W/m/K]
+    annual_factor : float, optional
+        Fraction of the installed insulation cost charged each year, such
+        as a capital recovery factor, [1/year]
+    operating_time : float, optional
+        Time each year the pipes are in operation, [s/year]
+    t_min : float, optional
+        Minimum insulation thickness considered, [m]
+    t_max : float, optional
+        Maximum insulation thickness considered, [m]
+    points : int, optional
+        Number of thicknesses in the initial grid search, [-]
+    xtol : float, optional
+        Tolerance of the optimal thicknesses, [m]
+
+    Returns
+    -------
+    results : dict
+        * material : Index in `materials` of the economic material for each
+          pipe, [-]
+        * ID : Key of the economic material for each pipe, [-]
+        * thickness : Economic insulation thickness of each pipe, [m]
+        * cost : Annual cost of each pipe at its economic optimum,
+          [currency/m/year]
+        * Q : Heat lost from each pipe at its economic optimum, [W/m]
+        * thicknesses : Economic thickness of each material for each pipe,
+          with the materials along the last axis, [m]
+        * costs : Annual cost of each material at its economic thickness
+          for each pipe, with the materials along the last axis,
+          [currency/m/year]
+
+    Notes
+    -----
+    An optimum at `t_min` or `t_max` means the true economic thickness is
+    outside of the range searched. Materials without a thermal conductivity
+    at the temperature of a pipe cannot be selected for it.
+
+    Examples
+    --------
+    >>> ans = economic_insulation_thickness(Ti=[400.0, 450.0], To=293.15,
+    ... Di=[0.05, 0.2], materials=['Mineral fiber', 'Cellular glass'],
+    ... cost_insulation=[1500.0, 2500.0], cost_energy=1E-8, ho=10.0)
+    >>> ans['ID']
+    array(['Mineral fiber', 'Mineral fiber'], dtype=object)
+    >>> ans['thickness']
+    array([0.0508423 , 0.07902403])
+    '''
+    if not isinstance(materials, str) and np.asarray(materials).dtype.kind in 'iu':
+        IDs = np.asarray(materials)
+    else:
+        names = [materials] if isinstance(materials, str) else materials
+        IDs = np.array([material_index(name) for name in names])
+    Ti, To, Di, cost_energy, ho, hi, t_wall, k_wall = np.broadcast_arrays(
+        *(1.0*np.asarray(v) for v in (Ti, To, Di, cost_energy, ho, hi, t_wall, k_wall)))
+    cost_insulation = np.broadcast_to(1.0*np.asarray(cost_insulation), IDs.shape)
+
+    # Pipes along the leading axes, then materials, then thicknesses
+    pipe = tuple(v[..., None, None] for v in (Ti, To, Di, hi, ho, t_wall, k_wall))
+    ks = k_material_array(IDs[:, None], 0.5*(Ti + To)[..., None, None])
+    Dw = pipe[2] + 2.0*pipe[5]
+    energy = cost_energy[..., None, None]*operating_time
+    volume_cost = annual_factor*np.pi*cost_insulation[:, None]
+
+    def cost(t):
+        return energy*_insulated_pipe_Q(*pipe, t, ks) + volume_cost*t*(Dw + t)
+
+    grid = np.geomspace(t_min, t_max, points)
+    costs = cost(grid)
+    best = np.argmin(np.where(np.isnan(costs), np.inf, costs), axis=-1)[..., None]
+    a = grid[np.maximum(best - 1, 0)]
+    b = grid[np.minimum(best + 1, points - 1)]
+
+    # Golden-section search on every bracket at once
+    invphi = 0.5*(5.0**0.5 - 1.0)
+    c, d = b - invphi*(b - a), a + invphi*(b - a)
+    fc, fd = cost(c), cost(d)
+    while np.any(b - a > xtol):
+        left = fc < fd
+        b = np.where(left, d, b)
+        a = np.where(left, a, c)
+        c_new = np.where(left, b - invphi*(b - a), d)
+        d_new = np.where(left, c, a + invphi*(b - a))
+        f_new = cost(np.where(left, c_new, d_new))
+        fc, fd = np.where(left, f_new, fd), np.where(left, fc, f_new)
+        c, d = c_new, d_new
+    thicknesses = 0.5*(a + b)
+    costs = cost(thicknesses)[..., 0]
+    thicknesses, ks = thicknesses[..., 0], ks[..., 0]
+
+    material = np.argmin(np.where(np.isnan(costs), np.inf, costs), axis=-1)
+    def pick(values):
+        return np.take_along_axis(values, material[..., None], axis=-1)[..., 0]
+    thickness = pick(thicknesses)
+    return {'material': material,
+            'ID': np.array(material_IDs, dtype=object)[IDs][material],
+            'thickness': thickness, 'cost': pick(costs),
+            'Q': _insulated_pipe_Q(Ti, To, Di, hi, ho, t_wall, k_wall, thickness, pick(ks)),
+            'thicknesses': thicknesses, 'costs': costs}
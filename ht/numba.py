@@ -21,6 +21,7 @@ SOFTWARE.
 '''
 
 import inspect
+import sys
 
 import fluids
 import fluids.numba
@@ -45,6 +46,26 @@ replaced = fluids.numba.numerics_dict.copy()
 
 
 def transform_complete_ht(replaced, __funcs, __all__, normal, vec=False):
+    # Transform the original functions, not any caching or timing wrappers
+    instrumentation = sys.modules.get('ht.instrumentation')
+    instrumented = instrumentation is not None and instrumentation.instrumentation_enabled()
+    if instrumented:
+        instrumentation.disable_instrumentation()
+    memoization = sys.modules.get('ht.caching')
+    cache_sizes = {}
+    if memoization is not None:
+        cache_sizes = memoization.cache_info()
+        memoization.disable_cache()
+    try:
+        _transform_complete_ht(replaced, __funcs, __all__, normal, vec=vec)
+    finally:
+        for name, info in cache_sizes.items():
+            memoization.enable_cache(name, maxsize=info.maxsize)
+        if instrumented:
+            instrumentation.enable_instrumentation()
+
+
+def _transform_complete_ht(replaced, __funcs, __all__, normal, vec=False):
     cache_blacklist = {'h_Ganguli_VDI', 'fin_efficiency_Kern_Kraus', 'h_Briggs_Young',
                            'h_ESDU_high_fin', 'h_ESDU_low_fin', 'Nu_Nusselt_Rayleigh_Holling_Herwig',
                            'DBundle_for_Ntubes_Phadkeb', 'Thome', 'to_solve_q_Thome',
@@ -70,7 +91,6 @@ def transform_complete_ht(replaced, __funcs, __all__, normal, vec=False):
     to_change = {}
     to_change.update({k: 'full_output' for k in to_change_full_output})
 #    to_change['hx.Ntubes_Phadkeb'] = 'square_C1s is None'
-    to_change['boiling_nucleic.Gorenflo'] = 'h0 is None: # NUMBA: DELETE'
 
     for s, bad_branch in to_change.items():
         mod, func = s.split('.')
@@ -85,7 +105,11 @@ def transform_complete_ht(replaced, __funcs, __all__, normal, vec=False):
         obj.__doc__ = ''
     to_change = ['air_cooler.Ft_aircooler', 'hx.Ntubes_Phadkeb',
                  'hx.DBundle_for_Ntubes_Phadkeb', 'boiling_nucleic.h_nucleic_methods',
-                 'hx._NTU_from_P_solver', 'hx.NTU_from_P_plate']
+                 'boiling_nucleic.boiling_nucleic_index', 'boiling_nucleic.Gorenflo',
+                 'insulation.material_index', 'insulation.k_material_array',
+                 'insulation.rho_material_array', 'insulation.Cp_material_array',
+                 'insulation.refractory_VDI_k_array', 'insulation.refractory_VDI_Cp_array',
+                 'hx._NTU_from_P_solver', 'hx.NTU_from_P_plate', 'boiling_flow.Thome']
     normal_fluids.numba.transform_lists_to_arrays(normal, to_change, __funcs, cache_blacklist=cache_blacklist)
 
     for mod in new_mods:
@@ -96,6 +120,12 @@ def transform_complete_ht(replaced, __funcs, __all__, normal, vec=False):
             pass
 
     __funcs['hx']._load_coeffs_Phadkeb() # Run after everything is done
+    if normal.insulation.material_sources is None:
+        normal.insulation._load_material_columns()
+    for name in ('material_sources', 'material_rhos', 'material_Cps', 'material_ks',
+                 'material_Rs', 'material_thicknesses', 'material_k_tables',
+                 'material_Cp_tables', '_refractory_Ts_array'):
+        __funcs['insulation'].__dict__[name] = getattr(normal.insulation, name)
 
 transform_complete_ht(replaced, __funcs, __all__, normal, vec=False)
 
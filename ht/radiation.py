@@ -21,13 +21,16 @@ SOFTWARE.
 '''
 
 import os
-from math import e, exp
+from math import e, exp, factorial, pi
 
 from fluids.constants import c, h, k, sigma
 from fluids.numerics import numpy as np
 
 __all__ = ['blackbody_spectral_radiance', 'q_rad', 'grey_transmittance',
-           'solar_spectrum']
+           'solar_spectrum', 'blackbody_spectral_radiance_array',
+           'blackbody_fraction', 'blackbody_band_fraction',
+           'solar_spectrum_models', 'solar_absorptivity', 'q_rad_array',
+           'grey_transmittance_array']
 
 
 def blackbody_spectral_radiance(T, wavelength):
@@ -182,6 +185,267 @@ def grey_transmittance(extinction_coefficient, molar_density, length, base=e):
     return base**(-transmittance)
 
 
+def blackbody_spectral_radiance_array(T, wavelength):
+    r'''Returns the spectral radiance of a blackbody for arrays of
+    temperatures and wavelengths, which are broadcast against each other.
+    This is the array version of :obj:`blackbody_spectral_radiance`; very
+    short wavelengths whose radiance underflows give 0 without a warning.
+
+    .. math::
+        I_{\lambda,blackbody,e}(\lambda,T)=\frac{2hc_o^2}
+        {\lambda^5[\exp(hc_o/\lambda k T)-1]}
+
+    Parameters
+    ----------
+    T : float or array_like
+        Temperatures of the surfaces, [K]
+    wavelength : float or array_like
+        Lengths of the waves to be considered, [m]
+
+    Returns
+    -------
+    I : ndarray
+        Spectral radiances [W/(m^2*sr*m)]
+
+    Examples
+    --------
+    >>> blackbody_spectral_radiance_array([800., 5500.], [4E-6, 5E-10])
+    array([1.31169413e+09, 0.00000000e+00])
+    '''
+    wavelength = 1.0*np.asarray(wavelength)
+    to_exp = h*c/(wavelength*np.asarray(T)*k)
+    overflow = to_exp > 709.7
+    exp_term = np.expm1(np.where(overflow, 709.7, to_exp))
+    return np.where(overflow, 0.0, 2.*h*c*c*wavelength**-5/exp_term)
+
+
+# Coefficients of the expansion of the blackbody fraction for small
+# c2/(lambda*T), B_2m/((2m+3)(2m)!) from the Bernoulli numbers B_2m
+_blackbody_Bernoulli = [1/6, -1/30, 1/42, -1/30, 5/66, -691/2730, 7/6,
+                        -3617/510, 43867/798, -174611/330, 854513/138,
+                        -236364091/2730]
+_blackbody_fraction_coeffs = [B/((2*m + 3)*factorial(2*m)) for m, B in
+                              enumerate(_blackbody_Bernoulli, start=1)]
+_blackbody_fraction_terms = 20
+
+
+def blackbody_fraction(T, wavelength):
+    r'''Returns the fraction of the total emissive power of a blackbody which
+    is emitted at wavelengths shorter than `wavelength`. Arrays of
+    temperatures and wavelengths are broadcast against each other.
+
+    .. math::
+        F_{0\to\lambda} = \frac{15}{\pi^4}\int_{\zeta}^\infty
+        \frac{x^3}{e^x - 1}dx, \;\;\; \zeta = \frac{hc_o}{\lambda k T}
+
+    For :math:`\zeta \ge 2` the integral is evaluated with the rapidly
+    converging series of [1]_; for smaller :math:`\zeta` with its expansion
+    in Bernoulli numbers, both accurate to near machine precision.
+
+    .. math::
+        F_{0\to\lambda} = \frac{15}{\pi^4}\sum_{n=1}^\infty \frac{e^{-n\zeta}}
+        {n}\left(\zeta^3 + \frac{3\zeta^2}{n} + \frac{6\zeta}{n^2}
+        + \frac{6}{n^3}\right)
+
+    Parameters
+    ----------
+    T : float or array_like
+        Temperatures of the blackbodies, [K]
+    wavelength : float or array_like
+        Upper limits of the wavelength band starting at zero, [m]
+
+    Returns
+    -------
+    F : ndarray
+        Fractions of the emissive power emitted below `wavelength`, [-]
+
+    Examples
+    --------
+    Fraction of the emission of the sun at wavelengths below 1 µm:
+
+    >>> blackbody_fraction(5778., 1E-6)
+    array(0.71810237)
+
+    References
+    ----------
+    .. [1] Siegel, Robert, and John R. Howell. Thermal Radiation Heat
+       Transfer. 4th edition. New York: Taylor & Francis, 2002.
+    '''
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        zeta = h*c/(k*np.asarray(T)*(1.0*np.asarray(wavelength)))
+        small = zeta < 2.0
+        # Series in exp(-n*zeta) for large zeta
+        zeta_large = np.where(small, 2.0, zeta)
+        tot = 0.0
+        for n in range(_blackbody_fraction_terms, 0, -1):
+            inv_n = 1.0/n
+            tot = tot + np.exp(-n*zeta_large)*inv_n*(
+                zeta_large*(zeta_large*(zeta_large + 3.0*inv_n) + 6.0*inv_n*inv_n)
+                + 6.0*inv_n*inv_n*inv_n)
+        F_large = np.where(np.isinf(zeta_large), 0.0, tot*(15.0/pi**4))
+
+        # Expansion in Bernoulli numbers for small zeta
+        zeta_small = np.where(small, zeta, 0.0)
+        zeta2 = zeta_small*zeta_small
+        tot = 0.0
+        for coeff in reversed(_blackbody_fraction_coeffs):
+            tot = (tot + coeff)*zeta2
+        tot = 1.0/3.0 - 0.125*zeta_small + tot
+        F_small = 1.0 - (15.0/pi**4)*zeta2*zeta_small*tot
+    return np.where(small, F_small, F_large)
+
+
+def blackbody_band_fraction(T, wavelength_min, wavelength_max):
+    r'''Returns the fraction of the total emissive power of a blackbody
+    which is emitted in the wavelength band between `wavelength_min` and
+    `wavelength_max`, as the difference of two :obj:`blackbody_fraction`
+    values. Arrays of temperatures and wavelengths are broadcast against each
+    other. Multiplying by :math:`\sigma T^4` gives the emissive power in the
+    band.
+
+    .. math::
+        F_{\lambda_1\to\lambda_2} = F_{0\to\lambda_2} - F_{0\to\lambda_1}
+
+    Parameters
+    ----------
+    T : float or array_like
+        Temperatures of the blackbodies, [K]
+    wavelength_min : float or array_like
+        Lower limits of the wavelength bands, [m]
+    wavelength_max : float or array_like
+        Upper limits of the wavelength bands, [m]
+
+    Returns
+    -------
+    F : ndarray
+        Fractions of the emissive power emitted in each band, [-]
+
+    Examples
+    --------
+    Fraction of the emission of the sun which is visible:
+
+    >>> float(blackbody_band_fraction(5778., 380E-9, 750E-9))
+    0.43805591611
+
+    Emissive power in the bands of a 1000 K surface split at 2, 4 and 8 µm:
+
+    >>> bands = [0.0, 2E-6, 4E-6, 8E-6, float('inf')]
+    >>> blackbody_band_fraction(1000., bands[:-1], bands[1:])*sigma*1000.0**4
+    array([ 3783.83279901, 23482.95794905, 21285.7663218 ,  8151.11293014])
+    '''
+    return blackbody_fraction(T, wavelength_max) - blackbody_fraction(T, wavelength_min)
+
+
+def _array_out(out, *args):
+    # Returns the output array followed by the inputs; inputs which may
+    # overlap `out` are copied, as it is written to before they are all read
+    shape = np.broadcast_shapes(*(np.shape(v) for v in args))
+    if out is None:
+        return (np.empty(shape),) + args
+    if out.shape != shape:
+        raise ValueError("out must have the broadcast shape of the inputs, %s" %(shape,))
+    return (out,) + tuple(np.array(v) if np.may_share_memory(out, v) else v for v in args)
+
+
+def q_rad_array(emissivity, T, T2=0.0, out=None):
+    r'''Returns the radiant heat fluxes of many surfaces at once, as
+    calculated one at a time by :obj:`q_rad`. All of the inputs are
+    broadcast against each other, and the result is calculated in place in a
+    single array, which can be provided with `out` to reuse it between calls.
+
+    .. math::
+        q = \epsilon \sigma (T_1^4 - T_2^4)
+
+    Parameters
+    ----------
+    emissivity : float or array_like
+        Fractions of black-body radiation which are emitted, [-]
+    T : float or array_like
+        Temperatures of the surfaces, [K]
+    T2 : float or array_like, optional
+        Temperatures of the surroundings of the surfaces [K]
+    out : ndarray, optional
+        Array of the broadcast shape of the inputs to store the results
+        in; it may be one of the inputs, [W/m^2]
+
+    Returns
+    -------
+    q : ndarray
+        Heat exchange, [W/m^2]
+
+    Examples
+    --------
+    >>> q_rad_array([1.0, .85], T=400.0, T2=[0.0, 305.])
+    array([1451.613952  ,  816.78217227])
+    '''
+    out, emissivity, T, T2 = _array_out(out, emissivity, T, T2)
+    np.multiply(T, T, out=out)
+    np.multiply(out, out, out=out)
+    if np.any(T2):
+        T2_T2 = np.multiply(T2, T2)
+        out -= T2_T2*T2_T2
+    out *= emissivity
+    out *= sigma
+    return out
+
+
+def grey_transmittance_array(extinction_coefficient, molar_density, length,
+                             base=e, out=None):
+    r'''Calculates the transmittances of grey bodies for many extinction
+    coefficients, molar densities and path lengths at once, as calculated
+    one at a time by :obj:`grey_transmittance`. All of the inputs, including
+    `base`, are broadcast against each other; for instance a matrix of the
+    path lengths between the surfaces of an enclosure can be combined with a
+    vector of extinction coefficients of several bands given the shape
+    (bands, 1, 1). The result is calculated in place in a single array,
+    which can be provided with `out` to reuse it between calls.
+
+    .. math::
+        \tau = base^{(-\epsilon \cdot l\cdot \rho_m )}
+
+    Parameters
+    ----------
+    extinction_coefficient : float or array_like
+        The extinction coefficients of the material the radiation is
+        passing through, [m^2/mol]
+    molar_density : float or array_like
+        The molar densities of the material the radiation is passing
+        through, [mol/m^3]
+    length : float or array_like
+        The lengths of the paths the radiation is transmitted through, [m]
+    base : float or array_like, optional
+        The exponent used in calculations; `e` is more theoretically sound
+        but 10 is often used as a base by chemists, [-]
+    out : ndarray, optional
+        Array of the broadcast shape of the inputs to store the results
+        in; it may be one of the inputs, [-]
+
+    Returns
+    -------
+    transmittance : ndarray
+        The fractions of spectral radiance which are transmitted, [-]
+
+    Examples
+    --------
+    >>> grey_transmittance_array(3.8e-4, molar_density=55300, length=[[0.0, 1e-2], [1e-2, 0.0]])
+    array([[1.        , 0.81047077],
+           [0.81047077, 1.        ]])
+    '''
+    out, extinction_coefficient, molar_density, length, base = _array_out(
+        out, extinction_coefficient, molar_density, length, base)
+    np.multiply(molar_density, extinction_coefficient, out=out)
+    out *= length
+    if np.ndim(base) or base != e:
+        out *= np.log(base)
+    np.negative(out, out=out)
+    np.exp(out, out=out)
+    return out
+
+
+solar_spectrum_models = ['SOLAR-ISS']
+_solar_spectra = {}
+
+
 def solar_spectrum(model='SOLAR-ISS'):
     r'''Returns the solar spectrum of the sun according to the specified model.
     Only the 'SOLAR-ISS' model is supported.
@@ -216,8 +480,8 @@ def solar_spectrum(model='SOLAR-ISS'):
 
     [2]_ contains another dataset.
 
-    99.9% of the time this function takes is to read in the solar data from
-    disk. This could be reduced by using pandas.
+    The data is read from disk on the first call only; afterwards the same
+    arrays are returned, so they are read-only.
 
     Examples
     --------
@@ -249,6 +513,8 @@ def solar_spectrum(model='SOLAR-ISS'):
        Research Letters 36, no. 1 (January 1, 2009).
        https://doi.org/10.1029/2008GL036373.
     '''
+    if model in _solar_spectra:
+        return _solar_spectra[model]
     if model == 'SOLAR-ISS':
         folder = os.path.join(os.path.dirname(__file__), 'data')
         pth = os.path.join(folder, 'solar_iss_2018_spectrum.dat')
@@ -262,5 +528,77 @@ def solar_spectrum(model='SOLAR-ISS'):
         uncertainties[uncertainties == -1] = np.nan
 
         uncertainties *= 1E9
-    return wavelengths, SSI, uncertainties
+    else:
+        raise ValueError("Model not recognized; options are %s" %(solar_spectrum_models,))
+    for v in (wavelengths, SSI, uncertainties):
+        v.flags.writeable = False
+    _solar_spectra[model] = (wavelengths, SSI, uncertainties)
+    return _solar_spectra[model]
+
+
+def solar_absorptivity(wavelengths, absorptivities, model='SOLAR-ISS'):
+    r'''Returns the solar-weighted absorptivity of one or more surfaces,
+    from their spectral absorptivities measured at `wavelengths`. Each curve
+    is linearly interpolated onto the wavelengths of the solar spectrum of
+    :obj:`solar_spectrum` and integrated against its spectral irradiance with
+    the trapezoidal rule:
+
+    .. math::
+        \alpha_{solar} = \frac{\int \alpha_\lambda E_{\lambda,sun} d\lambda}
+        {\int E_{\lambda,sun} d\lambda}
+
+    The interpolation and integration are combined into one vector of
+    weights on `wavelengths`, so all the curves are evaluated with a single
+    matrix-vector product.
+
+    Parameters
+    ----------
+    wavelengths : array_like
+        Increasing wavelengths at which the absorptivities are known, [m]
+    absorptivities : array_like
+        Spectral absorptivities of the surfaces; a 2D array with one curve
+        per row, or a single curve, [-]
+    model : str, optional
+        The solar spectrum model; see :obj:`solar_spectrum`, [-]
 
+    Returns
+    -------
+    absorptivity : ndarray
+        Solar-weighted absorptivity of each curve, [-]
+
+    Notes
+    -----
+    Both integrals are over the wavelengths of the solar spectrum inside the
+    range of `wavelengths`; the sun's emission outside of that range is
+    ignored.
+
+    Examples
+    --------
+    A surface which absorbs all radiation below 1 µm, and one which is
+    grey:
+
+    >>> solar_absorptivity([2E-7, 1E-6, 1.0001E-6, 2.9E-6],
+    ... [[1.0, 1.0, 0.0, 0.0], [0.9, 0.9, 0.9, 0.9]])
+    array([0.71301928, 0.9       ])
+    '''
+    solar_wavelengths, SSI, _ = solar_spectrum(model)
+    wavelengths = 1.0*np.asarray(wavelengths)
+    absorptivities = 1.0*np.asarray(absorptivities)
+    if (wavelengths.ndim != 1 or len(wavelengths) < 2
+            or absorptivities.shape[-1] != wavelengths.shape[0]):
+        raise ValueError("absorptivities must have one value per wavelength along their last axis")
+
+    start = np.searchsorted(solar_wavelengths, wavelengths[0], side='left')
+    end = np.searchsorted(solar_wavelengths, wavelengths[-1], side='right')
+    ls = solar_wavelengths[start:end]
+    # Trapezoidal weights of the solar spectrum
+    dl = np.diff(ls)
+    weights = SSI[start:end]*(0.5*(np.concatenate(([0.0], dl)) + np.concatenate((dl, [0.0]))))
+
+    # Spread the weights onto the measured wavelengths by linear interpolation
+    j = np.clip(np.searchsorted(wavelengths, ls, side='right') - 1, 0, len(wavelengths) - 2)
+    frac = (ls - wavelengths[j])/(wavelengths[j + 1] - wavelengths[j])
+    N = len(wavelengths)
+    W = (np.bincount(j, weights=weights*(1.0 - frac), minlength=N)
+         + np.bincount(j + 1, weights=weights*frac, minlength=N))
+    return absorptivities @ (W/weights.sum())
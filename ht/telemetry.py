@@ -0,0 +1,100 @@
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2026 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+from contextlib import contextmanager
+
+__all__ = ['solver_telemetry']
+
+records = None
+'''List the active :obj:`solver_telemetry` collector appends to, or None
+when no telemetry is being collected.'''
+
+
+class CountingObjective:
+    '''Wraps a solver objective function, counting its evaluations in a new
+    telemetry record which is added to the active collector.'''
+    __slots__ = ('func', 'record')
+
+    def __init__(self, func, function, inputs):
+        self.func = func
+        self.record = {'function': function, 'inputs': inputs, 'solver': None,
+                       'fallback': False, 'evaluations': 0, 'residual': None,
+                       'converged': False}
+        if records is not None:
+            records.append(self.record)
+
+    def __call__(self, x, *args):
+        self.record['evaluations'] += 1
+        return self.func(x, *args)
+
+    def finish(self, solver, x, args, fallback=False):
+        record = self.record
+        record['solver'] = solver
+        record['fallback'] = fallback
+        record['converged'] = True
+        try:
+            record['residual'] = float(self.func(x, *args))
+        except Exception:
+            pass
+
+
+@contextmanager
+def solver_telemetry():
+    r'''Context manager which collects a record of every numerical solve
+    performed by the solver-backed ht functions in the block: the P-NTU
+    inversions of the `NTU_from_P_*` functions, :obj:`ht.boiling_flow.Thome`
+    with a specified `Te`, and :obj:`ht.hx.DBundle_for_Ntubes_Phadkeb`.
+
+    Each record is a dictionary with the keys:
+
+    * function : Name of the ht function performing the solve
+    * inputs : Dictionary of the inputs which define the solve
+    * solver : Name of the solver which produced the answer ('secant',
+      'brenth' or 'bisect')
+    * fallback : Whether or not a first solver failed and a fallback solver
+      was used
+    * evaluations : Total number of evaluations of the objective function,
+      including those of a failed first solver; each iteration of these
+      solvers costs one evaluation, plus two starting evaluations
+    * residual : Value of the objective function at the returned answer
+    * converged : False if the solve raised an exception
+
+    Records of solves which fail are kept with `converged` False, so
+    problematic inputs can be identified. Telemetry is not collected by the
+    `ht.numba` versions of the functions.
+
+    Examples
+    --------
+    >>> import ht
+    >>> with solver_telemetry() as records:
+    ...     _ = ht.NTU_from_P_H(P1=.3, R1=1.2, Ntp=2)
+    >>> records[0]['function'], records[0]['solver'], records[0]['fallback']
+    ('NTU_from_P', 'secant', False)
+    '''
+    global records
+    previous = records
+    collected = []
+    records = collected
+    try:
+        yield collected
+    finally:
+        records = previous
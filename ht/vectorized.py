@@ -58,11 +58,13 @@ __funcs = {}
 if isinstance(np, FakePackage):
     pass
 else:
+    import inspect
     import types
     for name in dir(ht):
         obj = getattr(ht, name)
         if isinstance(obj, types.FunctionType):
-            obj = np.vectorize(obj)
+            # Vectorize the original function, not a caching or timing wrapper
+            obj = np.vectorize(inspect.unwrap(obj))
         elif isinstance(obj, str):
             continue
         __all__.append(name)
@@ -23,10 +23,11 @@ SOFTWARE.
 import pytest
 from fluids.constants import foot, hp, inch, minute
 from fluids.geometry import AirCooledExchanger
-from fluids.numerics import assert_close, assert_close2d
+from fluids.numerics import assert_close, assert_close1d, assert_close2d
 
 from ht import (
     Ft_aircooler,
+    Ft_aircooler_array,
     air_cooler_noise_GPSA,
     air_cooler_noise_Mukherjee,
     dP_ESDU_high_fin,
@@ -51,6 +52,15 @@ def test_air_cooler_Ft():
     assert_close2d(Ft_many, Ft_values)
 
 
+def test_Ft_aircooler_array():
+    Ts = [(93, 52, 35, 54.59), (125., 45., 25., 95.), (125., 80., 25., 95.)]
+    Thi, Tho, Tci, Tco = zip(*Ts)
+    for Ntp in range(1, 6):
+        for rows in range(1, 6):
+            Fts = Ft_aircooler_array(Thi, Tho, Tci, Tco, Ntp=Ntp, rows=rows)
+            assert_close1d(Fts, [Ft_aircooler(*T, Ntp=Ntp, rows=rows) for T in Ts])
+
+
 def test_air_cooler_noise_GPSA():
     noise = air_cooler_noise_GPSA(tip_speed=3177/minute, power=25.1*hp)
     assert_close(noise, 100.53680477959792)
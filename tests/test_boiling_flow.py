@@ -20,10 +20,13 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
+from math import pi
+
+import numpy as np
 import pytest
-from fluids.numerics import assert_close
+from fluids.numerics import assert_close, assert_close1d, brenth
 
-from ht.boiling_flow import Chen_Bennett, Chen_Edelstein, Lazarek_Black, Li_Wu, Liu_Winterton, Sun_Mishima, Thome, Yun_Heo_Kim
+from ht.boiling_flow import Chen_Bennett, Chen_Edelstein, Lazarek_Black, Li_Wu, Liu_Winterton, Sun_Mishima, Thome, Thome_array, Yun_Heo_Kim, evaporator_march, evaporator_march_methods
 
 
 def test_Lazarek_Black():
@@ -109,6 +112,47 @@ def test_Thome():
         Thome(m=1, x=0.4, D=0.3, rhol=567., rhog=18.09, kl=0.086, kg=0.2, mul=156E-6, mug=1E-5, Cpl=2300., Cpg=1400., sigma=0.02, Hvap=9E5, Psat=1E5, Pc=22E6)
 
 
+def test_Thome_array():
+    kwargs = dict(D=0.3, rhol=567., rhog=18.09, kl=0.086, kg=0.2, mul=156E-6, mug=1E-5, Cpl=2300.0, Cpg=1400.0, sigma=0.02, Hvap=9E5, Psat=1E5, Pc=22E6)
+    xs = np.linspace(0.05, 0.95, 9)
+    hs = Thome_array(m=1.0, x=xs, q=1E5, **kwargs)
+    assert_close1d(hs, [Thome(m=1.0, x=x, q=1E5, **kwargs) for x in xs], rtol=1e-13)
+
+    hs = Thome_array(m=1.0, x=xs, Te=20.0, **kwargs)
+    assert_close1d(hs, [Thome(m=1.0, x=x, Te=20.0, **kwargs) for x in xs], rtol=1e-10)
+
+    # Broadcasting of several inputs, including where the scalar solver fails
+    Tes = np.array([[1.0, 4.9], [20.0, 100.0]])
+    hs = Thome_array(m=np.array([[1.0], [10.0]]), x=0.4, Te=Tes, **kwargs)
+    assert hs.shape == (2, 2)
+    for h, m, Te in zip(hs.ravel(), [1.0, 1.0, 10.0, 10.0], Tes.ravel()):
+        assert_close(h, Thome(m=m, x=0.4, q=h*Te, **kwargs), rtol=1e-10)
+
+    # Warm start from a previous solution
+    hs = Thome_array(m=1.0, x=xs, Te=20.0, **kwargs)
+    hs2 = Thome_array(m=1.0, x=xs, Te=20.0, q0=hs*20.0, **kwargs)
+    assert_close1d(hs2, hs, rtol=1e-10)
+
+    with pytest.raises(ValueError):
+        Thome_array(m=1.0, x=xs, **kwargs)
+    with pytest.raises(ValueError):
+        Thome_array(m=1.0, x=xs, Te=20.0, maxiter=1, **kwargs)
+
+
+def test_secant_array_flat():
+    from ht.boiling_flow import _secant_array
+    # Residual which is the same at both starting points, then has a root
+    def err(x, idx):
+        return np.where(x < 1.5, -1.0, x - 2.0)
+    x = _secant_array(err, np.array([0.5, 0.5]), np.array([1.0, 2.5]))
+    assert_close1d(x, [2.0, 2.0])
+    assert_close1d(err(x, None), [0.0, 0.0])
+
+    # Residual which never changes is not reported as converged
+    with pytest.raises(ValueError):
+        _secant_array(lambda x, idx: np.full(x.shape, -1.0), np.array([0.5]), np.array([1.0]), maxiter=20)
+
+
 def test_Yun_Heo_Kim():
     q = 1E4
     h1 = Yun_Heo_Kim(m=1.0, x=0.4, D=0.3, rhol=567., mul=156E-6, sigma=0.02, Hvap=9E5, q=q)
@@ -143,3 +187,53 @@ def test_Chen_Edelstein():
 def test_Chen_Bennett():
     h = Chen_Bennett(m=0.106, x=0.2, D=0.0212, rhol=567.0, rhog=18.09, mul=156E-6, mug=7.11E-6, kl=0.086, Cpl=2730.0, Hvap=2E5, sigma=0.02, dPsat=1E5, Te=3.0)
     assert_close(h, 4938.275351219369)
+
+
+def test_evaporator_march():
+    kwargs = dict(m=0.05, D=0.02, L=4.0, x_in=0.1, Tsat=300., rhol=567., rhog=18.09,
+                  mul=156E-6, mug=7.11E-6, kl=0.086, Cpl=2730., Hvap=3.3E5, sigma=0.02,
+                  kg=0.02, Cpg=1800., MW=44.1, P=1e6, Pc=4.25e6)
+    # Specified heat flux - quality rises linearly for every correlation
+    for Method in evaporator_march_methods:
+        res = evaporator_march(q=[1E4, 2E4], Method=Method, stations=5, **kwargs)
+        assert res['x'].shape == (2, 5)
+        assert_close1d(res['x_out'], [0.1 + pi*0.02*4*q/(0.05*3.3E5) for q in (1E4, 2E4)])
+        assert_close1d(res['Q'], [pi*0.02*4*q for q in (1E4, 2E4)])
+        assert_close1d(res['h']*res['Te'], [[1E4]*5, [2E4]*5], rtol=1e-9)
+
+    # Heating medium - compare against a fine RK4 integration with the scalar correlation
+    def dx_dz(x):
+        def err(Te):
+            dPsat = 3.3E5*Te/(300.*(1/18.09 - 1/567.))
+            h = Chen_Bennett(m=0.05, x=x, D=0.02, rhol=567., rhog=18.09, mul=156E-6, mug=7.11E-6,
+                             kl=0.086, Cpl=2730., Hvap=3.3E5, sigma=0.02, dPsat=dPsat, Te=Te)
+            return Te*h - 2000.0*(30.0 - Te)
+        Te = brenth(err, 1e-6, 30.0)
+        return pi*0.02*2000.0*(30.0 - Te)/(0.05*3.3E5)
+    x, N = 0.1, 200
+    dz = 4.0/N
+    for _ in range(N):
+        k1 = dx_dz(x)
+        k2 = dx_dz(x + 0.5*dz*k1)
+        k3 = dx_dz(x + 0.5*dz*k2)
+        k4 = dx_dz(x + dz*k3)
+        x += dz/6.0*(k1 + 2*k2 + 2*k3 + k4)
+    res = evaporator_march(T_hot=[310., 330.], h_hot=2000., Method='Chen_Bennett', **kwargs)
+    assert_close(res['x_out'][1], x, rtol=1e-6)
+    assert_close1d(res['z'][0], np.linspace(0, 4, 21))
+    assert_close1d(res['q'], 2000.0*(np.array([[310.], [330.]]) - res['Tw']), rtol=1e-9)
+    assert np.all(np.isnan(res['z_dryout']))
+
+    # Dryout
+    res = evaporator_march(q=[1E4, 1E5], Method='Li_Wu', stations=5, **kwargs)
+    assert_close(res['z_dryout'][1], (0.95 - 0.1)*0.05*3.3E5/(pi*0.02*1E5))
+    assert_close(res['x_out'][1], 0.95)
+    assert np.isnan(res['x'][1, -1])
+    assert np.isnan(res['z_dryout'][0])
+
+    with pytest.raises(ValueError):
+        evaporator_march(Method='Rohsenow', q=1E4, **kwargs)
+    with pytest.raises(ValueError):
+        evaporator_march(Method='Thome', T_hot=330., **kwargs)
+    with pytest.raises(ValueError):
+        evaporator_march(Method='Thome', q=1E4, **dict(kwargs, x_in=0.0))
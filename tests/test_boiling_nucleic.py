@@ -23,6 +23,7 @@ SOFTWARE.
 import pytest
 from fluids.numerics import assert_close, assert_close1d
 
+import ht.boiling_nucleic
 from ht import (
     Bier,
     Cooper,
@@ -32,13 +33,24 @@ from ht import (
     HEDH_Taborek,
     McNelly,
     Montinsky,
+    NucleateBoilingState,
     Rohsenow,
     Serth_HEDH,
     Stephan_Abdelsalam,
     Zuber,
+    boiling_nucleic_CASs,
+    boiling_nucleic_index,
+    cryogenic_flags,
+    h0_Gorenflow_1993,
+    h0_Gorenflow_1993_values,
+    h0_VDI_2e,
+    h0_VDI_2e_values,
     h_nucleic,
+    h_nucleic_curve,
     h_nucleic_methods,
     qmax_boiling,
+    qmax_boiling_array,
+    qmax_boiling_margin,
     qmax_boiling_methods,
 )
 
@@ -196,13 +208,49 @@ def test_Gorenflo():
     h = Gorenflo(3E5, 6137000., q=2E4, h0=3700.0)
     assert_close(h, 2607.771397342676)
 
+    # Fluid index instead of CAS number
+    i = boiling_nucleic_index('64-17-5')
+    assert_close(Gorenflo(P=3E5, Pc=6137000., q=q, CAS_index=i), 3101.133553596696)
+    assert_close(Gorenflo(P=3E5, Pc=22048320., q=q, CAS_index=boiling_nucleic_index('7732-18-5')), 3043.344595525422)
+
     with pytest.raises(Exception):
         # Case with a CAS number not in the database
         Gorenflo(3E5, 6137000., q=2E4, CASRN='6400-17-5')
+    with pytest.raises(Exception):
+        # Case with a CAS number in the tables but without a Gorenflo h0
+        Gorenflo(3E5, 6137000., q=2E4, CASRN='630-08-0')
     with pytest.raises(Exception):
         # Case with neither Te or q provided:
         Gorenflo(3E5, 6137000., CASRN='64-17-5')
 
+    # Values added to the dictionary by users
+    try:
+        h0_Gorenflow_1993['6400-17-5'] = 3700.0
+        h0_Gorenflow_1993['630-08-0'] = 3700.0
+        for CAS in ('6400-17-5', '630-08-0'):
+            assert_close(Gorenflo(3E5, 6137000., q=2E4, CASRN=CAS), 2607.771397342676)
+            assert 'Gorenflo (1993)' in h_nucleic_methods(P=3E5, Pc=6137000., Te=4.0, CAS=CAS)
+            assert_close(h_nucleic(P=3E5, Pc=6137000., q=2E4, CAS=CAS, Method='Gorenflo (1993)'),
+                         2607.771397342676)
+    finally:
+        del h0_Gorenflow_1993['6400-17-5'], h0_Gorenflow_1993['630-08-0']
+
+    # Values changed in the dictionaries
+    h = Gorenflo(3E5, 22048320., q=2E4, CASRN='7732-18-5')
+    try:
+        h0_Gorenflow_1993['7732-18-5'] *= 2.0
+        assert_close(Gorenflo(3E5, 22048320., q=2E4, CASRN='7732-18-5'), 2.0*h)
+    finally:
+        h0_Gorenflow_1993['7732-18-5'] /= 2.0
+    kwargs = dict(Te=4.3, Tsat=373.15, Cpl=4180., kl=0.688, mul=2.79E-4, sigma=0.0588,
+                  Hvap=2.25E6, rhol=958., rhog=0.597)
+    assert 'Stephan-Abdelsalam cryogenic' not in h_nucleic_methods(CAS='64-17-5', **kwargs)
+    try:
+        ht.boiling_nucleic.cryogenics['64-17-5'] = 'ethanol'
+        assert 'Stephan-Abdelsalam cryogenic' in h_nucleic_methods(CAS='64-17-5', **kwargs)
+    finally:
+        del ht.boiling_nucleic.cryogenics['64-17-5']
+
 
 def test_h_nucleic():
     h = h_nucleic(rhol=957.854, rhog=0.595593, mul=2.79E-4, kl=0.680, Cpl=4217, Hvap=2.257E6, sigma=0.0589, Te=4.9, Method='Rohsenow')
@@ -298,3 +346,130 @@ def test_qmax_nucleic():
 
     methods = qmax_boiling_methods(P=310.3E3, Pc=2550E3, D=0.0127, sigma=8.2E-3, Hvap=272E3, rhol=567, rhog=18.09)
     assert len(methods) == 3
+
+
+def test_qmax_boiling_array():
+    import numpy as np
+    Ds = np.array([0.0005, 0.002, 0.0127, 0.0254])
+    sigmas = np.array([8.2E-3, 8.0E-3, 8.4E-3, 8.2E-3])
+    qs = qmax_boiling_array(D=Ds, sigma=sigmas, Hvap=272E3, rhol=567, rhog=18.09)
+    expect = [qmax_boiling(D=D, sigma=sigma, Hvap=272E3, rhol=567, rhog=18.09) for D, sigma in zip(Ds, sigmas)]
+    assert_close1d(qs, expect, rtol=1e-13)
+
+    qs = qmax_boiling_array(D=Ds, sigma=sigmas, Hvap=272E3, rhol=567, rhog=18.09, Method='Zuber')
+    assert_close1d(qs, [Zuber(sigma=sigma, Hvap=272E3, rhol=567, rhog=18.09) for sigma in sigmas], rtol=1e-13)
+
+    Ps = np.array([[1E5, 3E5], [1E6, 2E6]])
+    qs = qmax_boiling_array(P=Ps, Pc=2550E3)
+    assert qs.shape == (2, 2)
+    assert_close1d(qs.ravel(), [HEDH_Montinsky(P, 2550E3) for P in Ps.ravel()], rtol=1e-13)
+
+    with pytest.raises(ValueError):
+        qmax_boiling_array(D=Ds)
+    with pytest.raises(ValueError):
+        qmax_boiling_array(P=Ps, Pc=2550E3, Method='BADMETHOD')
+
+
+def test_qmax_boiling_margin():
+    import numpy as np
+    q = np.array([[5E4, 2E5, 1.5E5], [1E5, 4.5E5, 3E5]])
+    P = np.array([[310.3E3], [1000E3]])
+    qmax, margin, index = qmax_boiling_margin(q=q, P=P, Pc=2550E3)
+    assert qmax.shape == margin.shape == (2, 3)
+    assert index == (1, 1)
+    assert_close(qmax[1, 0], HEDH_Montinsky(1000E3, 2550E3), rtol=1e-13)
+    assert_close1d(margin.ravel(), (1.0 - q/qmax).ravel(), rtol=1e-13)
+    assert margin[index] < 0.0 < margin[0, 1]
+
+    # Scalar CHF against an array of tube heat fluxes
+    qmax, margin, index = qmax_boiling_margin(q=[5E4, 2E5, 1.5E5], D=0.0127,
+                                              sigma=8.2E-3, Hvap=272E3, rhol=567, rhog=18.09)
+    assert_close1d(qmax, [351867.46522901946]*3, rtol=1e-13)
+    assert index == (1,)
+
+
+def test_h_nucleic_curve():
+    kwargs = dict(P=3E5, Pc=22048320., CAS='7732-18-5', MW=18.02, rhol=957.854,
+                  rhog=0.595593, mul=2.79E-4, kl=0.680, Cpl=4217, Hvap=2.257E6,
+                  sigma=0.0589, Tsat=373.)
+    Tes = [1.0, 3.0, 10.0, 30.0, 60.0]
+    curves, qmax = h_nucleic_curve(Te=Tes, truncate=False, **kwargs)
+    assert_close(qmax, qmax_boiling(rhol=957.854, rhog=0.595593, sigma=0.0589, Hvap=2.257E6))
+    assert list(curves.keys()) == h_nucleic_methods(Te=1.0, **kwargs)
+    for method, curve in curves.items():
+        hs = [h_nucleic(Te=Te, Method=method, **kwargs) for Te in Tes]
+        assert_close1d(curve['h'], hs)
+        assert_close1d(curve['q'], [h*Te for h, Te in zip(hs, Tes)])
+        assert_close1d(curve['Te'], Tes)
+
+    # Truncation at the critical heat flux
+    curves, qmax = h_nucleic_curve(Te=Tes, **kwargs)
+    for curve in curves.values():
+        assert (curve['q'] <= qmax).all()
+    assert_close1d(curves['Cooper']['Te'], [1.0, 3.0, 10.0])
+
+    # Heat flux specified
+    qs = [1E4, 1E5, 1E6, 2E6]
+    curves, qmax = h_nucleic_curve(q=qs, Methods='Gorenflo (1993)', CHF_Method='HEDH-Montinsky', **kwargs)
+    assert_close(qmax, HEDH_Montinsky(P=3E5, Pc=22048320.))
+    curve = curves['Gorenflo (1993)']
+    assert_close1d(curve['h'], [Gorenflo(3E5, 22048320., q=q, CASRN='7732-18-5') for q in curve['q']])
+    assert_close1d(curve['Te'], curve['q']/curve['h'])
+
+    with pytest.raises(ValueError):
+        h_nucleic_curve(Tsat=373.)
+    with pytest.raises(ValueError):
+        h_nucleic_curve(Te=Tes, MW=18.02)
+
+
+def test_NucleateBoilingState():
+    kwargs = dict(P=3E5, Pc=22048320., CAS='7732-18-5', MW=18.02, rhol=957.854,
+                  rhog=0.595593, mul=2.79E-4, kl=0.680, Cpl=4217, Hvap=2.257E6,
+                  sigma=0.0589, Tsat=373., dPsat=1E4)
+    methods = h_nucleic_methods(Te=1.0, **kwargs) + ['Stephan-Abdelsalam cryogenic']
+    assert len(methods) == 11
+    for method in methods:
+        state = NucleateBoilingState(Method=method, **kwargs)
+        assert state.Method == method
+        for q in (1E3, 2E4, 5E5):
+            assert_close(state.h_q(q), h_nucleic(q=q, Method=method, **kwargs), rtol=1e-12)
+        for Te in (0.5, 4.0, 25.0):
+            assert_close(state.h_Te(Te), h_nucleic(Te=Te, Method=method, **kwargs), rtol=1e-11)
+        assert_close1d(state.h_q_array([1E3, 2E4]), [state.h_q(1E3), state.h_q(2E4)], rtol=1e-14)
+        assert_close1d(state.h_Te_array([0.5, 4.0]), [state.h_Te(0.5), state.h_Te(4.0)], rtol=1e-14)
+
+    # Gorenflo exponent for a fluid other than water
+    state = NucleateBoilingState(P=3E5, Pc=4.6E6, CAS='74-98-6', Method='Gorenflo (1993)')
+    assert_close(state.h_q(2E4), Gorenflo(P=3E5, Pc=4.6E6, q=2E4, CASRN='74-98-6'), rtol=1e-12)
+    assert_close(state.h_Te(3.0), Gorenflo(P=3E5, Pc=4.6E6, Te=3.0, CASRN='74-98-6'), rtol=1e-12)
+
+    # Default method matches h_nucleic
+    state = NucleateBoilingState(**kwargs)
+    assert state.Method == 'Gorenflo (1993)'
+    assert_close(state.h_q(2E4), h_nucleic(q=2E4, **kwargs))
+    assert not hasattr(state, '__dict__')
+
+    with pytest.raises(ValueError):
+        NucleateBoilingState(Method='BADMETHOD', **kwargs)
+    with pytest.raises(ValueError):
+        NucleateBoilingState(MW=18.02)
+
+
+def test_boiling_nucleic_tables():
+    for table, values in ((h0_Gorenflow_1993, h0_Gorenflow_1993_values), (h0_VDI_2e, h0_VDI_2e_values)):
+        assert len(values) == len(boiling_nucleic_CASs)
+        for CAS, h0 in table.items():
+            assert values[boiling_nucleic_index(CAS)] == h0
+        assert sum(1 for v in values if v != 0.0) == len(table)
+    assert sum(cryogenic_flags) == 13
+    assert cryogenic_flags[boiling_nucleic_index('7440-37-1')]
+    assert boiling_nucleic_index('64-19-7') == -1
+    assert boiling_nucleic_index(None) == -1
+
+    kwargs = dict(rhol=957.854, rhog=0.595593, mul=2.79E-4, kl=0.680, Cpl=4217, Hvap=2.257E6, sigma=0.0589, Te=4.9, P=1e4, Pc=1e6, Tsat=10, MW=33.0)
+    for CAS in ('7732-18-5', '7440-37-1', '630-08-0', '64-19-7'):
+        i = boiling_nucleic_index(CAS)
+        assert h_nucleic_methods(CAS_index=i, **kwargs) == h_nucleic_methods(CAS=CAS, **kwargs)
+        assert_close(h_nucleic(CAS_index=i, **kwargs), h_nucleic(CAS=CAS, **kwargs))
+    assert 'Stephan-Abdelsalam cryogenic' in h_nucleic_methods(CAS='7440-37-1', **kwargs)
+    assert 'Gorenflo (1993)' not in h_nucleic_methods(CAS='630-08-0', **kwargs)
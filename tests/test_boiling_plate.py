@@ -20,9 +20,20 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
-from fluids.numerics import assert_close
-
-from ht import h_boiling_Amalfi, h_boiling_Han_Lee_Kim, h_boiling_Huang_Sheer, h_boiling_Lee_Kang_Kim, h_boiling_Yan_Lin
+import pytest
+from fluids.numerics import assert_close, assert_close1d
+
+from ht import (
+    Nu_plate_Martin,
+    h_boiling_Amalfi,
+    h_boiling_Han_Lee_Kim,
+    h_boiling_Huang_Sheer,
+    h_boiling_Lee_Kang_Kim,
+    h_boiling_Yan_Lin,
+    plate_evaporator,
+    plate_evaporator_methods,
+    temperature_effectiveness_plate,
+)
 
 
 def test_h_boiling_Amalfi():
@@ -58,3 +69,53 @@ def test_h_boiling_Huang_Sheer():
 def test_h_boiling_Yan_Lin():
     h = h_boiling_Yan_Lin(m=3E-5, x=.4, Dh=0.002, rhol=567., rhog=18.09,  kl=0.086, Cpl=2200.0, mul=156E-6, Hvap=9E5, q=1E5, A_channel_flow=0.0003)
     assert_close(h, 318.7228565961241)
+
+
+def test_plate_evaporator():
+    import numpy as np
+    kwargs = dict(m=6E-3, x_in=0.2, Tsat=278.15, T_w_in=285.15, A=0.1, Dh=0.0034,
+                  A_channel_flow=2.2E-4, rhol=1278., rhog=17.1, mul=2.7E-4, mug=1.07E-5,
+                  kl=0.0911, Cpl=1360., Hvap=1.95E5, sigma=0.0107, Cp_w=4195., k_w=0.58,
+                  mu_w=1.3E-3, wavelength=0.007)
+    m_ws = np.array([[0.03, 0.05], [0.02, 0.08]])
+    for Method, h_func in zip(plate_evaporator_methods, (h_boiling_Amalfi, h_boiling_Han_Lee_Kim, h_boiling_Yan_Lin)):
+        for counterflow in (True, False):
+            res = plate_evaporator(m_w=m_ws, Method=Method, counterflow=counterflow, zones=6, **kwargs)
+            assert res['q'].shape == (2, 2, 6)
+            assert res['Q'].shape == (2, 2)
+            # Energy balances
+            assert_close1d(res['Q'].ravel(), (m_ws*4195.*(285.15 - res['T_w_out'])).ravel(), rtol=1e-12)
+            assert_close1d(res['x_out'].ravel(), (0.2 + res['Q']/(6E-3*1.95E5)).ravel(), rtol=1e-12)
+
+            # Each zone satisfies the scalar correlations
+            i, j, k = 1, 0, 4
+            m_w, q, x = m_ws[i, j], res['q'][i, j, k], res['x'][i, j, k]
+            if Method == 'Amalfi':
+                h = h_func(m=6E-3, x=x, Dh=0.0034, rhol=1278., rhog=17.1, mul=2.7E-4, mug=1.07E-5, kl=0.0911,
+                           Hvap=1.95E5, sigma=0.0107, q=q, A_channel_flow=2.2E-4)
+            elif Method == 'Han_Lee_Kim':
+                h = h_func(m=6E-3, x=x, Dh=0.0034, rhol=1278., rhog=17.1, mul=2.7E-4, kl=0.0911, Hvap=1.95E5,
+                           Cpl=1360., q=q, A_channel_flow=2.2E-4, wavelength=0.007)
+            else:
+                h = h_func(m=6E-3, x=x, Dh=0.0034, rhol=1278., rhog=17.1, mul=2.7E-4, kl=0.0911, Hvap=1.95E5,
+                           Cpl=1360., q=q, A_channel_flow=2.2E-4)
+            assert_close(res['h'][i, j, k], h, rtol=1e-11)
+            Nu_w = Nu_plate_Martin(Re=m_w/2.2E-4*0.0034/1.3E-3, Pr=4195.*1.3E-3/0.58, chevron_angle=45.0)
+            assert_close(res['h_w'][i, j], Nu_w*0.58/0.0034, rtol=1e-13)
+            U = 1.0/(1.0/res['h_w'][i, j] + 1.0/h)
+            assert_close(res['U'][i, j, k], U, rtol=1e-9)
+            P1 = temperature_effectiveness_plate(R1=0.0, NTU1=U*0.1/6/(m_w*4195.), Np1=1, Np2=1, counterflow=counterflow)
+            assert_close(q*0.1/6, P1*m_w*4195.*(res['T_w'][i, j, k] - 278.15), rtol=1e-8)
+
+    # Zone count convergence and flow direction
+    Q = plate_evaporator(m_w=0.05, **kwargs)['Q']
+    assert_close(Q, 774.33536463, rtol=1e-8)
+    assert_close(plate_evaporator(m_w=0.05, zones=400, **kwargs)['Q'], Q, rtol=1e-3)
+    assert plate_evaporator(m_w=0.05, counterflow=False, **kwargs)['Q'] > Q
+
+    with pytest.raises(ValueError):
+        plate_evaporator(m_w=0.05, Method='BADMETHOD', **kwargs)
+    with pytest.raises(ValueError):
+        plate_evaporator(m_w=0.05, Method='Han_Lee_Kim', **{k: v for k, v in kwargs.items() if k != 'wavelength'})
+    with pytest.raises(ValueError):
+        plate_evaporator(m_w=0.05, maxiter=2, **kwargs)
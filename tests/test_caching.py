@@ -0,0 +1,161 @@
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2016, 2017 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+from threading import Thread
+
+import pytest
+from fluids.numerics import assert_close
+
+import ht
+import ht.caching
+from ht.caching import cache_info, cached_functions, clear_cache, disable_cache, enable_cache
+
+
+def test_enable_disable_cache():
+    original = ht.DBundle_for_Ntubes_Phadkeb
+    try:
+        enable_cache()
+        assert set(cached_functions()) == set(ht.caching.solver_functions)
+        # Replaced in the package, the defining module, and called internally
+        assert ht.DBundle_for_Ntubes_Phadkeb is ht.hx.DBundle_for_Ntubes_Phadkeb
+        assert ht.DBundle_for_Ntubes_Phadkeb is not original
+
+        for _ in range(3):
+            D = ht.size_bundle_from_tubecount(N=1285, Do=.025, pitch=.03125, Ntp=2)
+        assert_close(D, original(Ntubes=1285, Do=.025, pitch=.03125, Ntp=2))
+        info = cache_info()
+        assert info['size_bundle_from_tubecount'].hits == 2
+        assert info['size_bundle_from_tubecount'].misses == 1
+        assert info['DBundle_for_Ntubes_Phadkeb'].misses == 1
+
+        # nearest_material is used by k_material
+        k = ht.k_material('stainless steel')
+        ht.k_material('stainless steel')
+        assert cache_info('nearest_material')['nearest_material'].hits == 1
+        assert_close(k, 17.0)
+
+        clear_cache('nearest_material')
+        assert cache_info('nearest_material')['nearest_material'].currsize == 0
+        assert cache_info('size_bundle_from_tubecount')['size_bundle_from_tubecount'].currsize == 1
+
+        disable_cache('size_bundle_from_tubecount')
+        assert 'size_bundle_from_tubecount' not in cached_functions()
+    finally:
+        disable_cache()
+    assert cached_functions() == []
+    assert ht.DBundle_for_Ntubes_Phadkeb is original
+    assert ht.hx.DBundle_for_Ntubes_Phadkeb is original
+
+
+def test_cache_maxsize_and_errors():
+    try:
+        enable_cache('Nu_Nusselt_Rayleigh_Holling_Herwig', maxsize=2)
+        for Gr in [1e5, 1e6, 1e7, 1e6]:
+            ht.Nu_Nusselt_Rayleigh_Holling_Herwig(5.54, Gr)
+        info = cache_info('Nu_Nusselt_Rayleigh_Holling_Herwig')['Nu_Nusselt_Rayleigh_Holling_Herwig']
+        assert info.maxsize == 2
+        assert info.currsize == 2
+        assert info.hits == 1
+
+        # Changing the size starts a new cache
+        enable_cache('Nu_Nusselt_Rayleigh_Holling_Herwig', maxsize=8)
+        info = cache_info('Nu_Nusselt_Rayleigh_Holling_Herwig')['Nu_Nusselt_Rayleigh_Holling_Herwig']
+        assert info.maxsize == 8
+        assert info.currsize == 0
+
+        # Unhashable arguments are not cached but still work
+        enable_cache('cylindrical_heat_transfer')
+        ans = ht.cylindrical_heat_transfer(Ti=453.15, To=301.15, hi=1e12, ho=22.697193, Di=0.0779272,
+                                           ts=[0.0054864, .05], ks=[56.045, 0.0598535265])
+        assert_close(ans['Q'], 73.12000884069367)
+        assert cache_info('cylindrical_heat_transfer')['cylindrical_heat_transfer'].currsize == 0
+
+        with pytest.raises(ValueError):
+            enable_cache('not_a_function')
+        with pytest.raises(ValueError):
+            enable_cache('R_value')
+    finally:
+        disable_cache()
+
+
+def test_cache_threads():
+    try:
+        enable_cache('NTU_from_P_E', maxsize=64)
+        results = []
+        def work():
+            for i in range(50):
+                results.append(ht.NTU_from_P_E(.1 + .001*(i % 10), .5, 2))
+        threads = [Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        info = cache_info('NTU_from_P_E')['NTU_from_P_E']
+        assert info.hits + info.misses == 200
+        assert info.currsize == 10
+    finally:
+        disable_cache()
+
+
+@pytest.mark.parametrize('cache_first', [True, False])
+@pytest.mark.parametrize('disable_cache_first', [True, False])
+def test_cache_with_instrumentation(cache_first, disable_cache_first):
+    import ht.instrumentation as instrumentation
+    original = ht.DBundle_for_Ntubes_Phadkeb
+    kwargs = dict(Ntubes=1285, Do=.025, pitch=.03125, Ntp=2)
+    try:
+        instrumentation.reset_instrumentation()
+        if cache_first:
+            enable_cache('DBundle_for_Ntubes_Phadkeb')
+            instrumentation.enable_instrumentation()
+        else:
+            instrumentation.enable_instrumentation()
+            enable_cache('DBundle_for_Ntubes_Phadkeb')
+        for _ in range(3):
+            ht.DBundle_for_Ntubes_Phadkeb(**kwargs)
+        # Cache hits are still counted
+        assert instrumentation.instrumentation_stats()['DBundle_for_Ntubes_Phadkeb']['calls'] == 3
+        assert cache_info('DBundle_for_Ntubes_Phadkeb')['DBundle_for_Ntubes_Phadkeb'].hits == 2
+
+        if disable_cache_first:
+            disable_cache()
+            assert instrumentation.instrumentation_enabled()
+            assert not hasattr(ht.DBundle_for_Ntubes_Phadkeb.__wrapped__, 'cache_info')
+            ht.DBundle_for_Ntubes_Phadkeb(**kwargs)
+            assert instrumentation.instrumentation_stats()['DBundle_for_Ntubes_Phadkeb']['calls'] == 4
+            instrumentation.disable_instrumentation()
+        else:
+            instrumentation.disable_instrumentation()
+            assert hasattr(ht.DBundle_for_Ntubes_Phadkeb, 'cache_info')
+            ht.DBundle_for_Ntubes_Phadkeb(**kwargs)
+            assert cache_info('DBundle_for_Ntubes_Phadkeb')['DBundle_for_Ntubes_Phadkeb'].hits == 3
+            disable_cache()
+    finally:
+        instrumentation.disable_instrumentation()
+        disable_cache()
+        instrumentation.reset_instrumentation()
+    assert ht.DBundle_for_Ntubes_Phadkeb is original
+    assert ht.hx.DBundle_for_Ntubes_Phadkeb is original
+    assert cached_functions() == []
+    ht.DBundle_for_Ntubes_Phadkeb(**kwargs)
+    assert 'DBundle_for_Ntubes_Phadkeb' not in instrumentation.instrumentation_stats()
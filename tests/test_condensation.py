@@ -23,9 +23,21 @@ SOFTWARE.
 from math import pi
 
 from fluids import Prandtl
+import numpy as np
+import pytest
 from fluids.numerics import assert_close, assert_close1d, linspace
-
-from ht import Akers_Deans_Crosser, Boyko_Kruzhilin, Cavallini_Smith_Zecchin, Nusselt_laminar, Shah, h_kinetic
+from scipy.integrate import quad
+
+from ht import (
+    Akers_Deans_Crosser,
+    Boyko_Kruzhilin,
+    Cavallini_Smith_Zecchin,
+    Nusselt_laminar,
+    Shah,
+    condenser_march,
+    condenser_march_methods,
+    h_kinetic,
+)
 
 ### Condensation
 
@@ -84,3 +96,46 @@ def test_Shah():
     #    hsf = hl*(1-x)**0.8
     #    Co = (1/x-1)**0.8*(rhog/rhol)**0.5
     #    return hsf*1.8/Co**0.8
+
+
+def test_condenser_march():
+    props = dict(Tsat=320., Hvap=1.6E5, rhol=1100., rhog=40., mul=1.6E-4, mug=1.2e-5, kl=0.075, Cpl=1500., P=1.6E6, Pc=4E6)
+    ms = [0.01, 0.02, 0.1]
+    funcs = {'Shah': lambda m, x: Shah(m=m, x=x, D=0.02, rhol=1100., mul=1.6E-4, kl=0.075, Cpl=1500., P=1.6E6, Pc=4E6),
+             'Cavallini_Smith_Zecchin': lambda m, x: Cavallini_Smith_Zecchin(m=m, x=x, D=0.02, rhol=1100., rhog=40., mul=1.6E-4, mug=1.2e-5, kl=0.075, Cpl=1500.),
+             'Boyko_Kruzhilin': lambda m, x: Boyko_Kruzhilin(m=m, rhog=40., rhol=1100., kl=0.075, mul=1.6E-4, Cpl=1500., D=0.02, x=x),
+             'Akers_Deans_Crosser': lambda m, x: Akers_Deans_Crosser(m=m, rhog=40., rhol=1100., kl=0.075, mul=1.6E-4, Cpl=1500., D=0.02, x=x)}
+    assert sorted(funcs) == sorted(condenser_march_methods)
+    for counterflow in (True, False):
+        for Method, h in funcs.items():
+            res = condenser_march(m=ms, D=0.02, Tc_in=300., h_c=3000., mc=0.2, Cpc=4180.,
+                                  Method=Method, counterflow=counterflow, **props)
+            for i, m in enumerate(ms):
+                def dz_dx(x):
+                    x_c = x if counterflow else 1.0 - x
+                    Tc = 300.0 + m*1.6E5*x_c/(0.2*4180.)
+                    return m*1.6E5/(pi*0.02/(1/h(m, x) + 1/3000.)*(320.0 - Tc))
+                points = None
+                if Method == 'Akers_Deans_Crosser':
+                    points = [(5E4*1.6E-4/(0.02*m/(pi/4*0.02**2)) - 1)/((1100/40.)**0.5 - 1)]
+                L = quad(dz_dx, 0.0, 1.0, epsabs=0, epsrel=1e-11, points=points, limit=200)[0]
+                assert_close(res['L'][i], L, rtol=1e-8)
+                assert_close(res['h'][i, 10], h(m, 0.5))
+            assert_close1d(res['Q'], [m*1.6E5 for m in ms])
+            assert_close1d(res['A'], pi*0.02*res['L'])
+            assert_close1d(res['Tc_out'], [300.0 + m*1.6E5/(0.2*4180.) for m in ms])
+            assert_close1d(res['x'], linspace(1, 0, 21))
+            assert np.all(np.diff(res['z'], axis=1) > 0)
+            assert_close1d(res['q'].ravel(), (res['U']*(320.0 - res['Tc'])).ravel())
+
+    # Isothermal coolant, partial condensation and broadcasting
+    res = condenser_march(m=0.02, D=[0.015, 0.02], Tc_in=[[290.], [300.]], h_c=3000., x_in=0.9,
+                          x_out=0.2, stations=5, **props)
+    assert res['z'].shape == (2, 2, 5)
+    assert_close1d(res['Tc'][1, 0], [300.0]*5)
+    assert_close1d(res['Q'].ravel(), [0.02*1.6E5*0.7]*4)
+
+    with pytest.raises(ValueError):
+        condenser_march(m=ms, D=0.02, Tc_in=300., h_c=3000., mc=0.01, Cpc=4180., **props)
+    with pytest.raises(ValueError):
+        condenser_march(m=ms, D=0.02, Tc_in=300., h_c=3000., Method='Nusselt_laminar', **props)
@@ -20,13 +20,16 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
+from math import log, pi
+
 import pytest
-from fluids.numerics import assert_close, assert_close1d
+from fluids.numerics import assert_close, assert_close1d, assert_close2d
 
 from ht import (
     ASHRAE,
     ASHRAE_k,
     Cp_material,
+    Cp_material_array,
     R_cylinder,
     R_to_k,
     R_value_to_k,
@@ -37,16 +40,27 @@ from ht import (
     S_isothermal_pipe_to_two_planes,
     S_isothermal_sphere_to_plane,
     building_materials,
+    buried_pipe_network,
     cylindrical_heat_transfer,
+    cylindrical_heat_transfer_array,
+    economic_insulation_thickness,
     k_material,
+    k_material_array,
     k_to_R,
     k_to_R_value,
     k_to_thermal_resistivity,
+    material_IDs,
+    material_index,
     materials_dict,
     nearest_material,
+    nearest_materials,
+    refractories,
     refractory_VDI_Cp,
+    refractory_VDI_Cp_array,
     refractory_VDI_k,
+    refractory_VDI_k_array,
     rho_material,
+    rho_material_array,
     thermal_resistivity_to_k,
 )
 
@@ -96,6 +110,73 @@ def test_cylindrical_heat_transfer():
             assert_close1d(v, data[k])
 
 
+def test_cylindrical_heat_transfer_array():
+    import numpy as np
+    rng = np.random.RandomState(0)
+    N = 200
+    counts = rng.randint(0, 5, N)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    ts = rng.uniform(0.001, 0.1, offsets[-1])
+    ks = rng.uniform(0.02, 60.0, offsets[-1])
+    Ti = rng.uniform(300.0, 800.0, N)
+    hi = rng.uniform(100.0, 1e4, N)
+    ho = rng.uniform(5.0, 50.0, N)
+    Di = rng.uniform(0.01, 1.0, N)
+    cylinders, layers = cylindrical_heat_transfer_array(Ti, 290.0, hi, ho, Di, offsets, ts, ks)
+    assert cylinders.shape == (N,)
+    assert layers.shape == ts.shape
+    for i in range(N):
+        s = slice(offsets[i], offsets[i+1])
+        ans = cylindrical_heat_transfer(Ti[i], 290.0, hi[i], ho[i], Di[i], ts[s].tolist(), ks[s].tolist())
+        for key in ('Q', 'q', 'UA', 'U_inner', 'U_outer'):
+            assert_close(cylinders[key][i], ans[key], rtol=1e-13)
+        assert_close1d(layers['R'][s], ans['Rs'], rtol=1e-13)
+        assert_close1d(layers['T'][s], ans['Ts'][1:], rtol=1e-13)
+
+    with pytest.raises(ValueError):
+        cylindrical_heat_transfer_array(400.0, 300.0, 1e3, 10.0, 0.1, [0, 2], [0.01], [1.0])
+    with pytest.raises(ValueError):
+        cylindrical_heat_transfer_array(400.0, 300.0, 1e3, 10.0, 0.1, [0, 2, 1, 2], [0.01, 0.1], [1.0, 1.0])
+
+
+def test_buried_pipe_network():
+    import numpy as np
+    # A single pipe is the pipe to plane shape factor
+    ans = buried_pipe_network(T=[350.0], T_ground=280.0, k=1.2, x=[0.0], Z=[1.5], D=[0.3], L=10.0)
+    assert_close(ans['Q'][0], S_isothermal_pipe_to_plane(0.3, 1.5, 10.0)*1.2*70.0)
+
+    # Two pipes, solved by hand with the mutual resistance of line sources and their images
+    k, R_pipe = 1.5, 0.6
+    R_self = 1.0/(k*S_isothermal_pipe_to_plane(0.2, 1.0)) + R_pipe
+    R_mutual = log((0.4**2 + 2.0**2)**0.5/0.4)/(2.0*pi*k)
+    dT1, dT2 = 80.0, 40.0
+    det = R_self**2 - R_mutual**2
+    q1, q2 = (R_self*dT1 - R_mutual*dT2)/det, (R_self*dT2 - R_mutual*dT1)/det
+    ans = buried_pipe_network(T=[363.15, 323.15], T_ground=283.15, k=k, x=[0.0, 0.4],
+                              Z=[1.0, 1.0], D=[0.2, 0.2], R_pipes=R_pipe, L=100.0)
+    assert_close1d(ans['q'], [q1, q2])
+    assert_close1d(ans['Ts'], [363.15 - R_pipe*q1, 323.15 - R_pipe*q2])
+
+    # Many pipes; symmetric matrix, several operating cases at once
+    N = 200
+    x = np.repeat(np.arange(N//2)*1.0, 2)
+    Z = np.tile([0.8, 1.3], N//2)
+    D = np.full(N, 0.15)
+    T = np.stack([np.tile([363.15, 318.15], N//2), np.tile([343.15, 313.15], N//2)], axis=1)
+    ans = buried_pipe_network(T=T, T_ground=[283.15, 278.15], k=1.0, x=x, Z=Z, D=D, R_pipes=0.8)
+    assert ans['q'].shape == (N, 2)
+    assert_close2d(ans['R'], ans['R'].T)
+    assert_close1d(ans['R'] @ ans['q'][:, 1], T[:, 1] - 278.15)
+    # Neighbours heat each other, so pipes lose less than if alone
+    alone = (T[:, 0] - 283.15)/(np.diag(ans['R']))
+    assert np.all(ans['q'][:, 0] < alone)
+
+    with pytest.raises(ValueError):
+        buried_pipe_network(T=[350.0, 340.0], T_ground=280.0, k=1.2, x=[0.0, 0.1], Z=[1.0, 1.0], D=[0.3, 0.3])
+    with pytest.raises(ValueError):
+        buried_pipe_network(T=[350.0], T_ground=280.0, k=1.2, x=[0.0], Z=[0.1], D=[0.3])
+
+
 def test_insulation():
     rho_tot = sum([i[0] for i in building_materials.values()])
     k_tot = sum([i[1] for i in building_materials.values()])
@@ -159,3 +240,133 @@ def test_insulation_fuzz():
 
     assert nearest_material('stainless steel', complete=True) == 'Metals, stainless steel'
 
+
+
+def test_nearest_material_difflib():
+    import difflib
+    def difflib_nearest(name, complete=False):
+        hits = difflib.get_close_matches(name, materials_dict.keys(), n=1000, cutoff=0)
+        if not complete:
+            return hits[0]
+        for hit in hits:
+            if materials_dict[hit] == 1 or materials_dict[hit]==3 or (ASHRAE[hit][0] and ASHRAE[hit][1]):
+                return hit
+
+    names = ['stainless steel', 'stainless wood', 'graphite', 'brick', 'glass wool', 'oak', 'x', '',
+             'Concrete', 'mineral wool 100 kg/m^3', 'Insulating board', 'pine wood', 'fired clay brik',
+             'Cellular glass', 'Gypsum', 'polyurethane foam', 'Carbon']
+    for name in names:
+        for complete in (False, True):
+            assert nearest_material(name, complete=complete) == difflib_nearest(name, complete)
+    assert nearest_material('Mineral fiber') == 'Mineral fiber'
+
+    assert nearest_materials(names) == [nearest_material(name) for name in names]
+    assert nearest_materials(names, complete=True) == [nearest_material(name, complete=True) for name in names]
+    assert nearest_materials([]) == []
+
+    # Materials added after a search are found
+    nearest_material('Zorbium foam')
+    try:
+        building_materials['Zorbium foam'] = [30.0, 0.03, 1400.0]
+        materials_dict['Zorbium foam'] = 3
+        assert nearest_material('Zorbium foam') == 'Zorbium foam'
+        assert nearest_material('zorbium foam', complete=True) == 'Zorbium foam'
+        assert nearest_materials(['zorbium foam']) == ['Zorbium foam']
+    finally:
+        del building_materials['Zorbium foam'], materials_dict['Zorbium foam']
+    assert nearest_material('Zorbium foam') != 'Zorbium foam'
+
+
+def test_material_arrays():
+    import numpy as np
+    IDs = np.arange(len(material_IDs))
+    for T in (250.0, 298.15, 800.0, 2000.0):
+        ks = k_material_array(IDs, T)
+        Cps = Cp_material_array(IDs, T)
+        for i, ID in enumerate(material_IDs):
+            try:
+                assert_close(ks[i], k_material(ID, T), rtol=1e-13)
+            except Exception:
+                assert np.isnan(ks[i])
+            try:
+                assert_close(Cps[i], Cp_material(ID, T), rtol=1e-13)
+            except Exception:
+                assert np.isnan(Cps[i])
+    rhos = rho_material_array(IDs)
+    for i, ID in enumerate(material_IDs):
+        try:
+            assert_close(rhos[i], rho_material(ID), rtol=1e-13)
+        except Exception:
+            assert np.isnan(rhos[i])
+
+    assert material_index('Mineral fiber') == 88
+    assert material_IDs[material_index('stainless steel')] == 'Metals, stainless steel'
+
+    # Broadcasting of IDs against temperatures
+    i = material_index('Fused silica')
+    Ts = np.array([[300.0, 600.0], [900.0, 1200.0]])
+    assert_close1d(k_material_array(i, Ts).ravel(), [refractory_VDI_k('Fused silica', T) for T in Ts.ravel()])
+    assert k_material_array([i, 0], Ts).shape == (2, 2)
+
+    # Float indexes are accepted, and negative ones are not a material
+    assert_close1d(rho_material_array(np.array([34.0])), rho_material_array([34]))
+    for func in (k_material_array, Cp_material_array):
+        ans = func([-1, i], 300.0)
+        assert np.isnan(ans[0]) and not np.isnan(ans[1])
+    assert np.isnan(rho_material_array([-1]))[0]
+
+
+def test_refractory_VDI_arrays():
+    import numpy as np
+    names = list(refractories.keys())
+    Ts = np.linspace(500.0, 1600.0, 23)
+    for name in names:
+        assert_close1d(refractory_VDI_k_array(name, Ts), [refractory_VDI_k(name, T) for T in Ts], rtol=1e-13)
+        assert_close1d(refractory_VDI_Cp_array(name, Ts), [refractory_VDI_Cp(name, T) for T in Ts], rtol=1e-13)
+
+    # Names and indexes together with temperatures, broadcast
+    IDs = [material_index(name) for name in names]
+    ks = refractory_VDI_k_array(np.array(IDs)[:, None], Ts)
+    assert ks.shape == (len(names), len(Ts))
+    assert_close1d(ks[3], refractory_VDI_k_array(names[3], Ts), rtol=1e-15)
+    assert_close1d(refractory_VDI_k_array(names), [refractory_VDI_k(name) for name in names])
+    assert_close1d(refractory_VDI_Cp_array(IDs), [refractory_VDI_Cp(name) for name in names])
+
+    with pytest.raises(KeyError):
+        refractory_VDI_k_array(['Silica', 'Mineral fiber'], 1000.0)
+
+
+def test_economic_insulation_thickness():
+    import numpy as np
+    materials = ['Mineral fiber', 'Cellular glass', 'Expanded polystyrene, molded beads']
+    costs = [1500.0, 2500.0, 900.0]
+    Ti = np.array([[350.0, 400.0, 500.0]])
+    Di = np.array([[0.025], [0.1], [0.5]])
+    ans = economic_insulation_thickness(Ti=Ti, To=293.15, Di=Di, materials=materials,
+                                        cost_insulation=costs, cost_energy=1E-8, ho=10.0,
+                                        t_wall=0.004, k_wall=45.0, xtol=1E-8)
+    assert ans['thickness'].shape == (3, 3)
+    assert ans['costs'].shape == (3, 3, 3)
+    for i in range(3):
+        for j in range(3):
+            ts = np.linspace(0.005, 0.3, 101)
+            best_cost = np.inf
+            for m, material in enumerate(materials):
+                k = k_material(material, 0.5*(Ti[0, j] + 293.15))
+                Q = [cylindrical_heat_transfer(Ti[0, j], 293.15, 1E12, 10.0, Di[i, 0], [0.004, t], [45.0, k])['Q'] for t in ts]
+                cost = 1E-8*31536000.0*np.array(Q) + 0.1*costs[m]*np.pi*ts*(Di[i, 0] + 0.008 + ts)
+                assert ans['costs'][i, j, m] <= cost.min()*(1 + 1E-12)
+                best_cost = min(best_cost, cost.min())
+            t = ans['thickness'][i, j]
+            m = ans['material'][i, j]
+            assert ans['ID'][i, j] == materials[m]
+            assert_close(ans['cost'][i, j], ans['costs'][i, j].min())
+            assert_close(ans['cost'][i, j], best_cost, rtol=1E-3)
+            k = k_material(materials[m], 0.5*(Ti[0, j] + 293.15))
+            assert_close(ans['Q'][i, j], cylindrical_heat_transfer(Ti[0, j], 293.15, 1E12, 10.0, Di[i, 0], [0.004, t], [45.0, k])['Q'], rtol=1E-6)
+
+    # Indexes of materials are accepted as well as names
+    ans2 = economic_insulation_thickness(Ti=Ti, To=293.15, Di=Di, materials=[material_index(m) for m in materials],
+                                         cost_insulation=costs, cost_energy=1E-8, ho=10.0,
+                                         t_wall=0.004, k_wall=45.0, xtol=1E-8)
+    assert_close2d(ans2['thickness'], ans['thickness'])
@@ -20,7 +20,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
-from fluids.numerics import assert_close, assert_close1d
+from fluids.numerics import assert_close, assert_close1d, assert_close2d
 from fluids.numerics import numpy as np
 
 from ht import (
@@ -31,7 +31,11 @@ from ht import (
     Rac_Nusselt_Rayleigh,
     Rac_Nusselt_Rayleigh_disk,
 )
-from ht.conv_free_enclosed import Nu_Nusselt_Rayleigh_Holling_Herwig
+from ht.conv_free_enclosed import (
+    Holling_Herwig_Ra_max,
+    Nu_Nusselt_Rayleigh_Holling_Herwig,
+    Nu_Nusselt_Rayleigh_Holling_Herwig_array,
+)
 
 try:
     from scipy.interpolate import UnivariateSpline, bisplrep
@@ -49,6 +53,43 @@ def test_Nu_Nusselt_Rayleigh_Holling_Herwig():
     assert 1 == Nu_Nusselt_Rayleigh_Holling_Herwig(1., 100., buoyancy=False)
 
 
+def test_Nu_Nusselt_Rayleigh_Holling_Herwig_fit():
+    from math import log
+    from fluids.numerics import secant
+    from ht.conv_free_enclosed import Nu_Nusselt_Rayleigh_Holling_Herwig_err
+    def solved(Ra):
+        Ra_third = Ra**(1.0/3.0)
+        D2 = 2.0*(-14.94*Ra**-0.25 + 3.43)
+        Nu_guess = Ra_third*(0.1/2.0*log(.078/16.0*Ra**1.323) + D2)**(-4.0/3.0)
+        return secant(Nu_Nusselt_Rayleigh_Holling_Herwig_err, Nu_guess, args=(Ra, Ra_third, D2), xtol=1e-15)
+
+    # Both sides of every segment boundary and the ends of the fit
+    Ras = [1708.0, 1708.1, 9999.999, 1E4, 1E4*1.0000001, 1E6, 1E6*1.0000001, 1E9, 1E9*1.0000001, 1E15]
+    Ras += [10.0**(i/7.) for i in range(23, 106)]
+    for Ra in Ras:
+        assert_close(Nu_Nusselt_Rayleigh_Holling_Herwig(1.0, Ra), solved(Ra), rtol=2e-14)
+    # Solved outside the fit
+    assert_close(Nu_Nusselt_Rayleigh_Holling_Herwig(1.0, 1E16), solved(1E16), rtol=1e-13)
+
+
+def test_Nu_Nusselt_Rayleigh_Holling_Herwig_array():
+    Prs = np.array([[0.7], [5.54]])
+    Grs = np.array([100.0, 1E4, 3.21e8, 1E13, 1E16])
+    Nus = Nu_Nusselt_Rayleigh_Holling_Herwig_array(Prs, Grs)
+    assert Nus.shape == (2, 5)
+    expect = [[Nu_Nusselt_Rayleigh_Holling_Herwig(Pr, Gr) for Gr in Grs] for Pr in Prs[:, 0]]
+    assert_close2d(Nus, expect, rtol=1e-14)
+    assert_close(Nus[1, 2], 77.5465680189692)
+
+    assert_close1d(Nu_Nusselt_Rayleigh_Holling_Herwig_array(Prs, Grs, buoyancy=False).ravel(), [1.0]*10)
+    assert Nu_Nusselt_Rayleigh_Holling_Herwig_array(1.0, 1E7).shape == ()
+
+    # Ends and joints of the fits
+    Ras = [1708.0, 1E4, 1E6, 1E9, Holling_Herwig_Ra_max, np.nextafter(Holling_Herwig_Ra_max, 2E15)]
+    assert_close1d(Nu_Nusselt_Rayleigh_Holling_Herwig_array(1.0, Ras),
+                   [Nu_Nusselt_Rayleigh_Holling_Herwig(1.0, Ra) for Ra in Ras], rtol=1e-14)
+
+
 def test_Nu_Nusselt_Rayleigh_Probert():
     Nu =  Nu_Nusselt_Rayleigh_Probert(5.54, 3.21e8, buoyancy=True)
     assert_close(Nu, 111.46181048289132)
@@ -20,8 +20,11 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
+from math import log
+
 import pytest
 from fluids.numerics import assert_close, assert_close1d, assert_close2d, logspace
+from fluids.numerics import numpy as np
 
 from ht import (
     Nu_coil_Xin_Ebadian,
@@ -52,6 +55,7 @@ from ht import (
     Nu_vertical_cylinder_Touloukian_Morgan,
     Nu_vertical_helical_coil_Prabhanjan_Rennie_Raghavan,
     Nu_vertical_plate_Churchill,
+    cylinder_surface_temperature,
 )
 
 ### Free convection immersed
@@ -235,3 +239,71 @@ def test_Nu_coil_Xin_Ebadian():
 def test_Nu_vertical_helical_coil_Prabhanjan_Rennie_Raghavan():
     Nu = Nu_vertical_helical_coil_Prabhanjan_Rennie_Raghavan(4.4, 1E11)
     assert_close(Nu, 720.6211067718227)
+
+
+def test_cylinder_surface_temperature():
+    from math import pi
+
+    from fluids.constants import g
+    from fluids.numerics import brenth
+
+    from ht import cylindrical_heat_transfer, q_rad
+    air = dict(k=0.0263, rho=1.177, mu=1.85E-5, Cp=1007.)
+    Pr = 1007.*1.85E-5/0.0263
+    nu = 1.85E-5/1.177
+
+    def scalar(T_in, T_inf, Di, ts, ks, emissivity, hi=None, T_surr=None, horizontal=True, L=1.0):
+        T_surr = T_inf if T_surr is None else T_surr
+        Do = Di + 2.0*sum(ts)
+        R = sum(log((Di + 2.0*sum(ts[:i+1]))/(Di + 2.0*sum(ts[:i])))/(2.0*pi*ks[i]) for i in range(len(ts)))
+        if hi is not None:
+            R += 1.0/(pi*Di*hi)
+        Lc = Do if horizontal else L
+        def h_conv(Ts):
+            Gr = g*2.0/(Ts + T_inf)*abs(Ts - T_inf)*Lc**3/nu**2
+            if horizontal:
+                return Nu_horizontal_cylinder(Pr, Gr, Method='Churchill-Chu')*0.0263/Lc
+            return Nu_free_vertical_plate(Pr, Gr)*0.0263/Lc
+        def err(Ts):
+            return (T_in - Ts)/R - pi*Do*(h_conv(Ts)*(Ts - T_inf) + q_rad(emissivity, Ts, T_surr))
+        Ts = brenth(err, min(T_in, T_inf, T_surr), max(T_in, T_inf, T_surr), xtol=1e-13)
+        return Ts, h_conv(Ts)
+
+    T_ins = np.array([450.0, 350.0, 250.0, 600.0])
+    Dis = np.array([0.1, 0.05, 0.3, 1.5])
+    t_insulation = np.array([0.05, 0.0, 0.1, 0.02])
+    emissivities = np.array([0.3, 0.8, 0.9, 0.1])
+    for horizontal in (True, False):
+        res = cylinder_surface_temperature(T_in=T_ins, T_inf=293.15, Di=Dis, ts=[0.008, t_insulation],
+                                           ks=[45.0, 0.04], emissivity=emissivities, hi=1000.0,
+                                           horizontal=horizontal, L=3.0, **air)
+        assert res['converged'].all()
+        assert res['iterations'].max() < 10
+        for i in range(4):
+            Ts, h_conv = scalar(T_ins[i], 293.15, Dis[i], [0.008, t_insulation[i]], [45.0, 0.04],
+                                emissivities[i], hi=1000.0, horizontal=horizontal, L=3.0)
+            assert_close(res['Ts'][i], Ts, rtol=1e-11)
+            assert_close(res['h_conv'][i], h_conv, rtol=1e-9)
+            # Agrees with the conduction calculation at the combined outer coefficient
+            cond = cylindrical_heat_transfer(Ti=T_ins[i], To=293.15, hi=1000.0, ho=h_conv + res['h_rad'][i],
+                                             Di=Dis[i], ts=[0.008, t_insulation[i]], ks=[45.0, 0.04])
+            assert_close(res['q'][i], cond['q'], rtol=1e-8)
+            assert_close(res['Q'][i], cond['Q']*3.0, rtol=1e-8)
+
+    # Radiation to different surroundings, broadcast over a grid, and a bare surface
+    res = cylinder_surface_temperature(T_in=np.array([[400.0], [500.0]]), T_inf=293.15, Di=0.2, ts=[],
+                                       ks=[], emissivity=0.9, hi=[50.0, 500.0], T_surroundings=270.0, **air)
+    assert res['Ts'].shape == (2, 2)
+    Ts, _ = scalar(500.0, 293.15, 0.2, [], [], 0.9, hi=50.0, T_surr=270.0)
+    assert_close(res['Ts'][1, 0], Ts, rtol=1e-11)
+
+    # No driving force, and no resistance
+    res = cylinder_surface_temperature(T_in=293.15, T_inf=293.15, Di=0.1, ts=[0.01], ks=[0.04],
+                                       emissivity=0.5, **air)
+    assert res['Ts'] == 293.15 and res['q'] == 0.0 and res['converged']
+    res = cylinder_surface_temperature(T_in=400.0, T_inf=293.15, Di=0.1, ts=[], ks=[], emissivity=0.5, **air)
+    assert_close(res['Ts'], 400.0, rtol=1e-13)
+
+    res = cylinder_surface_temperature(T_in=T_ins, T_inf=293.15, Di=Dis, ts=[0.008, t_insulation],
+                                       ks=[45.0, 0.04], emissivity=emissivities, maxiter=1, **air)
+    assert not res['converged'].all()
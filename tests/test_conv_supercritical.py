@@ -20,6 +20,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
+import pytest
 from fluids.numerics import assert_close, assert_close1d
 
 from ht import (
@@ -41,6 +42,8 @@ from ht import (
     Nu_Xu,
     Nu_Yamagata,
     Nu_Zhu,
+    supercritical_channel,
+    supercritical_channel_methods,
 )
 
 
@@ -174,3 +177,80 @@ def test_Nu_Krasnoshchekov():
 
     Nu = Nu_Krasnoshchekov(1E5, 1.2)
     assert_close(Nu, 234.82855185610364)
+
+
+def test_supercritical_channel():
+    import numpy as np
+    def props(T):
+        Cp = 5000.0 + 40000.0/(1.0 + ((T - 650.0)/10.0)**2)
+        H = 1.2E6 + 5000.0*(T - 550.0) + 4E5*np.arctan((T - 650.0)/10.0)
+        rho = 450.0 - 300.0*np.tanh((T - 650.0)/15.0)
+        return H, rho, 6E-5*rho/450.0, 0.1 + 0.3*rho/750.0, Cp
+    Ts = np.linspace(550.0, 800.0, 2001)
+    table = (Ts,) + props(Ts)
+    m, D, L, H_in = 0.2, 0.01, 4.0, 1.0E6
+    qs = np.linspace(1.0E6, 2.0E6, 50)
+
+    for Method in supercritical_channel_methods:
+        ans = supercritical_channel(m=m, D=D, L=L, q=qs, H_in=H_in, properties=props,
+                                    T_pc=650.0, Method=Method, nodes=50)
+        assert ans['converged'].all()
+        # Heat flux is met at every node
+        assert_close1d(ans['h']*(ans['T_w'] - ans['T_b']), qs, rtol=1E-6)
+        assert_close1d(props(ans['T_b'])[0], ans['H_b'], rtol=1E-10)
+        assert_close(ans['H_out'], H_in + np.sum(qs)*L/50*np.pi*D/m)
+
+    # Recompute one correlation node by node
+    ans = supercritical_channel(m=m, D=D, L=L, q=1.5E6, H_in=H_in, properties=props,
+                                T_pc=650.0, Method='Jackson', nodes=20)
+    G = m/(0.25*np.pi*D*D)
+    for T_b, T_w, h in zip(ans['T_b'], ans['T_w'], ans['h']):
+        H_b, rho_b, mu_b, k_b, Cp_b = props(T_b)
+        H_w, rho_w, _, _, _ = props(T_w)
+        Nu = Nu_Jackson(G*D/mu_b, Cp_b*mu_b/k_b, rho_w=rho_w, rho_b=rho_b,
+                        Cp_avg=(H_w - H_b)/(T_w - T_b), Cp_b=Cp_b, T_b=T_b, T_w=T_w, T_pc=650.0)
+        assert_close(h, Nu*k_b/D, rtol=1E-9)
+
+    # Tabulated properties give nearly the same profile
+    ans_table = supercritical_channel(m=m, D=D, L=L, q=1.5E6, H_in=H_in, properties=table,
+                                      Method='Jackson', nodes=20)
+    assert_close1d(ans_table['T_w'], ans['T_w'], rtol=1E-4)
+
+    # Property function without a pseudocritical temperature to start from
+    ans_no_pc = supercritical_channel(m=m, D=D, L=L, q=1.5E6, H_in=H_in, properties=props,
+                                      Method='McAdams', nodes=20)
+    assert ans_no_pc['converged'].all()
+    assert np.all(np.diff(ans_no_pc['T_b']) > 0.0)
+    assert_close1d(props(ans_no_pc['T_b'])[0], ans_no_pc['H_b'], rtol=1E-10)
+    assert_close1d(ans_no_pc['T_b'], ans['T_b'], rtol=1E-9)
+
+    # Bulk solve which runs out of iterations is reported
+    ans_short = supercritical_channel(m=m, D=D, L=L, q=1.5E6, H_in=H_in, properties=props,
+                                      Method='McAdams', nodes=20, maxiter=3)
+    assert not ans_short['converged'].any()
+
+    # Wall temperatures past the end of the table are reported
+    short_table = tuple(v[Ts <= 700.0] for v in table)
+    ans_short = supercritical_channel(m=m, D=D, L=L, q=1.5E6, H_in=H_in, properties=short_table,
+                                      Method='Jackson', nodes=20)
+    assert not ans_short['converged'][-1]
+    assert ans_short['converged'][0]
+
+    # The correlations may be wrapped by instrumentation or caching
+    import ht.caching
+    import ht.instrumentation
+    try:
+        ht.instrumentation.reset_instrumentation()
+        ht.instrumentation.enable_instrumentation()
+        ht.caching.enable_cache(['Nu_Jackson'])
+        ans_wrapped = supercritical_channel(m=m, D=D, L=L, q=1.5E6, H_in=H_in, properties=table,
+                                            Method='Jackson', nodes=20)
+        assert ht.instrumentation.instrumentation_stats()['Nu_Jackson']['calls'] > 20
+    finally:
+        ht.caching.disable_cache()
+        ht.instrumentation.disable_instrumentation()
+        ht.instrumentation.reset_instrumentation()
+    assert_close1d(ans_wrapped['T_w'], ans_table['T_w'], rtol=1E-13)
+
+    with pytest.raises(ValueError):
+        supercritical_channel(m=m, D=D, L=L, q=1.5E6, H_in=H_in, properties=table, Method='BADMETHOD')
@@ -35,6 +35,8 @@ from ht import (
     DBundle_for_Ntubes_Phadkeb,
     DBundle_min,
     F_LMTD_Fakheri,
+    F_LMTD_Fakheri_array,
+    D_baffle_holes,
     L_unsupported_max,
     NTU_from_effectiveness,
     NTU_from_P_basic,
@@ -49,9 +51,12 @@ from ht import (
     Ntubes_Phadkeb,
     Ntubes_VDI,
     P_NTU_method,
+    baffle_thickness,
+    check_mechanical_TEMA,
     effectiveness_from_NTU,
     effectiveness_NTU_method,
     shell_clearance,
+    shells_min_Fakheri,
     size_bundle_from_tubecount,
     temperature_effectiveness_air_cooler,
     temperature_effectiveness_basic,
@@ -530,6 +535,46 @@ def test_F_LMTD_Fakheri():
         assert_close(F_expect, F_calc)
 
 
+def test_F_LMTD_Fakheri_array():
+    Fs = F_LMTD_Fakheri_array(Thi=[130, 130, 130], Tho=[110, 110, 110.06100082712986],
+                              Tci=[15, 15, 15], Tco=[85, 35, 85], shells=[1, 1, 3])
+    assert_close1d(Fs, [F_LMTD_Fakheri(Thi=130, Tho=110, Tci=15, Tco=85, shells=1),
+                        F_LMTD_Fakheri(Thi=130, Tho=110, Tci=15, Tco=35, shells=1),
+                        F_LMTD_Fakheri(Thi=130, Tho=110.06100082712986, Tci=15, Tco=85, shells=3)])
+    assert Fs.shape == (3,)
+
+    # Scalar shells broadcast against temperature arrays
+    Fs = F_LMTD_Fakheri_array(Thi=130.0, Tho=[110, 100, 90], Tci=15.0, Tco=85.0, shells=2)
+    assert_close1d(Fs, [F_LMTD_Fakheri(130.0, Tho, 15.0, 85.0, 2) for Tho in [110, 100, 90]])
+
+
+def test_shells_min_Fakheri():
+    assert 2 == shells_min_Fakheri(Thi=130, Tho=60, Tci=15, Tco=85, Ft_min=0.8)
+    assert 1 == shells_min_Fakheri(Thi=130, Tho=110, Tci=15, Tco=85, Ft_min=0.9)
+    assert 3 == shells_min_Fakheri(Thi=130, Tho=110, Tci=15, Tco=85, Ft_min=0.99)
+
+    # Compare against trial and error
+    for _ in range(200):
+        Tci, Thi = uniform(0, 50), uniform(100, 200)
+        Tco = uniform(Tci + 1, Thi - 1)
+        Tho = uniform(Tci + 1, Thi - 1)
+        Ft_min = uniform(0.7, 0.95)
+        try:
+            N = shells_min_Fakheri(Thi, Tho, Tci, Tco, Ft_min=Ft_min)
+        except ValueError:
+            continue
+        assert F_LMTD_Fakheri(Thi, Tho, Tci, Tco, shells=N) >= Ft_min*(1 - 1e-9)
+        if N > 1:
+            try:
+                assert F_LMTD_Fakheri(Thi, Tho, Tci, Tco, shells=N-1) < Ft_min
+            except ValueError:
+                pass
+
+    # Temperature cross which cannot be achieved
+    with pytest.raises(ValueError):
+        shells_min_Fakheri(Thi=100, Tho=5, Tci=10, Tco=50)
+
+
 def test_temperature_effectiveness_basic():
     # Except for the crossflow mixed 1&2 cases, taken from an example and checked that
     # it matches the e-NTU method. The approximate formula for crossflow is somewhat
@@ -1751,6 +1796,38 @@ def test_L_unsupported_max():
     assert_close(L_unsupported_max(Do=10, material='CS'), 3.175)
 
 
+def test_check_mechanical_TEMA():
+    feasible, limiting = check_mechanical_TEMA(Do=[0.0254, 0.0254], DShell=[1.2, 1.2],
+                                               DBundle=[1.18, 1.198], L_unsupported=[1.5, 2.5])
+    assert feasible == [True, False]
+    assert limiting == ['DBundle_min', 'shell_clearance']
+
+    # Compare against the scalar functions for random candidates
+    for service, material in [('C', 'CS'), ('R', 'aluminium'), ('B', 'CS')]:
+        Dos = [uniform(0.004, 0.08) for _ in range(200)]
+        DShells = [uniform(0.1, 2.5) for _ in range(200)]
+        DBundles = [D - uniform(0.0, 0.03) for D in DShells]
+        Ls = [uniform(0.1, 3.5) for _ in range(200)]
+        ts = [uniform(0.001, 0.02) for _ in range(200)]
+        dBs = [Do + uniform(-0.0002, 0.001) for Do in Dos]
+        feasible, limiting = check_mechanical_TEMA(Dos, DShells, DBundles, Ls, t_baffle=ts,
+                                                   D_baffle_hole=dBs, service=service, material=material)
+        for k in range(200):
+            ok = (DBundles[k] >= DBundle_min(Dos[k])
+                  and DShells[k] - DBundles[k] >= shell_clearance(DShell=DShells[k])
+                  and Ls[k] <= L_unsupported_max(Dos[k], material=material)
+                  and ts[k] >= baffle_thickness(DShells[k], Ls[k], service=service)
+                  and Dos[k] <= dBs[k] <= D_baffle_holes(Dos[k], Ls[k]))
+            assert ok == feasible[k]
+        assert set(limiting) <= {'DBundle_min', 'shell_clearance', 'L_unsupported_max',
+                                 'baffle_thickness', 'D_baffle_holes'}
+
+    with pytest.raises(ValueError):
+        check_mechanical_TEMA([0.0254], [1.2], [1.18], [1.5], material='BADMATERIAL')
+    with pytest.raises(ValueError):
+        check_mechanical_TEMA([0.0254], [1.2], [1.18], [1.5], service='X')
+
+
 def test_issue_6():
     at_error = P_NTU_method(m1=3, m2=3, Cp1=1860., Cp2=1860,
     subtype='counterflow', Ntp=4, T2i=15, T1i=130, UA=3041.75)
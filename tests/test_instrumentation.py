@@ -0,0 +1,85 @@
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2016, 2017 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+import json
+
+import pytest
+
+import ht
+import ht.instrumentation
+import ht.vectorized
+from ht.instrumentation import (
+    disable_instrumentation,
+    enable_instrumentation,
+    instrumentation_enabled,
+    instrumentation_json,
+    instrumentation_stats,
+    instrumented,
+    reset_instrumentation,
+)
+
+
+def test_instrumented_context():
+    original = ht.LMTD
+    with instrumented() as report:
+        assert instrumentation_enabled()
+        assert ht.LMTD is not original
+        for _ in range(10):
+            ht.LMTD(100., 60., 30., 40.2)
+        # Internal calls between modules are recorded too
+        ht.size_bundle_from_tubecount(N=1285, Do=.025, pitch=.03125, Ntp=2)
+        ht.vectorized.LMTD([100, 101], 60., 30., 40.2)
+    assert not instrumentation_enabled()
+    assert ht.LMTD is original
+    assert ht.air_cooler.LMTD is original
+
+    assert report['LMTD']['calls'] == 10
+    assert report['DBundle_for_Ntubes_Phadkeb']['calls'] == 1
+    assert report['Ntubes_Phadkeb']['calls'] > 1
+    assert report['vectorized.LMTD']['calls'] == 1
+    stats = report['LMTD']
+    assert stats['total_time'] > 0
+    assert stats['p99_time'] <= stats['total_time']
+    assert stats['mean_time'] == pytest.approx(stats['total_time']/10)
+    # Inclusive timing
+    assert report['size_bundle_from_tubecount']['total_time'] >= report['DBundle_for_Ntubes_Phadkeb']['total_time']
+
+    # Nothing recorded while disabled
+    ht.LMTD(100., 60., 30., 40.2)
+    assert instrumentation_stats()['LMTD']['calls'] == 10
+
+
+def test_enable_disable_instrumentation():
+    try:
+        reset_instrumentation()
+        enable_instrumentation()
+        enable_instrumentation() # idempotent
+        ht.F_LMTD_Fakheri(Tci=15, Tco=85, Thi=130, Tho=110, shells=1)
+        assert instrumentation_stats()['F_LMTD_Fakheri']['calls'] == 1
+        exported = json.loads(instrumentation_json())
+        assert exported['F_LMTD_Fakheri']['calls'] == 1
+        reset_instrumentation()
+        assert instrumentation_stats() == {}
+    finally:
+        disable_instrumentation()
+    assert not hasattr(ht.F_LMTD_Fakheri, '__wrapped__')
@@ -301,6 +301,18 @@ def test_boiling_nucleic():
     assert_close(ht.numba.h_nucleic(rhol=957.854, rhog=0.595593, mul=2.79E-4, kl=0.680, Cpl=4217, Hvap=2.257E6, sigma=0.0589, Te=4.9, Csf=0.011, n=1.26, P=1e4, Pc=1e6, Tsat=10, MW=33.0, Method='Rohsenow'),
                  ht.h_nucleic(rhol=957.854, rhog=0.595593, mul=2.79E-4, kl=0.680, Cpl=4217, Hvap=2.257E6, sigma=0.0589, Te=4.9, Csf=0.011, n=1.26, P=1e4, Pc=1e6, Tsat=10, MW=33.0, Method='Rohsenow'))
 
+    # Method selection with the CAS tables
+    kwargs = dict(rhol=957.854, rhog=0.595593, mul=2.79E-4, kl=0.680, Cpl=4217, Hvap=2.257E6, sigma=0.0589, Te=4.9, P=1e4, Pc=1e6, Tsat=10, MW=33.0)
+    for CAS in ('7732-18-5', '7440-37-1', '64-19-7'):
+        assert ht.numba.h_nucleic_methods(CAS=CAS, **kwargs) == ht.h_nucleic_methods(CAS=CAS, **kwargs)
+        assert_close(ht.numba.h_nucleic(CAS=CAS, **kwargs), ht.h_nucleic(CAS=CAS, **kwargs))
+    assert ht.numba.boiling_nucleic_index('7440-37-1') == ht.boiling_nucleic_index('7440-37-1')
+    assert ht.numba.boiling_nucleic_index('64-19-7') == -1
+    assert_close(ht.numba.Gorenflo(3E5, 22048320., q=2E4, CASRN='7732-18-5'),
+                 ht.Gorenflo(3E5, 22048320., q=2E4, CASRN='7732-18-5'))
+    assert_close(ht.numba.Gorenflo(3E5, 6137000., q=2E4, CAS_index=ht.boiling_nucleic_index('64-17-5')),
+                 ht.Gorenflo(3E5, 6137000., q=2E4, CASRN='64-17-5'))
+
     kwargs = dict(D=0.0127, sigma=8.2E-3, Hvap=272E3, rhol=567.0, rhog=18.09, P=1e6, Pc=1e7)
     assert_close(ht.numba.qmax_boiling(**kwargs), ht.qmax_boiling(**kwargs))
 
@@ -442,3 +454,21 @@ def test_conv_plate():
 
     kwargs = dict(Re=2000, Pr=.7, chevron_angle=30.0)
     assert_close(ht.numba.Nu_plate_Martin(**kwargs), ht.Nu_plate_Martin(**kwargs))
+
+
+@mark_as_numba
+def test_material_arrays():
+    IDs = np.array([ht.material_index('Mineral fiber'), ht.material_index('Fused silica'), 0])
+    Ts = np.array([300.0, 1000.0, 2000.0])
+    assert_close(ht.numba.k_material_array(IDs, Ts), ht.k_material_array(IDs, Ts))
+    assert_close(ht.numba.Cp_material_array(IDs, Ts), ht.Cp_material_array(IDs, Ts))
+    assert_close(ht.numba.rho_material_array(IDs), ht.rho_material_array(IDs))
+    assert ht.numba.material_index('Mineral fiber') == ht.material_index('Mineral fiber')
+    assert ht.numba.material_index('Not a material') == -1
+    assert np.isnan(ht.numba.k_material_array(np.array([-1]), np.array([300.0]))[0])
+    assert np.isnan(ht.numba.Cp_material_array(np.array([-1]), np.array([300.0]))[0])
+    assert np.isnan(ht.numba.rho_material_array(np.array([-1]))[0])
+    Ts = np.array([500.0, 800.0, 1100.0, 1600.0])
+    IDs = np.array([ht.material_index(name) for name in ('Silica', 'Fused silica', 'Fireclay', 'Mullite')])
+    assert_close(ht.numba.refractory_VDI_k_array(IDs, Ts), ht.refractory_VDI_k_array(IDs, Ts))
+    assert_close(ht.numba.refractory_VDI_Cp_array(IDs[0], Ts), ht.refractory_VDI_Cp_array(IDs[0], Ts))
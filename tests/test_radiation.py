@@ -20,11 +20,24 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 '''
 
+from math import pi
+
 import numpy as np
 import pytest
-from fluids.numerics import assert_close, assert_close1d
+from fluids.numerics import assert_close, assert_close1d, assert_close2d
 
-from ht import blackbody_spectral_radiance, grey_transmittance, q_rad, solar_spectrum
+from ht import (
+    blackbody_band_fraction,
+    blackbody_fraction,
+    blackbody_spectral_radiance,
+    blackbody_spectral_radiance_array,
+    grey_transmittance,
+    grey_transmittance_array,
+    q_rad,
+    q_rad_array,
+    solar_absorptivity,
+    solar_spectrum,
+)
 
 
 def test_radiation():
@@ -51,3 +64,116 @@ def test_solar_spectrum():
 def test_grey_transmittance():
     tau =  grey_transmittance(3.8e-4, molar_density=55300, length=1e-2)
     assert_close(tau, 0.8104707721191062)
+
+
+def test_blackbody_arrays():
+    from scipy.integrate import quad
+    Ts = np.array([[300.0], [800.0], [5500.0]])
+    wavelengths = np.array([5E-10, 1E-7, 4E-6, 1E-4])
+    I = blackbody_spectral_radiance_array(Ts, wavelengths)
+    assert I.shape == (3, 4)
+    for i in range(3):
+        for j in range(4):
+            assert_close(I[i, j], blackbody_spectral_radiance(Ts[i, 0], wavelengths[j]), rtol=1e-12)
+
+    # Band fractions against numerical integration of the spectral radiance
+    # sigma of fluids.constants is not exactly consistent with h, c and k
+    from fluids.constants import c, h, k
+    sigma_hck = 2.0*pi**5*k**4/(15.0*h**3*c**2)
+    T = 1500.0
+    edges = [1E-7, 5E-7, 1E-6, 1.9E-6, 2E-6, 5E-6, 1E-5, 5E-5, 1E-3]
+    F = blackbody_band_fraction(T, edges[:-1], edges[1:])
+    for i in range(len(edges) - 1):
+        integral = quad(lambda l: blackbody_spectral_radiance(T, l), edges[i], edges[i+1], epsrel=1e-12, epsabs=0.0, limit=200)[0]
+        assert_close(F[i], pi*integral/(sigma_hck*T**4), rtol=1e-9)
+
+    assert_close1d(blackbody_fraction(T, [0.0, np.inf]), [0.0, 1.0], atol=0.0)
+    assert_close(blackbody_band_fraction(T, 0.0, np.inf), 1.0)
+    # Continuity between the two methods of evaluation
+    l = h*c/(k*T*2.0)
+    assert_close(blackbody_fraction(T, l*(1 - 1e-12)), blackbody_fraction(T, l*(1 + 1e-12)), rtol=1e-10)
+
+
+def test_solar_absorptivity():
+    from scipy.integrate import trapezoid
+    wavelengths, SSI, _ = solar_spectrum()
+    # Cached, and protected from modification
+    assert solar_spectrum()[1] is SSI
+    with pytest.raises(ValueError):
+        SSI[0] = 1.0
+    with pytest.raises(ValueError):
+        solar_spectrum('SIRS')
+
+    measured = np.linspace(3E-7, 2.5E-6, 300)
+    rng = np.random.RandomState(0)
+    curves = rng.uniform(0.0, 1.0, (20, 300))
+    calc = solar_absorptivity(measured, curves)
+    assert calc.shape == (20,)
+
+    mask = (wavelengths >= measured[0]) & (wavelengths <= measured[-1])
+    ls, Es = wavelengths[mask], SSI[mask]
+    for curve, alpha in zip(curves, calc):
+        expect = trapezoid(np.interp(ls, measured, curve)*Es, ls)/trapezoid(Es, ls)
+        assert_close(alpha, expect, rtol=1e-12)
+
+    assert_close(solar_absorptivity(measured, curves[3]), calc[3], rtol=1e-14)
+    assert_close1d(solar_absorptivity(measured, np.full((2, 300), 0.3)), [0.3, 0.3], rtol=1e-14)
+
+
+def test_q_rad_array():
+    emissivities = np.array([0.2, 0.5, 0.85, 1.0])
+    Ts = np.array([[300.0], [700.0], [1200.0]])
+    q = q_rad_array(emissivities, Ts, 305.0)
+    assert q.shape == (3, 4)
+    for i in range(3):
+        for j in range(4):
+            assert_close(q[i, j], q_rad(emissivities[j], Ts[i, 0], 305.0), rtol=1e-13)
+    assert_close1d(q_rad_array(emissivities, 400.0), [q_rad(eps, 400.0) for eps in emissivities], rtol=1e-13)
+
+    # Reusing the output array
+    buffer = np.empty((3, 4))
+    ans = q_rad_array(emissivities, Ts, 305.0, out=buffer)
+    assert ans is buffer
+    assert_close2d(buffer, q, rtol=1e-15)
+    q_rad_array(emissivities, Ts + 10.0, Ts - 10.0, out=buffer)
+    assert_close(buffer[1, 2], q_rad(0.85, 710.0, 690.0), rtol=1e-13)
+    with pytest.raises(ValueError):
+        q_rad_array(emissivities, Ts, out=np.empty(4))
+
+    # Writing over one of the inputs
+    for i in range(3):
+        eps, T, T2 = np.array([0.9, 0.3]), np.array([350.0, 900.0]), np.array([300.0, 310.0])
+        expect = [q_rad(0.9, 350.0, 300.0), q_rad(0.3, 900.0, 310.0)]
+        inputs = (eps, T, T2)
+        ans = q_rad_array(eps, T, T2, out=inputs[i])
+        assert ans is inputs[i]
+        assert_close1d(ans, expect, rtol=1e-13)
+
+
+def test_grey_transmittance_array():
+    lengths = np.array([[0.0, 1e-2, 2e-2], [1e-2, 0.0, 5e-3], [2e-2, 5e-3, 0.0]])
+    coeffs = np.array([3.8e-4, 1e-3])[:, None, None]
+    tau = grey_transmittance_array(coeffs, 55300.0, lengths)
+    assert tau.shape == (2, 3, 3)
+    for b in range(2):
+        for i in range(3):
+            for j in range(3):
+                assert_close(tau[b, i, j], grey_transmittance(coeffs[b, 0, 0], 55300.0, lengths[i, j]), rtol=1e-13)
+                assert_close(grey_transmittance_array(coeffs, 55300.0, lengths, base=10.0)[b, i, j],
+                             grey_transmittance(coeffs[b, 0, 0], 55300.0, lengths[i, j], base=10.0), rtol=1e-13)
+
+    # Different bases for each band, written into a reused buffer
+    buffer = np.empty((2, 3, 3))
+    ans = grey_transmittance_array(coeffs, 55300.0, lengths, base=np.array([np.e, 10.0])[:, None, None], out=buffer)
+    assert ans is buffer
+    assert_close(buffer[1, 0, 1], grey_transmittance(1e-3, 55300.0, 1e-2, base=10.0), rtol=1e-13)
+    assert_close(buffer[0, 0, 1], tau[0, 0, 1], rtol=1e-14)
+
+    # Writing over the path lengths, as when stepping in time
+    L = np.array([1e-2, 2e-2])
+    ans = grey_transmittance_array(3.8e-4, 55300., L, out=L)
+    assert ans is L
+    assert_close1d(L, [grey_transmittance(3.8e-4, 55300., 1e-2), grey_transmittance(3.8e-4, 55300., 2e-2)], rtol=1e-13)
+    view = np.array([5.0, 55300.0, 55300.0])
+    grey_transmittance_array(3.8e-4, view[1:], np.array([1e-2, 2e-2]), out=view[:2])
+    assert_close1d(view[:2], [grey_transmittance(3.8e-4, 55300., 1e-2), grey_transmittance(3.8e-4, 55300., 2e-2)], rtol=1e-13)
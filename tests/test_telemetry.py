@@ -0,0 +1,78 @@
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2016, 2017 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+'''
+
+
+import pytest
+from fluids.numerics import assert_close
+
+import ht
+from ht.telemetry import solver_telemetry
+
+
+def test_solver_telemetry():
+    with solver_telemetry() as records:
+        D = ht.size_bundle_from_tubecount(N=1285, Do=.025, pitch=.03125, Ntp=2)
+        h = ht.Thome(m=10.0, x=0.5, D=0.3, rhol=567., rhog=18.09, kl=0.086, kg=0.2, mul=156E-6,
+                     mug=1E-5, Cpl=2300.0, Cpg=1400.0, sigma=0.02, Hvap=9E5, Psat=1E5, Pc=22E6,
+                     Te=32.04944566414243)
+        NTU = ht.NTU_from_P_H(P1=0.3, R1=1.2, Ntp=2)
+    assert_close(D, 1.217424001771036)
+    assert_close(h, 3120.1787715124824)
+    assert [r['function'] for r in records] == ['DBundle_for_Ntubes_Phadkeb', 'Thome', 'NTU_from_P']
+
+    bundle, thome, ntu = records
+    assert bundle['solver'] == 'bisect'
+    assert bundle['inputs']['Ntubes'] == 1285
+    assert thome['solver'] == 'secant'
+    assert abs(thome['residual']) < 1e-9
+    assert thome['inputs']['Te'] == 32.04944566414243
+    assert ntu['inputs']['function'] == 'temperature_effectiveness_TEMA_H'
+    assert abs(ntu['residual']) < 1e-12
+    assert_close(ht.temperature_effectiveness_TEMA_H(R1=1.2, NTU1=NTU, Ntp=2), 0.3)
+    for r in records:
+        assert r['converged']
+        assert not r['fallback']
+        assert r['evaluations'] > 2
+
+    # Nothing is collected outside the context manager
+    ht.NTU_from_P_H(P1=0.3, R1=1.2, Ntp=2)
+    assert len(records) == 3
+
+
+def test_solver_telemetry_failure():
+    with solver_telemetry() as records:
+        with pytest.raises(Exception):
+            ht.Thome(m=1, x=0.4, D=0.3, rhol=567., rhog=18.09, kl=0.086, kg=0.2, mul=156E-6,
+                     mug=1E-5, Cpl=2300, Cpg=1400, sigma=0.02, Hvap=9E5, Psat=1E5, Pc=22E6, Te=4.9)
+    assert len(records) == 1
+    assert not records[0]['converged']
+    assert records[0]['evaluations'] > 0
+
+
+def test_solver_telemetry_nested():
+    with solver_telemetry() as outer:
+        with solver_telemetry() as inner:
+            ht.NTU_from_P_H(P1=0.3, R1=1.2, Ntp=2)
+        ht.NTU_from_P_H(P1=0.4, R1=1.2, Ntp=2)
+    assert len(inner) == 1
+    assert len(outer) == 1
+    assert outer[0]['inputs']['P1'] == 0.4